@@ -2,6 +2,14 @@ from dash import Dash
 import dash_bootstrap_components as dbc
 
 from src.layout_home import layout as layout_home
+from src.metrics import register_metrics_endpoint
+from src.slow_query import enable_slow_query_log
+from src.warmup import register_readiness_endpoint, warm_up
+
+# DB schema 不在 import 時升級（唯讀的部署環境也要能啟動）：
+# repo 裡的 DB 隨 migration 一起提交，其他 DB 先跑 python -m src.migrations
+# MLB_SLOW_QUERY_MS 有設定時才記錄慢查詢
+enable_slow_query_log()
 
 app = Dash(
     __name__,
@@ -9,6 +17,8 @@ app = Dash(
     suppress_callback_exceptions=True
 )
 server = app.server
+register_metrics_endpoint(server)
+register_readiness_endpoint(server)
 app.layout = layout_home
 
 
@@ -17,4 +27,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # gunicorn 由 gunicorn.conf.py 暖機；開發用的 server 在這裡先暖機
+    warm_up()
     app.run()
@@ -0,0 +1,109 @@
+"""
+db_access 載入聯盟表時，推斷型別（object 字串、int64 / float64）與指定精簡型別的比較：
+每列位元組數（memory_usage(deep=True)）與 charts 常見的篩選 / groupby 時間。
+另外比較 query()（fetchall 成 tuple 再交給 pandas）與 query_columns()（分批寫進欄式陣列）
+的載入時間與 tracemalloc 峰值。
+
+    python -m benchmarks.bench_dtypes --repeat 20
+    MLB_DB_PATH=.cache/synthetic.db python -m benchmarks.bench_dtypes   # 多季規模
+"""
+import argparse
+import statistics
+import time
+import tracemalloc
+from typing import Callable
+
+import pandas as pd
+
+from src.constant import TEAM_ID
+from src.db_access import (
+    BATTER_RAW_DTYPES,
+    BATTER_RAW_SQL,
+    PITCHER_RAW_DTYPES,
+    PITCHER_RAW_SQL,
+    query,
+    query_columns,
+)
+from src.league import add_batter_pr, add_pitcher_pr, compute_batter_rates, compute_pitcher_rates
+
+BATTER_GROUPS = ["C", "1B", "2B", "3B", "SS", "OF", "DH"]
+
+
+def bytes_per_row(df: pd.DataFrame) -> float:
+    return df.memory_usage(deep=True).sum() / max(len(df), 1)
+
+
+def median_seconds(func: Callable[[], object], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def peak_bytes(func: Callable[[], object]) -> int:
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def batter_ops(df: pd.DataFrame) -> Callable[[], object]:
+    # 跟 build_laa_batter_group_profiles 一樣：篩本隊 + 守位，再依 POS groupby
+    def run():
+        team = df[(df["teamID"] == TEAM_ID) & df["POS"].isin(BATTER_GROUPS)]
+        return team.groupby("POS", observed=True)[["AB", "H", "HR", "OPS_plus"]].mean()
+    return run
+
+
+def pitcher_ops(df: pd.DataFrame) -> Callable[[], object]:
+    def run():
+        team = df[df["teamID"] == TEAM_ID]
+        return team.groupby(["POS", "throws"], observed=True)[["IPouts", "SO", "fip"]].mean()
+    return run
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    cases = [
+        ("batter", BATTER_RAW_SQL, BATTER_RAW_DTYPES, batter_ops, lambda df: add_batter_pr(compute_batter_rates(df))),
+        ("pitcher", PITCHER_RAW_SQL, PITCHER_RAW_DTYPES, pitcher_ops, lambda df: add_pitcher_pr(compute_pitcher_rates(df))),
+    ]
+    print(f"{'table':8s} {'rows':>9s} {'raw B/row':>19s} {'league B/row':>19s} {'filter+groupby':>23s}")
+    for table, sql, dtypes, ops, league in cases:
+        inferred = query(sql)
+        typed = query(sql, dtypes=dtypes)
+        raw_before, raw_after = bytes_per_row(inferred), bytes_per_row(typed)
+        league_before, league_after = bytes_per_row(league(inferred)), bytes_per_row(league(typed))
+        ops_before = median_seconds(ops(inferred), args.repeat)
+        ops_after = median_seconds(ops(typed), args.repeat)
+        print(
+            f"{table:8s} {len(typed):>9,d} "
+            f"{raw_before:8.1f} -> {raw_after:7.1f} "
+            f"{league_before:8.1f} -> {league_after:7.1f} "
+            f"{ops_before * 1e3:8.2f}ms -> {ops_after * 1e3:7.2f}ms"
+        )
+
+    print(f"\n{'table':8s} {'fetch time':>23s} {'fetch peak':>25s}   (query -> query_columns)")
+    for table, sql, dtypes, _, _ in cases:
+        def by_rows(sql=sql, dtypes=dtypes):
+            return query(sql, dtypes=dtypes)
+
+        def by_columns(sql=sql, dtypes=dtypes):
+            return query_columns(sql, dtypes=dtypes)
+
+        print(
+            f"{table:8s} "
+            f"{median_seconds(by_rows, args.repeat) * 1e3:8.2f}ms -> {median_seconds(by_columns, args.repeat) * 1e3:7.2f}ms "
+            f"{peak_bytes(by_rows) / 2**20:8.2f}MiB -> {peak_bytes(by_columns) / 2**20:7.2f}MiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+向量化 PR 引擎 vs 原本逐欄 Series.rank 的比較（1x / 10x / 100x 聯盟規模）。
+
+    python -m benchmarks.bench_percentile --scales 1 10 100
+
+聯盟表以目前 DB 的球員列複製放大；每個規模都會先確認兩邊的 *_PR 完全一致。
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.db_access import load_batter_raw, load_pitcher_raw
+from src.league import add_batter_pr, add_pitcher_pr, compute_batter_rates, compute_pitcher_rates
+
+
+def reference_batter_pr(df: pd.DataFrame) -> pd.DataFrame:
+    # 原本的實作：每個指標 rank 一次再 reindex 回去
+    df = df.copy()
+    league = df[df["PA"] >= 50].copy()
+    for col in ["AVG", "OBP", "SLG", "BB_rate", "OPS_plus"]:
+        rank = league[col].rank(pct=True) * 100
+        df[f"{col}_PR"] = rank.reindex(df.index)
+    rank_k = (1 - league["K_rate"].rank(pct=True)) * 100
+    df["K_rate_PR"] = rank_k.reindex(df.index)
+    return df
+
+
+def reference_pitcher_pr(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+    league = df[df["IP"] >= 20].copy()
+    for col in ["K9"]:
+        rank = league[col].rank(pct=True) * 100
+        df[f"{col}_PR"] = rank.reindex(df.index)
+    for col in ["ERA", "fip", "WHIP", "BB9", "H9"]:
+        rank = (1 - league[col].rank(pct=True)) * 100
+        df[f"{col}_PR"] = rank.reindex(df.index)
+    return df
+
+
+def scaled(df: pd.DataFrame, scale: int) -> pd.DataFrame:
+    """
+    複製放大，並對每份複本的數值做小幅擾動，避免 ties 比例不自然地變高
+    """
+    rng = np.random.default_rng(scale)
+    frames = []
+    for _ in range(scale):
+        copy = df.copy()
+        for col in df.select_dtypes("number").columns:
+            copy[col] = copy[col] * rng.uniform(0.98, 1.02, len(copy))
+        frames.append(copy)
+    return pd.concat(frames, ignore_index=True)
+
+
+def best_of(func, df: pd.DataFrame, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(df)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    cases = [
+        ("batter", compute_batter_rates(load_batter_raw()), reference_batter_pr, add_batter_pr),
+        ("pitcher", compute_pitcher_rates(load_pitcher_raw()), reference_pitcher_pr, add_pitcher_pr),
+    ]
+    print(f"{'table':8s} {'scale':>6s} {'rows':>10s} {'reference':>12s} {'vectorized':>12s} {'speedup':>8s}")
+    for name, base, reference, vectorized in cases:
+        for scale in args.scales:
+            df = scaled(base, scale)
+            expected, actual = reference(df), vectorized(df)
+            pd.testing.assert_frame_equal(actual[expected.columns], expected)
+
+            reference_time = best_of(reference, df, args.repeat)
+            vectorized_time = best_of(vectorized, df, args.repeat)
+            print(
+                f"{name:8s} {scale:>5d}x {len(df):>10,d} "
+                f"{reference_time * 1e3:>10.2f}ms {vectorized_time * 1e3:>10.2f}ms "
+                f"{reference_time / vectorized_time:>7.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
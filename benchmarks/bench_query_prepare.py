@@ -0,0 +1,124 @@
+"""
+重複按 Apply 時，f-string SQL 與具名參數 SQL 的 prepare 成本比較。
+
+    python -m benchmarks.bench_query_prepare --clicks 2000 --clicks-per-connection 20
+
+參數化版本就是 charts.get_players 實際送出的 SQL（charts.PLAYER_SQL），打者與投手分開量；
+f-string 版本是同一條 SQL 把 team / roles 直接寫進字串，每種角色組合都是一條新的 SQL，
+每條連線都得各自 prepare 一次。參數化版本不管選什麼都是同一條 SQL，每條連線只 prepare 一次。
+--clicks-per-connection 模擬每條連線（每個 worker thread）在被回收前處理的點擊數。
+"""
+import argparse
+import itertools
+import random
+import sqlite3
+import time
+from typing import Callable
+
+from src.charts import PLAYER_SQL
+from src.db_access import POOL, bind_params
+from src.constant import TEAM_ID
+
+# 各 player type 下拉選單的選項
+ROLES = {
+    "batter": ["C", "1B", "2B", "3B", "SS", "OF", "DH"],
+    "pitcher": ["SP R", "SP L", "RP R", "RP L"],
+}
+ROLES_PARAM = "(SELECT value FROM json_each(:roles))"
+
+
+def selections(roles: list[str], clicks: int, seed: int = 0) -> list[list[str]]:
+    """
+    模擬使用者每次按 Apply 時的多選組合（該 player type 所有非空子集合）
+    """
+    rng = random.Random(seed)
+    combos = [
+        list(combo)
+        for size in range(1, len(roles) + 1)
+        for combo in itertools.combinations(roles, size)
+    ]
+    return [rng.choice(combos) for _ in range(clicks)]
+
+
+def literal_builder(player_type: str) -> Callable[[list[str]], tuple[str, dict]]:
+    sql = PLAYER_SQL[player_type]
+    assert ":team_id" in sql and ROLES_PARAM in sql, "PLAYER_SQL changed shape"
+
+    def build(roles: list[str]) -> tuple[str, dict]:
+        in_list = "('" + "','".join(roles) + "')"
+        return sql.replace(":team_id", f"'{TEAM_ID}'").replace(ROLES_PARAM, in_list), {}
+
+    return build
+
+
+def param_builder(player_type: str) -> Callable[[list[str]], tuple[str, dict]]:
+    sql = PLAYER_SQL[player_type]
+
+    def build(roles: list[str]) -> tuple[str, dict]:
+        return sql, bind_params({"team_id": TEAM_ID, "roles": roles})
+
+    return build
+
+
+def run(build, picks: list[list[str]], clicks_per_connection: int) -> float:
+    """
+    依序執行每次點擊的查詢，每 clicks_per_connection 次換一條新連線（statement cache 清空）
+    """
+    elapsed = 0.0
+    for offset in range(0, len(picks), clicks_per_connection):
+        # 關掉 pool 裡的連線，下一次 connection() 會以同樣的設定重開
+        POOL.close_all()
+        connection = POOL.connection()
+        start = time.perf_counter()
+        for roles in picks[offset:offset + clicks_per_connection]:
+            sql, params = build(roles)
+            connection.execute(sql, params).fetchall()
+        elapsed += time.perf_counter() - start
+    POOL.close_all()
+    return elapsed
+
+
+def prepare_cost(build, roles: list[str], repeat: int = 2000) -> float:
+    """
+    單條 statement 的 prepare 時間：cache 命中與 cache 關閉（每次都 prepare）的差
+    """
+    sql, params = build(roles)
+    sql = f"SELECT * FROM ({sql}) LIMIT 0"
+    timings = []
+    for cached_statements in (0, 128):
+        connection = sqlite3.connect(POOL.db_path, cached_statements=cached_statements)
+        connection.execute(sql, params).fetchall()
+        start = time.perf_counter()
+        for _ in range(repeat):
+            connection.execute(sql, params).fetchall()
+        timings.append((time.perf_counter() - start) / repeat)
+        connection.close()
+    return timings[0] - timings[1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clicks", type=int, default=2000)
+    parser.add_argument("--clicks-per-connection", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for player_type, roles in ROLES.items():
+        picks = selections(roles, args.clicks)
+        literal_statement, param_statement = literal_builder(player_type), param_builder(player_type)
+        print(f"== {player_type}  clicks: {args.clicks}  distinct selections: {len({tuple(p) for p in picks})}")
+        print(f"prepare cost (f-string)      : {prepare_cost(literal_statement, picks[0]) * 1e6:8.1f} us/statement")
+        print(f"prepare cost (parameterized) : {prepare_cost(param_statement, picks[0]) * 1e6:8.1f} us/statement")
+
+        for per_connection in (args.clicks_per_connection, args.clicks):
+            literal = min(run(literal_statement, picks, per_connection) for _ in range(args.repeat))
+            params = min(run(param_statement, picks, per_connection) for _ in range(args.repeat))
+            print(f"\n{per_connection} clicks per connection")
+            print(f"  f-string SQL   : {literal * 1e6 / args.clicks:8.1f} us/click")
+            print(f"  parameterized  : {params * 1e6 / args.clicks:8.1f} us/click")
+            print(f"  speedup        : {literal / params:8.2f}x")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+冷啟動 benchmark：`import app` 的時間（`python -X importtime`）與第一個 request 的延遲。
+每一輪都是新的 process，量到的就是一個新 gunicorn worker / 新 instance 的成本。
+
+    python -m benchmarks.bench_startup --repeat 5
+    python -m benchmarks.bench_startup --top 30 --output startup.json
+
+  import_seconds     子 process 內 `import app` 的 wall time（不含 interpreter 啟動）
+  first_request      依序打 /、/_dash-layout、/_dash-dependencies，再送一次
+                     render_page(overview) 的 callback request（第一次查 DB、畫圖）
+  modules            -X importtime 的累積時間前幾名，與重量級模組是否在啟動時就被載入
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+from src.db_access import PROJECT_ROOT
+
+# 應該延後到第一次需要資料時才載入的模組
+# （plotly.graph_objects / dash.dash_table 不在內：dash 本身 import 時就會載入；
+#  dash_bootstrap_components 也不在內：要在產生首頁前註冊元件，首頁才會帶上它的 JS）
+HEAVY_MODULES = ["pandas", "numpy", "plotly.express", "src.charts"]
+
+OVERVIEW_REQUEST = {
+    "output": "page-content.children",
+    "outputs": {"id": "page-content", "property": "children"},
+    "inputs": [{"id": "top-tabs", "property": "value", "value": "overview"}],
+    "changedPropIds": ["top-tabs.value"],
+}
+
+WORKER_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import app
+import_seconds = time.perf_counter() - start
+# 第一個 request 之前就已經載入的重量級模組
+heavy = {name: name in sys.modules for name in %(heavy_modules)r}
+
+client = app.server.test_client()
+timings = {}
+for name, send in [
+    ("index", lambda: client.get("/")),
+    ("layout", lambda: client.get("/_dash-layout")),
+    ("dependencies", lambda: client.get("/_dash-dependencies")),
+    ("render_page[overview]", lambda: client.post("/_dash-update-component", json=%(request)s)),
+]:
+    begin = time.perf_counter()
+    response = send()
+    timings[name] = time.perf_counter() - begin
+    assert response.status_code == 200, (name, response.status_code)
+
+json.dump({
+    "import_seconds": import_seconds,
+    "first_request": timings,
+    "heavy_loaded_at_import": heavy,
+}, sys.stdout)
+"""
+
+
+def worker_env() -> dict:
+    # 跟正式環境一樣的 import 路徑，但不要讓跨 worker 快取或 background manager 影響量測
+    return {
+        **os.environ,
+        "MLB_RESULT_CACHE": "0",
+        "MLB_BACKGROUND_CALLBACKS": "0",
+    }
+
+
+def parse_importtime(stderr: str) -> dict[str, tuple[int, int]]:
+    """
+    -X importtime 的輸出 -> {module: (self_us, cumulative_us)}
+    """
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def measure_imports() -> dict[str, tuple[int, int]]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app"],
+        env=worker_env(), cwd=PROJECT_ROOT, check=True, capture_output=True, text=True,
+    )
+    return parse_importtime(result.stderr)
+
+
+def measure_first_request() -> dict:
+    script = WORKER_SCRIPT % {"request": json.dumps(OVERVIEW_REQUEST), "heavy_modules": HEAVY_MODULES}
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        env=worker_env(), cwd=PROJECT_ROOT, check=True, capture_output=True, text=True,
+    )
+    return json.loads(result.stdout)
+
+
+def median_of(runs: list[dict], path: list[str]) -> float:
+    values = []
+    for run in runs:
+        value = run
+        for key in path:
+            value = value[key]
+        values.append(value)
+    return statistics.median(values)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="新 process 的輪數")
+    parser.add_argument("--top", type=int, default=20, help="列出 import 累積時間最長的前幾個模組")
+    parser.add_argument("--output", type=Path, help="結果另存成 JSON")
+    args = parser.parse_args()
+
+    modules = measure_imports()
+    runs = [measure_first_request() for _ in range(args.repeat)]
+
+    report = {
+        "import_seconds": median_of(runs, ["import_seconds"]),
+        "first_request": {
+            name: median_of(runs, ["first_request", name]) for name in runs[0]["first_request"]
+        },
+        "heavy_loaded_at_import": runs[0]["heavy_loaded_at_import"],
+        "importtime_total_us": modules.get("app", (0, 0))[1],
+        "importtime_top": sorted(
+            ({"module": name, "self_us": self_us, "cumulative_us": cumulative_us}
+             for name, (self_us, cumulative_us) in modules.items()),
+            key=lambda entry: entry["cumulative_us"], reverse=True,
+        )[:args.top],
+    }
+
+    print(f"import app              {report['import_seconds'] * 1e3:9.1f}ms (median of {args.repeat})")
+    for name, seconds in report["first_request"].items():
+        print(f"  {name:22s} {seconds * 1e3:9.1f}ms")
+    print("\nloaded by `import app`:")
+    for name, loaded in report["heavy_loaded_at_import"].items():
+        print(f"  {name:22s} {'yes' if loaded else 'no (lazy)'}")
+    print(f"\n-X importtime, top {args.top} by cumulative time:")
+    for entry in report["importtime_top"]:
+        print(f"  {entry['cumulative_us'] / 1e3:9.1f}ms  {entry['module']}")
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+        print(f"-> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
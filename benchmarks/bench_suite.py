@@ -0,0 +1,347 @@
+"""
+所有圖表函式、callback 與 render_page 的 benchmark（多種資料規模），結果寫成 JSON，方便跨 commit 比較。
+
+    python -m benchmarks.bench_suite --scales 1 10 100 --repeat 5
+    python -m benchmarks.bench_suite --compare old.json new.json
+
+每個規模都會在 .cache/bench/ 建一個放大過的 DB：預設把目前 DB 的每一季複製成更早的季別，
+加 --synthetic 則改用 src.synthetic 產生 N 季的合成聯盟（每季 30 隊）。
+量測在子 process 裡跑（MLB_DB_PATH 指向該 DB），不同規模不會共用 process 內的快取。
+  cold        每次呼叫前清掉 process 內所有快取（figure LRU、聯盟表、薪水分布）
+  warm        快取都熱了之後
+  peak_bytes  一次 cold 呼叫期間 tracemalloc 的峰值（numpy / pandas 的配置也算在內）
+跨 worker 的 result cache 與 background callback 在量測時關閉。
+player-list 的 action 篩選是 clientside callback（瀏覽器端），不在這裡量。
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Iterator
+
+from src.db_access import DB_PATH, PROJECT_ROOT
+
+BENCH_DIR = PROJECT_ROOT / ".cache" / "bench"
+RESULTS_DIR = PROJECT_ROOT / "benchmarks" / "results"
+
+BATTER_ROLES = ["C", "SS", "1B"]
+PITCHER_ROLES = ["SP R", "RP L"]
+ALL_BATTER_GROUPS = ["C", "1B", "2B", "3B", "SS", "OF", "DH"]
+ALL_PITCHER_GROUPS = ["SP_R", "SP_L", "RP_R", "RP_L"]
+
+# 回報時視為退步的 cold median 倍數
+REGRESSION_RATIO = 1.2
+
+
+def scaled_rows(rows: list[tuple], year_index: int, scale: int) -> Iterator[tuple]:
+    """
+    每一份複本往前平移 k 季（k = 0..scale-1），主鍵 (playerID, teamID, yearID) 不會重複
+    """
+    for k in range(scale):
+        for row in rows:
+            row = list(row)
+            row[year_index] -= k
+            yield row
+
+
+def build_scaled_db(source: Path, target: Path, scale: int) -> dict[str, int]:
+    """
+    把 source 的 team / batter / pitcher 放大 scale 倍寫到 target，回傳各表筆數
+    """
+    from src.ingest import TABLES, create_tables, insert_rows, open_bulk_connection
+    from src.migrations import apply_migrations
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = target.with_name(target.name + ".tmp")
+    tmp_path.unlink(missing_ok=True)
+
+    source_connection = sqlite3.connect(f"file:{source}?mode=ro", uri=True)
+    connection = open_bulk_connection(tmp_path)
+    counts = {}
+    try:
+        connection.execute("BEGIN")
+        create_tables(connection)
+        for table in TABLES:
+            # table_info 不含 generated column（pitcher.role），剛好就是要寫入的欄位
+            columns = [row[1] for row in source_connection.execute(f'PRAGMA table_info("{table}")')]
+            column_sql = ", ".join(f'"{column}"' for column in columns)
+            rows = source_connection.execute(f'SELECT {column_sql} FROM "{table}"').fetchall()
+            counts[table] = insert_rows(connection, table, columns, scaled_rows(rows, columns.index("yearID"), scale))
+        apply_migrations(connection)
+        connection.execute("COMMIT")
+    except BaseException:
+        connection.close()
+        tmp_path.unlink(missing_ok=True)
+        raise
+    finally:
+        source_connection.close()
+    connection.close()
+
+    os.replace(tmp_path, target)
+    return counts
+
+
+def table_counts(db_path: Path) -> dict[str, int]:
+    connection = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        return {
+            table: connection.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0]
+            for table in ["team", "batter", "pitcher"]
+        }
+    finally:
+        connection.close()
+
+
+def bench_cases() -> dict[str, Callable[[], object]]:
+    """
+    名稱 -> 無參數函式。只能在子 process 裡呼叫（import 時 DB_PATH 已經指向放大後的 DB）
+    """
+    import plotly
+
+    from src import charts, containers
+    from src.constant import TEAM_ID
+    from src.layout_home import render_page
+
+    def store(player_type, roles):
+        # 跟瀏覽器收到的一樣：經過一次 JSON 來回
+        results = charts.get_apply_results(player_type=player_type, roles=roles)
+        return json.loads(json.dumps(results, cls=plotly.utils.PlotlyJSONEncoder))
+
+    batter_store = store("batter", BATTER_ROLES)
+    pitcher_store = store("pitcher", PITCHER_ROLES)
+
+    return {
+        # src/charts.py
+        "charts.get_players[batter]": lambda: charts.get_players("batter", BATTER_ROLES),
+        "charts.get_players[pitcher]": lambda: charts.get_players("pitcher", PITCHER_ROLES),
+        "charts.get_salary_median[batter]": lambda: charts.get_salary_median("batter"),
+        "charts.plot_contribution_salary_scatter[batter]": lambda: charts.plot_contribution_salary_scatter("batter", BATTER_ROLES),
+        "charts.plot_contribution_salary_scatter[pitcher]": lambda: charts.plot_contribution_salary_scatter("pitcher", PITCHER_ROLES),
+        "charts.get_player_list[batter,retain]": lambda: charts.get_player_list("batter", BATTER_ROLES, "retain"),
+        "charts.get_player_list[pitcher,trade]": lambda: charts.get_player_list("pitcher", PITCHER_ROLES, "trade"),
+        "charts.build_laa_batter_group_profiles": lambda: charts.build_laa_batter_group_profiles(ALL_BATTER_GROUPS),
+        "charts.build_laa_pitcher_group_profiles": lambda: charts.build_laa_pitcher_group_profiles(ALL_PITCHER_GROUPS),
+        "charts.plot_laa_batter_radar[SS]": lambda: charts.plot_laa_batter_radar("SS"),
+        "charts.plot_laa_pitcher_radar[SP]": lambda: charts.plot_laa_pitcher_radar("SP"),
+        "charts.plot_laa_batter_radars[all]": lambda: charts.plot_laa_batter_radars(ALL_BATTER_GROUPS),
+        "charts.plot_laa_pitcher_radars[all]": lambda: charts.plot_laa_pitcher_radars(ALL_PITCHER_GROUPS),
+        "charts.plot_laa_hitter_team_radar": charts.plot_laa_hitter_team_radar,
+        "charts.plot_overview_breakdown[SP]": lambda: charts.plot_overview_breakdown(TEAM_ID, "SP"),
+        "charts.plot_overview_breakdown[H]": lambda: charts.plot_overview_breakdown(TEAM_ID, "H"),
+        "charts.plot_performance_bar[batter]": lambda: charts.plot_performance_bar(TEAM_ID, "batter", BATTER_ROLES),
+        "charts.plot_performance_bar[pitcher]": lambda: charts.plot_performance_bar(TEAM_ID, "pitcher", PITCHER_ROLES),
+        "charts.plot_performance_radars[batter]": lambda: charts.plot_performance_radars("batter", BATTER_ROLES),
+        "charts.get_overview_tiles": lambda: charts.get_overview_tiles(TEAM_ID),
+        "charts.get_team_record": lambda: charts.get_team_record(TEAM_ID),
+        "charts.get_overview_data": lambda: charts.get_overview_data(TEAM_ID),
+        "charts.plot_season_metric_trend[batter,H]": lambda: charts.plot_season_metric_trend(TEAM_ID, "batter", "H"),
+        "charts.plot_season_pr_trend[pitcher,SP]": lambda: charts.plot_season_pr_trend(TEAM_ID, "pitcher", "SP"),
+        "charts.get_apply_results[batter]": lambda: charts.get_apply_results("batter", BATTER_ROLES),
+        "charts.get_apply_results[pitcher]": lambda: charts.get_apply_results("pitcher", PITCHER_ROLES),
+        # src/containers.py callbacks
+        "callback.compute_apply[batter]": lambda: containers.compute_apply(1, "batter", BATTER_ROLES),
+        "callback.compute_apply[pitcher]": lambda: containers.compute_apply(1, "pitcher", PITCHER_ROLES),
+        "callback.update_scatter[batter]": lambda: containers.update_scatter(batter_store),
+        "callback.update_radar_grid[pitcher]": lambda: containers.update_radar_grid(pitcher_store),
+        "callback.perf_update_charts[batter]": lambda: containers.perf_update_charts(1, "batter", BATTER_ROLES),
+        "callback.perf_update_charts[pitcher]": lambda: containers.perf_update_charts(1, "pitcher", PITCHER_ROLES),
+        "callback.overview_breakdown_real[SP]": lambda: containers.overview_breakdown_real("SP"),
+        "callback.perf_update_dropdown[pitcher]": lambda: containers.perf_update_dropdown("pitcher"),
+        # src/layout_home.py
+        "callback.render_page[overview]": lambda: render_page("overview"),
+        "callback.render_page[performance]": lambda: render_page("performance"),
+        "callback.render_page[contribution]": lambda: render_page("contribution"),
+        "callback.render_page[trends]": lambda: render_page("trends"),
+        "callback.trend_update_charts[pitcher,RP]": lambda: containers.trend_update_charts("pitcher", "RP"),
+    }
+
+
+def reset_caches() -> None:
+    """
+    清掉 process 內所有快取，讓下一次呼叫從 SQLite 重算
+    """
+    from src.figure_cache import FIGURE_CACHE
+    from src.league import BATTER_LEAGUE, PITCHER_LEAGUE
+    from src.salary import SALARY_DISTRIBUTIONS
+
+    FIGURE_CACHE.clear()
+    BATTER_LEAGUE.clear()
+    PITCHER_LEAGUE.clear()
+    SALARY_DISTRIBUTIONS.clear()
+
+
+def timed(func: Callable[[], object]) -> float:
+    gc.collect()
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def summarize(timings: list[float]) -> dict:
+    return {
+        "min": round(min(timings), 6),
+        "median": round(statistics.median(timings), 6),
+        "runs": [round(seconds, 6) for seconds in timings],
+    }
+
+
+def peak_bytes(func: Callable[[], object]) -> int:
+    reset_caches()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_worker(repeat: int, only: list[str] | None) -> dict:
+    cases = bench_cases()
+    if only:
+        cases = {name: func for name, func in cases.items() if any(pattern in name for pattern in only)}
+
+    results = {}
+    for name, func in cases.items():
+        cold = []
+        for _ in range(repeat):
+            reset_caches()
+            cold.append(timed(func))
+        # 上面最後一次 cold 之後快取已經是熱的
+        warm = [timed(func) for _ in range(repeat)]
+        results[name] = {
+            "cold": summarize(cold),
+            "warm": summarize(warm),
+            "peak_bytes": peak_bytes(func),
+        }
+    return results
+
+
+def schema_version(db_path: Path) -> int:
+    connection = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        return connection.execute("PRAGMA user_version").fetchone()[0]
+    finally:
+        connection.close()
+
+
+def run_scale(scale: int, repeat: int, only: list[str] | None, rebuild: bool, synthetic: bool = False) -> dict:
+    from src.migrations import LATEST_VERSION
+
+    db_path = BENCH_DIR / (f"synthetic-{scale}.db" if synthetic else f"scale-{scale}.db")
+    # 舊 schema 的快取 DB 直接重建（只補 migration 的話，早期建的表結構可能和現在不同，量到的不準）
+    if db_path.exists() and not rebuild and schema_version(db_path) != LATEST_VERSION:
+        print(f"{db_path} is at schema {schema_version(db_path)}, expected {LATEST_VERSION}", file=sys.stderr)
+        rebuild = True
+    if rebuild or not db_path.exists():
+        print(f"building {db_path} ...", file=sys.stderr)
+        if synthetic:
+            from src.synthetic import generate
+            generate(db_path, seasons=scale, teams=30)
+        else:
+            build_scaled_db(DB_PATH, db_path, scale)
+
+    env = {
+        **os.environ,
+        "MLB_DB_PATH": str(db_path),
+        "MLB_RESULT_CACHE": "0",
+        "MLB_BACKGROUND_CALLBACKS": "0",
+    }
+    command = [sys.executable, "-m", "benchmarks.bench_suite", "--worker", "--repeat", str(repeat)]
+    if only:
+        command += ["--only", *only]
+    output = subprocess.run(command, env=env, cwd=PROJECT_ROOT, check=True, capture_output=True, text=True).stdout
+    return {"rows": table_counts(db_path), "cases": json.loads(output)}
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=PROJECT_ROOT, check=True, capture_output=True, text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(old_path: Path, new_path: Path) -> int:
+    """
+    逐項比較兩份結果的 cold median，回傳退步超過 REGRESSION_RATIO 的項目數
+    """
+    old = json.loads(old_path.read_text())
+    new = json.loads(new_path.read_text())
+    regressions = 0
+    print(f"{'scale':>5s}  {'case':55s} {'old':>9s} {'new':>9s} {'ratio':>6s}")
+    for scale, new_scale in new["scales"].items():
+        old_cases = old["scales"].get(scale, {}).get("cases", {})
+        for name, result in new_scale["cases"].items():
+            if name not in old_cases:
+                continue
+            before = old_cases[name]["cold"]["median"]
+            after = result["cold"]["median"]
+            ratio = after / before if before > 0 else float("inf")
+            flag = ""
+            if ratio > REGRESSION_RATIO:
+                flag = "  <-- slower"
+                regressions += 1
+            print(f"{scale:>5s}  {name:55s} {before * 1e3:7.2f}ms {after * 1e3:7.2f}ms {ratio:6.2f}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", nargs="+", help="只跑名稱包含這些字串的項目")
+    parser.add_argument("--output", type=Path, help="預設 benchmarks/results/<git revision>.json")
+    parser.add_argument("--rebuild", action="store_true", help="重建放大後的 DB")
+    parser.add_argument("--synthetic", action="store_true", help="用 src.synthetic 產生 N 季的資料，而不是複製目前 DB")
+    parser.add_argument("--compare", type=Path, nargs=2, metavar=("OLD", "NEW"))
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        json.dump(run_worker(args.repeat, args.only), sys.stdout)
+        return
+    if args.compare:
+        raise SystemExit(1 if compare(*args.compare) else 0)
+
+    revision = git_revision()
+    report = {
+        "meta": {
+            "revision": revision,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "data": "synthetic" if args.synthetic else "copy",
+        },
+        "scales": {},
+    }
+    for scale in args.scales:
+        result = run_scale(scale, args.repeat, args.only, args.rebuild, args.synthetic)
+        report["scales"][str(scale)] = result
+        rows = ", ".join(f"{table} {count:,d}" for table, count in result["rows"].items())
+        print(f"scale {scale:>4d}x  ({rows})")
+        for name, case in result["cases"].items():
+            print(
+                f"  {name:55s} cold {case['cold']['median'] * 1e3:9.2f}ms"
+                f"  warm {case['warm']['median'] * 1e3:9.2f}ms"
+                f"  peak {case['peak_bytes'] / 2**20:8.2f}MiB"
+            )
+
+    output = args.output or RESULTS_DIR / f"{revision}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, sort_keys=True))
+    print(f"-> {output}")
+
+
+if __name__ == "__main__":
+    main()
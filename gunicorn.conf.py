@@ -0,0 +1,53 @@
+"""
+gunicorn 設定（preload + fork 前暖機）：
+
+    gunicorn -c gunicorn.conf.py app:server
+
+master 先 import app，再於 when_ready 算好聯盟表、PR、薪水分布與 Overview 的圖，
+之後 fork 出來的 worker 以 copy-on-write 共用這些資料。
+
+大小建議：
+  - 每個 worker 的記憶體主要是聯盟表與 figure cache，preload 之後大多是共用頁；
+    workers 先從 CPU 核心數開始（不是 2 * cores + 1：callback 多半是 pandas / numpy 運算）。
+  - 每個 worker 開幾個 thread（gthread）：SQLite 查詢與 numpy 會釋放 GIL，
+    4 個 thread 可以吃掉等 DB 的時間；CPU 滿載時加 worker 而不是加 thread。
+  - 以 WEB_CONCURRENCY / GUNICORN_THREADS 覆寫；MLB_PRELOAD=0 關閉 preload
+    （每個 worker 改在自己初始化時暖機）。
+
+/ready 在暖機完成前回 503，health check 請指向它。
+"""
+import gc
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8050')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+preload_app = os.environ.get("MLB_PRELOAD", "1") != "0"
+# 冷的 Apply（多季資料重算）可能超過預設的 30 秒
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 120))
+graceful_timeout = 30
+# 定期換掉 worker，避免 figure cache 以外的記憶體慢慢長大
+max_requests = 2000
+max_requests_jitter = 200
+
+
+def when_ready(server):
+    # preload 時 app 已經在 master 裡 import 好，這裡是 fork 之前的最後一步
+    if not preload_app:
+        return
+    from src.warmup import warm_up
+
+    seconds = warm_up()
+    server.log.info("warmup finished in %.2fs", seconds)
+    # 暖機產生的物件移出 GC 追蹤，worker 跑 GC 時不會去寫這些頁（保住 copy-on-write）
+    gc.freeze()
+
+
+def post_worker_init(worker):
+    from src.warmup import is_ready, warm_up
+
+    if not is_ready():
+        seconds = warm_up()
+        worker.log.info("worker warmup finished in %.2fs", seconds)
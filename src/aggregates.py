@@ -0,0 +1,112 @@
+"""
+球隊 vs 聯盟的彙總表（每個 year, league, team, POS[, throws] 一列，存 sum 與 count）。
+資料匯入後重建一次，dashboard 的長條圖與 Overview tiles 只讀這幾百列，不再掃球員表。
+
+    python -m src.aggregates    # 手動重建
+"""
+import sqlite3
+from pathlib import Path
+
+from src.db_access import DB_PATH
+
+# 主鍵以查詢的篩選欄位開頭：聯盟平均只篩 POS（不篩 teamID），本隊 tiles 篩 POS + teamID。
+# WITHOUT ROWID 讓主鍵就是表本身，依主鍵找到的列不用再回表
+CREATE_SUMMARY_TABLES = [
+    """
+    CREATE TABLE IF NOT EXISTS batter_summary (
+        yearID INTEGER NOT NULL,
+        lgID TEXT NOT NULL,
+        teamID TEXT NOT NULL,
+        POS TEXT NOT NULL,
+        players INTEGER NOT NULL,
+        ops_plus_n INTEGER NOT NULL,
+        ops_plus_sum REAL NOT NULL,
+        PRIMARY KEY (POS, teamID, yearID, lgID)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS pitcher_summary (
+        yearID INTEGER NOT NULL,
+        lgID TEXT NOT NULL,
+        teamID TEXT NOT NULL,
+        POS TEXT NOT NULL,
+        throws TEXT NOT NULL,
+        role TEXT NOT NULL,
+        players INTEGER NOT NULL,
+        fip_minus_n INTEGER NOT NULL,
+        fip_minus_sum REAL NOT NULL,
+        PRIMARY KEY (POS, throws, teamID, yearID, lgID)
+    ) WITHOUT ROWID
+    """,
+    # 長條圖的投手是以 role（"SP R"）篩選
+    """
+    CREATE INDEX IF NOT EXISTS idx_pitcher_summary_role
+    ON pitcher_summary (role, teamID, fip_minus_n, fip_minus_sum)
+    """,
+]
+
+# 平均值 = sum / n；n 只算非 NULL 的指標，和 AVG() 的語意一致。
+# {where} 是整張重建（空字串）與單季重算（WHERE yearID = :year）共用的篩選位置
+POPULATE_SUMMARY_TEMPLATES = [
+    """
+    INSERT INTO batter_summary
+    SELECT yearID, lgID, teamID, POS,
+           COUNT(*), COUNT(`ops+`), TOTAL(`ops+`)
+    FROM batter
+    {where}
+    GROUP BY yearID, lgID, teamID, POS
+    """,
+    """
+    INSERT INTO pitcher_summary
+    SELECT yearID, lgID, teamID, POS, throws, POS || ' ' || throws,
+           COUNT(*), COUNT(`fip-`), TOTAL(`fip-`)
+    FROM pitcher
+    {where}
+    GROUP BY yearID, lgID, teamID, POS, throws
+    """,
+]
+
+POPULATE_SUMMARY_TABLES = [template.format(where="") for template in POPULATE_SUMMARY_TEMPLATES]
+
+# 只重算一季（新增季別時用，不重掃其他季）
+POPULATE_SEASON_SUMMARIES = [
+    template.format(where="WHERE yearID = :year") for template in POPULATE_SUMMARY_TEMPLATES
+]
+
+
+def refresh_season_summaries(connection: sqlite3.Connection, year: int) -> None:
+    """
+    重算彙總表中單一季的列。呼叫端負責 transaction。
+    """
+    connection.execute("DELETE FROM batter_summary WHERE yearID = :year", {"year": year})
+    connection.execute("DELETE FROM pitcher_summary WHERE yearID = :year", {"year": year})
+    for statement in POPULATE_SEASON_SUMMARIES:
+        connection.execute(statement, {"year": year})
+
+
+def rebuild_aggregates(connection: sqlite3.Connection) -> None:
+    """
+    重建彙總表。呼叫端負責 transaction（匯入流程會和資料寫入放在同一個 transaction）。
+    """
+    for statement in CREATE_SUMMARY_TABLES:
+        connection.execute(statement)
+    connection.execute("DELETE FROM batter_summary")
+    connection.execute("DELETE FROM pitcher_summary")
+    for statement in POPULATE_SUMMARY_TABLES:
+        connection.execute(statement)
+
+
+def main(db_path: Path = DB_PATH):
+    connection = sqlite3.connect(db_path)
+    try:
+        with connection:
+            rebuild_aggregates(connection)
+        batters = connection.execute("SELECT COUNT(*) FROM batter_summary").fetchone()[0]
+        pitchers = connection.execute("SELECT COUNT(*) FROM pitcher_summary").fetchone()[0]
+    finally:
+        connection.close()
+    print(f"batter_summary: {batters} rows, pitcher_summary: {pitchers} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+重的 callback 改成 Dash background callback：在另一個 process 跑，不卡住 gunicorn worker，
+可以回報進度、按 Cancel 中止，結果以 (輸入, DB data version) 為鍵存在本機 diskcache。
+
+diskcache 是選用套件（pip install "dash[diskcache]"）；沒裝或設定
+MLB_BACKGROUND_CALLBACKS=0 時，同一個 callback 會退回一般的同步 callback。
+
+    MLB_BACKGROUND_CALLBACKS         0 = 停用（預設 1）
+    MLB_BACKGROUND_CACHE_DIR         diskcache 目錄（預設 <project>/.cache/background）
+    MLB_BACKGROUND_CACHE_EXPIRE      結果多久沒被讀取就刪除，秒（預設 3600）
+"""
+import functools
+import os
+from pathlib import Path
+from typing import Callable
+
+from dash import callback
+
+from src.db_access import PROJECT_ROOT, get_data_version
+
+BACKGROUND_CACHE_DIR = Path(os.environ.get("MLB_BACKGROUND_CACHE_DIR", PROJECT_ROOT / ".cache" / "background"))
+BACKGROUND_CACHE_EXPIRE = int(os.environ.get("MLB_BACKGROUND_CACHE_EXPIRE", 3600))
+
+
+def create_background_manager():
+    """
+    建立 DiskcacheManager；沒有 diskcache 或被環境變數停用時回傳 None
+    """
+    if os.environ.get("MLB_BACKGROUND_CALLBACKS", "1") == "0":
+        return None
+    try:
+        import diskcache
+        from dash import DiskcacheManager
+        # DiskcacheManager 另外需要 multiprocess / psutil，少了一樣就當作沒有
+        import multiprocess  # noqa: F401
+        import psutil  # noqa: F401
+    except ImportError:
+        return None
+
+    cache = diskcache.Cache(str(BACKGROUND_CACHE_DIR))
+    # DB 一變動 data version 就不同，舊結果不會再被命中
+    return DiskcacheManager(cache, cache_by=[get_data_version], expire=BACKGROUND_CACHE_EXPIRE)
+
+
+BACKGROUND_MANAGER = create_background_manager()
+
+
+def _no_progress(*args) -> None:
+    pass
+
+
+def background_callback(*dependencies, progress=None, progress_default=None, cancel=None, cache_args_to_ignore=None, **kwargs):
+    """
+    跟 dash.callback 一樣的用法，被裝飾的函式第一個參數固定是 set_progress。
+    有 background manager 時註冊成 background callback（進度、取消、結果快取）；
+    沒有的話註冊成一般 callback，set_progress 什麼都不做。
+    """
+
+    def decorator(func: Callable) -> Callable:
+        if BACKGROUND_MANAGER is None:
+            @functools.wraps(func)
+            def synchronous(*args):
+                return func(_no_progress, *args)
+
+            return callback(*dependencies, **kwargs)(synchronous)
+
+        return callback(
+            *dependencies,
+            background=True,
+            manager=BACKGROUND_MANAGER,
+            progress=progress,
+            progress_default=progress_default,
+            cancel=cancel,
+            cache_args_to_ignore=cache_args_to_ignore,
+            **kwargs,
+        )(func)
+
+    return decorator
@@ -1,142 +1,83 @@
+"""
+dashboard 的資料與圖表函式（查 DB、pandas 計算、plotly 畫圖）。
+
+這個模組本身就要 pandas / plotly，import 它就會載入它們；延後載入的界線在呼叫端：
+containers / warmup 等只在 callback 或暖機函式裡 import src.charts，`import app` 不會載入它
+（tests/test_startup.py 檢查）。
+"""
 import operator
-from typing import Literal, List
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Literal, List
 
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 
-from src.db_access import query, load_batter_raw, load_pitcher_raw
-from src.constant import TEAM_ID, BATTER_RADAR_METRICS, PITCHER_RADAR_METRICS, TEAM_COLOR
-
-
-def compute_batter_rates(df: pd.DataFrame) -> pd.DataFrame:
-    """
-    計算打者的各種率（AVG, OBP, SLG, BB_rate, K_rate）
-    """
-    df = df.copy()
-    # 基本打擊指標計算
-    df["1B"] = df["H"] - df["2B"] - df["3B"] - df["HR"]
-    df["PA"] = df["AB"] + df["BB"] + df["HBP"] + df["SF"] + df["SH"]
+from src.db_access import query
+from src.league import get_batter_league, get_pitcher_league
+from src.figure_cache import cached_figure
+from src.result_cache import cached_frame
+from src.salary import get_salary_quantile
+from src.seasons import LEAGUE_ID, ROLLING_SEASONS
+from src.constant import TEAM_ID, BATTER_RADAR_METRICS, PITCHER_RADAR_METRICS, TEAM_COLOR, SALARY_SPLIT_QUANTILE, APPLY_STEPS
 
-    df["AVG"] = df["H"] / df["AB"].where(df["AB"] > 0, 1)
-    df["OBP"] = (df["H"] + df["BB"] + df["HBP"]) / df["PA"].where(df["PA"] > 0, 1)
-    df["SLG"] = (df["1B"] + 2 * df["2B"] + 3 * df["3B"] + 4 * df["HR"]) / df["AB"].where(df["AB"] > 0, 1)
-    df["BB_rate"] = df["BB"] / df["PA"].where(df["PA"] > 0, 1)
-    df["K_rate"] = df["SO"] / df["PA"].where(df["PA"] > 0, 1)
-    df["OPS_plus"] = pd.to_numeric(df["OPS_plus"], errors="coerce")
 
-    return df
-
-
-def add_batter_pr(df: pd.DataFrame) -> pd.DataFrame:
-    """
-    計算打者各指標的百分等級排名（PR）
-    """
-    df = df.copy()
-    league = df[df["PA"] >= 50].copy()  # 設門檻，避免樣本太小
-
-    # 每個指標的 PR
-    for col in ["AVG", "OBP", "SLG", "BB_rate", "OPS_plus"]:
-        rank = league[col].rank(pct=True) * 100
-        df[f"{col}_PR"] = rank.reindex(df.index)
-
-    # K_rate 越低越好，所以反向
-    rank_k = (1 - league["K_rate"].rank(pct=True)) * 100
-    df["K_rate_PR"] = rank_k.reindex(df.index)
-
-    return df
+# Apply 的球員查詢：不論選幾個角色都是同一條 SQL（roles 以 json_each 展開），prepare 一次就能重用
+PLAYER_SQL = {
+    # 篩選 team 跟 position
+    "batter": """
+        SELECT playerID, `ops+`, salary
+        FROM batter
+        WHERE teamID = :team_id
+            AND POS IN (SELECT value FROM json_each(:roles))
+    """,
+    # 篩選 team 跟 role（POS + throws 的 generated column，見 migrations）
+    "pitcher": """
+        SELECT playerID, `fip-`, salary
+        FROM pitcher
+        WHERE teamID = :team_id
+            AND role IN (SELECT value FROM json_each(:roles))
+    """,
+}
 
 
-def compute_pitcher_rates(df: pd.DataFrame) -> pd.DataFrame:
+@cached_frame
+def get_players(player_type: Literal["batter", "pitcher"], roles: List[str]) -> pd.DataFrame:
     """
-    計算投手的各種率（K9, BB9, H9, WHIP）
+    取得特定位置的球員數據
     """
-    df = df.copy()
-
-    # 將 IPouts 轉成局數
-    df["IP"] = df["IPouts"] / 3.0
-
-    # 避免除以 0 的情況：IP <= 0 時，把分母設成 1（結果不會被我們當成有意義的樣本）
-    ip_safe = df["IP"].where(df["IP"] > 0, 1)
-
-    # K/9, BB/9, H/9
-    df["K9"] = df["SO"] * 9 / ip_safe
-    df["BB9"] = df["BB"] * 9 / ip_safe
-    df["H9"] = df["H"] * 9 / ip_safe
-
-    # WHIP = (BB + H) / IP
-    df["WHIP"] = (df["BB"] + df["H"]) / ip_safe
-
-    # 確保 ERA、fip 是數值
-    df["ERA"] = pd.to_numeric(df["ERA"], errors="coerce")
-    df["fip"] = pd.to_numeric(df["fip"], errors="coerce")
-
-    return df
+    # query db（分打者跟投手）
+    pos_filter_result = query(sql=PLAYER_SQL[player_type], params={"team_id": TEAM_ID, "roles": roles})
+    # 走索引時回傳順序跟著索引，這裡固定成 playerID 排序
+    pos_filter_result = pos_filter_result.sort_values("playerID", ignore_index=True)
+    return pos_filter_result
 
 
-def add_pitcher_pr(df: pd.DataFrame) -> pd.DataFrame:
+def get_salary_median(player_type: Literal["batter", "pitcher"]) -> float:
     """
-    計算投手各指標的百分等級排名（PR）
+    取得該 player type 的薪水中位數
     """
-    df = df.copy()
+    return get_salary_quantile(player_type=player_type, q=0.5)
 
-    # 設定聯盟樣本門檻：例如 IP >= 20
-    league = df[df["IP"] >= 20].copy()
 
-    # 「越高越好」的指標：K9
-    for col in ["K9"]:
-        rank = league[col].rank(pct=True) * 100  # 0~100
-        df[f"{col}_PR"] = rank.reindex(df.index)
-
-    # 「越低越好」的指標：ERA, FIP, WHIP, BB9, H9
-    for col in ["ERA", "fip", "WHIP", "BB9", "H9"]:
-        rank = (1 - league[col].rank(pct=True)) * 100  # 0~100，數值越好 PR 越高
-        df[f"{col}_PR"] = rank.reindex(df.index)
-
-    return df
-
-
-def get_players(player_type: Literal["batter", "pitcher"], roles: List[str]) -> pd.DataFrame:
+def get_salary_split(player_type: Literal["batter", "pitcher"], salary_quantile: float = SALARY_SPLIT_QUANTILE) -> float:
     """
-    取得特定位置的球員數據
+    四象限的薪水分界線：salary_quantile = 0.5 是中位數，0.25 / 0.75 是四分位數，其他值就是百分位數
+    （排序好的薪水陣列依 data version 快取，換分界不會多查 DB）
     """
-    # 取資料（分打者跟投手）
-    roles_str = "','".join(roles)
-    if player_type == "batter":
-        # 篩選 team 跟 position
-        pos_filter_sql = f"""
-            SELECT playerID, `ops+`, salary
-            FROM batter
-            WHERE teamID = '{TEAM_ID}'
-                AND POS IN ('{roles_str}')
-        """
-
-    elif player_type == "pitcher":
-        # 篩選 team, position 跟 throws（position 跟 throws concat）
-        pos_filter_sql = f"""
-            SELECT playerID, `fip-`, salary
-            FROM pitcher
-            WHERE teamID = '{TEAM_ID}'
-                AND POS || ' ' || throws IN ('{roles_str}')
-        """
-
-    # query db
-    pos_filter_result = query(sql=pos_filter_sql)
-    return pos_filter_result
+    return get_salary_quantile(player_type=player_type, q=salary_quantile)
 
 
-def get_salary_median(player_type: Literal["batter", "pitcher"]) -> float:
-    """
-    取得該 player type 的薪水中位數
+def get_salary_split_label(salary_quantile: float) -> str:
     """
-    salary_sql = f"""
-        SELECT salary
-        FROM {player_type}
+    散布圖上薪水分界線的名稱
     """
-    # query db
-    salary_result = query(sql=salary_sql)
-    salary_median = salary_result['salary'].median()
-    return salary_median
+    if salary_quantile == 0.5:
+        return "Median Salary"
+    if salary_quantile in (0.25, 0.75):
+        return f"Q{int(salary_quantile * 4)} Salary"
+    return f"P{salary_quantile * 100:g} Salary"
 
 
 def get_metric_name(player_type: Literal["batter", "pitcher"]) -> str:
@@ -151,9 +92,29 @@ def get_metric_name(player_type: Literal["batter", "pitcher"]) -> str:
     return metric
 
 
-def plot_contribution_salary_scatter(player_type: Literal["batter", "pitcher"], roles: List[str]) -> go.Figure:
+@cached_figure
+def plot_contribution_salary_scatter(player_type: Literal["batter", "pitcher"], roles: List[str], salary_quantile: float = SALARY_SPLIT_QUANTILE) -> go.Figure:
     """
     畫選手貢獻和薪資的散布圖
+    salary_quantile: 薪水分界線用的分位數（預設中位數）
+    """
+    # 取資料
+    players = get_players(
+        player_type=player_type,
+        roles=roles
+    )
+    salary_split = get_salary_split(player_type=player_type, salary_quantile=salary_quantile)
+    return contribution_salary_scatter_figure(
+        players=players,
+        salary_split=salary_split,
+        player_type=player_type,
+        salary_quantile=salary_quantile
+    )
+
+
+def contribution_salary_scatter_figure(players: pd.DataFrame, salary_split: float, player_type: Literal["batter", "pitcher"], salary_quantile: float = SALARY_SPLIT_QUANTILE) -> go.Figure:
+    """
+    用已經撈好的球員與薪水分界線畫散布圖（Apply 時共用同一份資料）
     """
     op_map = {
         "batter": operator.ge,  # >=
@@ -161,22 +122,17 @@ def plot_contribution_salary_scatter(player_type: Literal["batter", "pitcher"],
     }
     op = op_map[player_type]
     y_axis = get_metric_name(player_type=player_type)
-    # 取資料
-    players = get_players(
-        player_type=player_type,
-        roles=roles
-    )
-    salary_median = get_salary_median(player_type=player_type)
-    
+    players = players.copy()
+
     # 創建四象限的分類
     players['quadrant'] = 'Other'
     median_performance = 100
     
     # 定義四象限
-    high_sal_high_perf = (players['salary'] >= salary_median) & (op(players[y_axis], median_performance))
-    high_sal_low_perf = (players['salary'] >= salary_median) & (~op(players[y_axis], median_performance))
-    low_sal_high_perf = (players['salary'] < salary_median) & (op(players[y_axis], median_performance))
-    low_sal_low_perf = (players['salary'] < salary_median) & (~op(players[y_axis], median_performance))
+    high_sal_high_perf = (players['salary'] >= salary_split) & (op(players[y_axis], median_performance))
+    high_sal_low_perf = (players['salary'] >= salary_split) & (~op(players[y_axis], median_performance))
+    low_sal_high_perf = (players['salary'] < salary_split) & (op(players[y_axis], median_performance))
+    low_sal_low_perf = (players['salary'] < salary_split) & (~op(players[y_axis], median_performance))
     
     players.loc[high_sal_high_perf, 'quadrant'] = 'Star Players'
     players.loc[high_sal_low_perf, 'quadrant'] = 'Overpaid'
@@ -215,20 +171,20 @@ def plot_contribution_salary_scatter(player_type: Literal["batter", "pitcher"],
     # 水平線 (performance = 100)
     fig.add_shape(
         type="line",
-        x0=min(players['salary'].min(), salary_median),
+        x0=min(players['salary'].min(), salary_split),
         y0=median_performance,
-        x1=max(players['salary'].max(), salary_median),
+        x1=max(players['salary'].max(), salary_split),
         y1=median_performance,
         line=dict(width=2, dash="dash", color="rgba(128,128,128,0.7)")
     )
     
-    # 垂直線 (median salary)
+    # 垂直線 (salary split，預設 median)
     fig.add_shape(
         type="line",
         y0=players[y_axis].min(),
-        x0=salary_median,
+        x0=salary_split,
         y1=players[y_axis].max(),
-        x1=salary_median,
+        x1=salary_split,
         line=dict(width=2, dash="dash", color="rgba(128,128,128,0.7)")
     )
     
@@ -247,9 +203,9 @@ def plot_contribution_salary_scatter(player_type: Literal["batter", "pitcher"],
     )
     
     fig.add_annotation(
-        x=salary_median + (players["salary"].max() - salary_median) * 0.02,
+        x=salary_split + (players["salary"].max() - salary_split) * 0.02,
         y=players[y_axis].max() * 0.95,
-        text=f"Median Salary<br>${salary_median:,.0f}",
+        text=f"{get_salary_split_label(salary_quantile)}<br>${salary_split:,.0f}",
         showarrow=False,
         yanchor="top",
         xanchor="left",
@@ -300,56 +256,125 @@ def plot_contribution_salary_scatter(player_type: Literal["batter", "pitcher"],
     return fig
 
 
-def get_player_list(player_type: Literal["batter", "pitcher"], roles: List[str], action: Literal["retain", "trade", "extend", "option"]) -> pd.DataFrame:
+def get_player_list(player_type: Literal["batter", "pitcher"], roles: List[str], action: Literal["retain", "trade", "extend", "option"], salary_quantile: float = SALARY_SPLIT_QUANTILE) -> pd.DataFrame:
     """
     根據 action 及位置篩選球員
     """
+    players = get_players(
+        player_type=player_type,
+        roles=roles
+    )
+    salary_split = get_salary_split(player_type=player_type, salary_quantile=salary_quantile)
+    return filter_player_list(
+        players=players,
+        salary_split=salary_split,
+        player_type=player_type,
+        action=action
+    )
+
+
+def filter_player_list(players: pd.DataFrame, salary_split: float, player_type: Literal["batter", "pitcher"], action: Literal["retain", "trade", "extend", "option"]) -> pd.DataFrame:
+    """
+    用已經撈好的球員與薪水分界線，依 action 篩出對應象限的球員
+    """
+    actions = label_player_actions(players, salary_split=salary_split, player_type=player_type)
+    return format_player_list(players[actions == action], player_type=player_type)
+
+
+def label_player_actions(players: pd.DataFrame, salary_split: float, player_type: Literal["batter", "pitcher"]) -> pd.Series:
+    """
+    每位球員所在象限對應的 action（retain / trade / extend / option）；薪水缺值的為 None
+    """
     op_map = {
         "batter": operator.ge,  # >=
         "pitcher": operator.le  # <=
     }
     op = op_map[player_type]
-    players = get_players(
-        player_type=player_type,
-        roles=roles
-    )
-    salary_median = get_salary_median(player_type=player_type)
     metric = get_metric_name(player_type=player_type)
 
-    if action == "retain":
-        condition = (players["salary"] >= salary_median) & (op(players[metric], 100))
-    elif action == "trade":
-        condition = (players["salary"] >= salary_median) & (~op(players[metric], 100))
-    elif action == "extend":
-        condition = (players["salary"] < salary_median) & (op(players[metric], 100))
-    elif action == "option":
-        condition = (players["salary"] < salary_median) & (~op(players[metric], 100))
+    high_salary = players["salary"] >= salary_split
+    low_salary = players["salary"] < salary_split
+    good = op(players[metric], 100)
 
-    filtered_players = players[condition]
-    filtered_players["salary"] = filtered_players["salary"].apply(lambda x: f"{x:,.0f}")
-    filtered_players[metric] = filtered_players[metric].apply(lambda x: round(float(x), 2))
-    return filtered_players
+    actions = pd.Series(None, index=players.index, dtype=object)
+    actions[high_salary & good] = "retain"
+    actions[high_salary & ~good] = "trade"
+    actions[low_salary & good] = "extend"
+    actions[low_salary & ~good] = "option"
+    return actions
 
 
-def build_laa_batter_group_profile(group_code: str) -> pd.Series | None:
+def format_player_list(players: pd.DataFrame, player_type: Literal["batter", "pitcher"]) -> pd.DataFrame:
     """
-    回傳洛杉磯天使隊 (TEAM_ID) 某打者群組的 6 個 PR 平均值。
+    player-list 表格的顯示格式：薪水加千分位、指標取到小數第二位
     """
-    df_raw = load_batter_raw()
-    df = compute_batter_rates(df_raw)
-    df = add_batter_pr(df)
+    metric = get_metric_name(player_type=player_type)
+    formatted = players.copy()
+    formatted["salary"] = formatted["salary"].apply(lambda x: f"{x:,.0f}")
+    formatted[metric] = formatted[metric].apply(lambda x: round(float(x), 2))
+    return formatted
 
-    # 只看 LAA
-    df = df[df["teamID"] == TEAM_ID].copy()
 
-    # 根據 group_code 過濾守位
-    df = df[df["POS"] == group_code]
+# 投手群組代碼 -> (POS, throws)；throws 為 None 表示左右投都算
+PITCHER_GROUPS = {
+    "SP": ("SP", None),
+    "RP": ("RP", None),
+    "SP_L": ("SP", "L"),
+    "SP_R": ("SP", "R"),
+    "RP_L": ("RP", "L"),
+    "RP_R": ("RP", "R"),
+}
 
-    if df.empty:
-        return None
 
-    profile = df[BATTER_RADAR_METRICS].mean()
-    return profile
+def build_laa_batter_group_profiles(group_codes: List[str]) -> dict[str, pd.Series | None]:
+    """
+    一次算出多個打者群組（守位）的 6 個 PR 平均值。
+    只對 LAA 做一次 groupby，選幾個守位成本都一樣；沒有資料的群組為 None。
+    """
+    df = get_batter_league()
+    df = df[df["teamID"] == TEAM_ID]
+    means = df.groupby("POS", observed=True)[BATTER_RADAR_METRICS].mean()
+
+    return {
+        code: means.loc[code].rename(None) if code in means.index else None
+        for code in group_codes
+    }
+
+
+def build_laa_pitcher_group_profiles(group_codes: List[str]) -> dict[str, pd.Series | None]:
+    """
+    一次算出多個投手群組的 6 個 PR 平均值（群組代碼見 PITCHER_GROUPS）。
+    先依 (POS, throws) groupby 出 sum / count，"SP"、"RP" 這種合併群組再把左右投加總。
+    """
+    df = get_pitcher_league()
+    df = df[df["teamID"] == TEAM_ID]
+    grouped = df.groupby(["POS", "throws"], observed=True)[PITCHER_RADAR_METRICS]
+    sums = grouped.sum()
+    counts = grouped.count()
+    positions = sums.index.get_level_values("POS")
+    throws = sums.index.get_level_values("throws")
+
+    profiles = {}
+    for code in group_codes:
+        if code not in PITCHER_GROUPS:
+            # 未知 group
+            profiles[code] = None
+            continue
+        pos, hand = PITCHER_GROUPS[code]
+        mask = (positions == pos) & ((throws == hand) if hand is not None else True)
+        if not mask.any():
+            profiles[code] = None
+            continue
+        # 和 DataFrame.mean() 一樣：只平均非 NaN 的值，全是 NaN 時為 NaN
+        profiles[code] = sums[mask].sum() / counts[mask].sum().where(lambda n: n > 0)
+    return profiles
+
+
+def build_laa_batter_group_profile(group_code: str) -> pd.Series | None:
+    """
+    回傳洛杉磯天使隊 (TEAM_ID) 某打者群組的 6 個 PR 平均值。
+    """
+    return build_laa_batter_group_profiles([group_code])[group_code]
 
 
 def build_laa_pitcher_group_profile(group_code: str) -> pd.Series | None:
@@ -364,55 +389,13 @@ def build_laa_pitcher_group_profile(group_code: str) -> pd.Series | None:
         "RP_L"  : 中繼+後援左投
         "RP_R"  : 中繼+後援右投
     """
+    return build_laa_pitcher_group_profiles([group_code])[group_code]
 
-    # 1. 撈 raw 投手資料 + 算 rate + PR
-    df_raw = load_pitcher_raw()
-    df = compute_pitcher_rates(df_raw)
-    df = add_pitcher_pr(df)
-
-    # 2. 只看 LAA
-    df = df[df["teamID"] == TEAM_ID].copy()
-
-    # 3. 根據 group_code 過濾 POS / throws
-    if group_code == "SP":
-        df = df[df["POS"] == "SP"]
-    elif group_code == "RP":
-        df = df[df["POS"] == "RP"]
-    elif group_code == "SP_L":
-        df = df[(df["POS"] == "SP") & (df["throws"] == "L")]
-    elif group_code == "SP_R":
-        df = df[(df["POS"] == "SP") & (df["throws"] == "R")]
-    elif group_code == "RP_L":
-        df = df[(df["POS"] == "RP") & (df["throws"] == "L")]
-    elif group_code == "RP_R":
-        df = df[(df["POS"] == "RP") & (df["throws"] == "R")]
-    else:
-        # 未知 group，直接回傳 None
-        return None
-
-    if df.empty:
-        return None
-
-    # 4. 計算這個群組在六個指標上的平均 PR
-    profile = df[PITCHER_RADAR_METRICS].mean()
-
-    return profile
 
-
-def plot_laa_batter_radar(group_code: str) -> go.Figure:
+def radar_figure(profile: pd.Series, name: str) -> go.Figure:
     """
-    畫出 LAA 在指定打者群組 (group_code) 的雷達圖。
-
-    group_code:
-        "C", "1B", "2B", "3B", "SS", "OF", "DH"
+    用群組的 PR 平均值畫雷達圖（PR 值 0~100）
     """
-    profile = build_laa_batter_group_profile(group_code)
-
-    if profile is None:
-        return go.Figure(
-            layout_title_text=f"{TEAM_ID} {group_code} – No data for selected group"
-        )
-
     metrics = profile.index.tolist()
     values = profile.values.tolist()
 
@@ -426,8 +409,8 @@ def plot_laa_batter_radar(group_code: str) -> go.Figure:
         go.Scatterpolar(
             r=values,
             theta=metrics,
-            fill='toself',
-            name=f"{TEAM_ID} {group_code}"
+            fill="toself",
+            name=name,
         )
     )
 
@@ -435,7 +418,7 @@ def plot_laa_batter_radar(group_code: str) -> go.Figure:
         polar=dict(
             radialaxis=dict(
                 visible=True,
-                range=[0, 100]
+                range=[0, 100],
             )
         ),
         showlegend=False,
@@ -444,54 +427,62 @@ def plot_laa_batter_radar(group_code: str) -> go.Figure:
     return fig
 
 
+@cached_figure
+def plot_laa_batter_radar(group_code: str) -> go.Figure:
+    """
+    畫出 LAA 在指定打者群組 (group_code) 的雷達圖。
+
+    group_code:
+        "C", "1B", "2B", "3B", "SS", "OF", "DH"
+    """
+    return plot_laa_batter_radars([group_code])[group_code]
+
+
+@cached_figure
 def plot_laa_pitcher_radar(group_code: str) -> go.Figure:
     """
     畫出 LAA 在指定投手群組 (group_code) 的雷達圖。
     """
-    profile = build_laa_pitcher_group_profile(group_code)
-
-    if profile is None:
-        return go.Figure(
-            layout_title_text=f"{TEAM_ID} {group_code} – No data for selected pitcher group"
-        )
+    return plot_laa_pitcher_radars([group_code])[group_code]
 
-    metrics = profile.index.tolist()
-    values = profile.values.tolist()
 
-    # 雷達圖首尾相接
-    metrics += [metrics[0]]
-    values += [values[0]]
+def group_radar_figures(player_type: Literal["batter", "pitcher"], profiles: dict[str, pd.Series | dict | None]) -> dict[str, go.Figure]:
+    """
+    用已經算好的群組 PR 平均值畫雷達圖；profile 可以是 Series 或 apply store 裡的 dict
+    """
+    no_data = {
+        "batter": "No data for selected group",
+        "pitcher": "No data for selected pitcher group",
+    }[player_type]
+    figures = {}
+    for code, profile in profiles.items():
+        if profile is None:
+            figures[code] = go.Figure(
+                layout_title_text=f"{TEAM_ID} {code} – {no_data}"
+            )
+        else:
+            figures[code] = radar_figure(pd.Series(profile, dtype=float), name=f"{TEAM_ID} {code}")
+    return figures
 
-    fig = go.Figure()
 
-    fig.add_trace(
-        go.Scatterpolar(
-            r=values,
-            theta=metrics,
-            fill="toself",
-            name=f"{TEAM_ID} {group_code}",
-        )
-    )
+def plot_laa_batter_radars(group_codes: List[str]) -> dict[str, go.Figure]:
+    """
+    多個打者群組的雷達圖，PR 平均值一次算完
+    """
+    return group_radar_figures("batter", build_laa_batter_group_profiles(group_codes))
 
-    fig.update_layout(
-        polar=dict(
-            radialaxis=dict(
-                visible=True,
-                range=[0, 100],  # PR 值 0~100
-            )
-        ),
-        showlegend=False,
-    )
 
-    return fig
+def plot_laa_pitcher_radars(group_codes: List[str]) -> dict[str, go.Figure]:
+    """
+    多個投手群組的雷達圖，PR 平均值一次算完
+    """
+    return group_radar_figures("pitcher", build_laa_pitcher_group_profiles(group_codes))
 
 
 def build_laa_hitter_team_profile() -> pd.Series | None:
-    df_raw = load_batter_raw()
-    df = compute_batter_rates(df_raw)
-    df = add_batter_pr(df)
+    df = get_batter_league()
 
-    df = df[df["teamID"] == TEAM_ID].copy()
+    df = df[df["teamID"] == TEAM_ID]
     df = df[df["POS"].isin(["C", "1B", "2B", "3B", "SS", "OF", "DH"])]
 
     if df.empty:
@@ -500,25 +491,16 @@ def build_laa_hitter_team_profile() -> pd.Series | None:
     return df[BATTER_RADAR_METRICS].mean()
 
 
+@cached_figure
 def plot_laa_hitter_team_radar() -> go.Figure:
     profile = build_laa_hitter_team_profile()
     if profile is None:
         return go.Figure(layout_title_text=f"{TEAM_ID} Hitters – No data")
 
-    metrics = profile.index.tolist()
-    values = profile.values.tolist()
-    metrics += [metrics[0]]
-    values += [values[0]]
-
-    fig = go.Figure()
-    fig.add_trace(go.Scatterpolar(r=values, theta=metrics, fill="toself", name=f"{TEAM_ID} Hitters"))
-    fig.update_layout(
-        polar=dict(radialaxis=dict(visible=True, range=[0, 100])),
-        showlegend=False,
-    )
-    return fig
+    return radar_figure(profile, name=f"{TEAM_ID} Hitters")
 
 
+@cached_figure
 def plot_overview_breakdown(team_id: str, group: str) -> go.Figure:
     """
     Overview breakdown: Team vs League
@@ -528,34 +510,35 @@ def plot_overview_breakdown(team_id: str, group: str) -> go.Figure:
     """
 
     if group in ["SP", "RP"]:
-        df = query(f"""
+        df = query("""
             SELECT
                 throws AS category,
-                AVG(`fip-`) AS league_metric,
-                AVG(CASE WHEN teamID = '{team_id}' THEN `fip-` END) AS team_metric
-            FROM pitcher
-            WHERE POS = '{group}'
+                SUM(fip_minus_sum) / SUM(fip_minus_n) AS league_metric,
+                SUM(CASE WHEN teamID = :team_id THEN fip_minus_sum END)
+                    / SUM(CASE WHEN teamID = :team_id THEN fip_minus_n END) AS team_metric
+            FROM pitcher_summary
+            WHERE POS = :group
               AND throws IN ('R','L')
             GROUP BY throws
             ORDER BY category
-        """)
+        """, params={"team_id": team_id, "group": group})
         metric_name = "FIP-"
         x_title = "Throws"
 
     else:  # group == "H"
         hitter_pos = ["1B", "2B", "3B", "SS", "OF", "C", "DH"]
-        pos_str = "','".join(hitter_pos)
 
-        df = query(f"""
+        df = query("""
             SELECT
                 POS AS category,
-                AVG(`ops+`) AS league_metric,
-                AVG(CASE WHEN teamID = '{team_id}' THEN `ops+` END) AS team_metric
-            FROM batter
-            WHERE POS IN ('{pos_str}')
+                SUM(ops_plus_sum) / SUM(ops_plus_n) AS league_metric,
+                SUM(CASE WHEN teamID = :team_id THEN ops_plus_sum END)
+                    / SUM(CASE WHEN teamID = :team_id THEN ops_plus_n END) AS team_metric
+            FROM batter_summary
+            WHERE POS IN (SELECT value FROM json_each(:positions))
             GROUP BY POS
             ORDER BY category
-        """)
+        """, params={"team_id": team_id, "positions": hitter_pos})
         metric_name = "OPS+"
         x_title = "Position"
 
@@ -586,6 +569,7 @@ def plot_overview_breakdown(team_id: str, group: str) -> go.Figure:
     return fig
 
 
+@cached_figure
 def plot_performance_bar(team_id: str, player_type: str, groups: list[str]) -> go.Figure:
     """
     Bar chart for Performance page:
@@ -593,41 +577,51 @@ def plot_performance_bar(team_id: str, player_type: str, groups: list[str]) -> g
     - pitcher: compare FIP- by POS (SP/RP) (team vs league)
     groups: selected categories from dropdown
     """
-    fig = go.Figure()
+    df = get_performance_bar_data(team_id=team_id, player_type=player_type, groups=groups)
+    return performance_bar_figure(df=df, team_id=team_id, player_type=player_type)
 
-    team_color = TEAM_COLOR
-    league_color = "#BDC3C7"
+
+@cached_frame
+def get_performance_bar_data(team_id: str, player_type: str, groups: list[str]) -> pd.DataFrame:
+    """
+    Performance bar 的資料：每個 category 的 league_metric / team_metric
+    """
     if player_type == "batter":
-        pos_str = "','".join(groups)
-        df = query(f"""
+        return query("""
             SELECT
                 POS AS category,
-                AVG(`ops+`) AS league_metric,
-                AVG(CASE WHEN teamID = '{team_id}' THEN `ops+` END) AS team_metric
-            FROM batter
-            WHERE POS IN ('{pos_str}')
+                SUM(ops_plus_sum) / SUM(ops_plus_n) AS league_metric,
+                SUM(CASE WHEN teamID = :team_id THEN ops_plus_sum END)
+                    / SUM(CASE WHEN teamID = :team_id THEN ops_plus_n END) AS team_metric
+            FROM batter_summary
+            WHERE POS IN (SELECT value FROM json_each(:groups))
             GROUP BY POS
             ORDER BY category
-        """).dropna(subset=["team_metric"])
-
-        metric_name = "OPS+"
+        """, params={"team_id": team_id, "groups": groups}).dropna(subset=["team_metric"])
 
-    else:
-        roles_str = "','".join(groups)  # groups 會是 ["SP R","SP L","RP R","RP L"]
+    # groups 會是 ["SP R","SP L","RP R","RP L"]
+    return query("""
+        SELECT
+            role AS category,
+            SUM(fip_minus_sum) / SUM(fip_minus_n) AS league_metric,
+            SUM(CASE WHEN teamID = :team_id THEN fip_minus_sum END)
+                / SUM(CASE WHEN teamID = :team_id THEN fip_minus_n END) AS team_metric
+        FROM pitcher_summary
+        WHERE role IN (SELECT value FROM json_each(:groups))
+        GROUP BY role
+        ORDER BY category
+    """, params={"team_id": team_id, "groups": groups}).dropna(subset=["team_metric"])
 
-        df = query(f"""
-            SELECT
-                (POS || ' ' || throws) AS category,
-                AVG(`fip-`) AS league_metric,
-                AVG(CASE WHEN teamID = '{team_id}' THEN `fip-` END) AS team_metric
-            FROM pitcher
-            WHERE (POS || ' ' || throws) IN ('{roles_str}')
-            GROUP BY (POS || ' ' || throws)
-            ORDER BY category
-        """).dropna(subset=["team_metric"])
 
-        metric_name = "FIP-"
+def performance_bar_figure(df: pd.DataFrame, team_id: str, player_type: str) -> go.Figure:
+    """
+    用 get_performance_bar_data 的結果畫 team vs league 長條圖
+    """
+    fig = go.Figure()
 
+    team_color = TEAM_COLOR
+    league_color = "#BDC3C7"
+    metric_name = "OPS+" if player_type == "batter" else "FIP-"
     x_title = "Position"
 
     fig.add_bar(x=df["category"], y=df["league_metric"], name="League Average", marker_color=league_color)
@@ -690,76 +684,221 @@ def plot_performance_radar(player_type: str, group_code: str) -> go.Figure:
     return go.Figure(layout_title_text=f"Unknown player_type: {player_type}")
 
 
+def plot_performance_radars(player_type: str, group_codes: List[str]) -> dict[str, go.Figure]:
+    """
+    Performance page 多選時的雷達圖：所有群組共用一次 groupby
+    """
+    if player_type == "batter":
+        return plot_laa_batter_radars(group_codes)
+
+    if player_type == "pitcher":
+        return plot_laa_pitcher_radars(group_codes)
+
+    return {
+        code: go.Figure(layout_title_text=f"Unknown player_type: {player_type}")
+        for code in group_codes
+    }
+
+
+OVERVIEW_BASELINE = 100
+
+
+def optional_float(value) -> float | None:
+    return None if value is None or pd.isna(value) else float(value)
+
+
+def optional_int(value) -> int | None:
+    return None if value is None or pd.isna(value) else int(value)
+
+
+def get_overview_summary(team_id: str) -> dict:
+    """
+    Overview tiles 與戰績一次查回來（一條 SQL、一個 round trip）：
+    {"tiles": get_overview_tiles 的格式, "record": get_team_record 的格式}
+    """
+    df = query("""
+        SELECT
+            (SELECT SUM(fip_minus_sum) / SUM(fip_minus_n)
+             FROM pitcher_summary
+             WHERE teamID = :team_id AND POS = 'SP') AS sp_metric,
+            (SELECT SUM(fip_minus_sum) / SUM(fip_minus_n)
+             FROM pitcher_summary
+             WHERE teamID = :team_id AND POS = 'RP') AS rp_metric,
+            (SELECT SUM(ops_plus_sum) / SUM(ops_plus_n)
+             FROM batter_summary
+             WHERE teamID = :team_id
+               AND POS IN ('C','1B','2B','3B','SS','OF','DH')) AS h_metric,
+            record.name, record.W, record.L, record.Rank
+        FROM (SELECT 1)
+        LEFT JOIN (
+            SELECT name, W, L, Rank
+            FROM team
+            WHERE teamID = :team_id
+            LIMIT 1
+        ) AS record ON 1
+    """, params={"team_id": team_id})
+    row = df.iloc[0]
+
+    sp_metric = optional_float(row["sp_metric"])
+    rp_metric = optional_float(row["rp_metric"])
+    h_metric = optional_float(row["h_metric"])
+
+    # diffs：投手 fip- 越低越好，打者 ops+ 越高越好
+    tiles = {
+        "SP": {"metric": sp_metric, "diff": (OVERVIEW_BASELINE - sp_metric) if sp_metric is not None else None},
+        "RP": {"metric": rp_metric, "diff": (OVERVIEW_BASELINE - rp_metric) if rp_metric is not None else None},
+        "H": {"metric": h_metric, "diff": (h_metric - OVERVIEW_BASELINE) if h_metric is not None else None},
+    }
+    record = {
+        "name": row["name"],
+        "W": optional_int(row["W"]),
+        "L": optional_int(row["L"]),
+        "Rank": optional_int(row["Rank"]),
+    }
+    return {"tiles": tiles, "record": record}
+
+
 def get_overview_tiles(team_id: str) -> dict:
     """
-    回傳 Overview tiles 需要的數值（從 DB 計算）：
+    回傳 Overview tiles 需要的數值（從 batter_summary / pitcher_summary 彙總表計算）：
     {
       "SP": {"metric": float, "diff": float},  # diff: 100 - fip-
       "RP": {"metric": float, "diff": float},
       "H":  {"metric": float, "diff": float},  # diff: ops+ - 100
     }
     """
-    BASELINE = 100
+    return get_overview_summary(team_id)["tiles"]
 
-    # SP (pitcher POS = SP), metric = avg(fip-)
-    sp_df = query(f"""
-        SELECT AVG(`fip-`) AS metric
-        FROM pitcher
-        WHERE teamID = '{team_id}' AND POS = 'SP'
-    """)
-    sp_metric = float(sp_df.iloc[0]["metric"]) if not sp_df.empty and sp_df.iloc[0]["metric"] is not None else None
 
-    # RP (pitcher POS = RP), metric = avg(fip-)
-    rp_df = query(f"""
-        SELECT AVG(`fip-`) AS metric
-        FROM pitcher
-        WHERE teamID = '{team_id}' AND POS = 'RP'
-    """)
-    rp_metric = float(rp_df.iloc[0]["metric"]) if not rp_df.empty and rp_df.iloc[0]["metric"] is not None else None
+def get_team_record(team_id: str) -> dict:
+    """
+    從 DB 的 team table 取戰績與排名
+    回傳: {"name": str|None, "W": int|None, "L": int|None, "Rank": int|None}
+    """
+    return get_overview_summary(team_id)["record"]
 
-    # H (batters), metric = avg(ops+)
-    h_df = query(f"""
-        SELECT AVG(`ops+`) AS metric
-        FROM batter
-        WHERE teamID = '{team_id}'
-          AND POS IN ('C','1B','2B','3B','SS','OF','DH')
-    """)
-    h_metric = float(h_df.iloc[0]["metric"]) if not h_df.empty and h_df.iloc[0]["metric"] is not None else None
 
-    # diffs (依你的定義)
-    sp_diff = (BASELINE - sp_metric) if sp_metric is not None else None
-    rp_diff = (BASELINE - rp_metric) if rp_metric is not None else None
-    h_diff = (h_metric - BASELINE) if h_metric is not None else None
+# Overview 的資料（tiles + 戰績、三張雷達圖）彼此獨立，丟到 thread pool 同時跑；
+# SQLite 查詢與 numpy 運算大多會釋放 GIL，整頁時間約等於最慢的那一塊
+OVERVIEW_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="overview")
 
-    return {
-        "SP": {"metric": sp_metric, "diff": sp_diff},
-        "RP": {"metric": rp_metric, "diff": rp_diff},
-        "H": {"metric": h_metric, "diff": h_diff},
+
+def _reset_overview_executor() -> None:
+    # fork 之後（gunicorn preload 暖機時已經開過 thread）子 process 沒有那些 thread，要換一個新的 pool
+    global OVERVIEW_EXECUTOR
+    OVERVIEW_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="overview")
+
+
+os.register_at_fork(after_in_child=_reset_overview_executor)
+
+
+def get_overview_data(team_id: str) -> dict:
+    """
+    Overview page 需要的全部資料：
+    {"tiles": ..., "record": ..., "sp_radar": Figure, "rp_radar": Figure, "h_radar": Figure}
+    """
+    futures = {
+        "summary": OVERVIEW_EXECUTOR.submit(get_overview_summary, team_id),
+        "sp_radar": OVERVIEW_EXECUTOR.submit(plot_laa_pitcher_radar, "SP"),
+        "rp_radar": OVERVIEW_EXECUTOR.submit(plot_laa_pitcher_radar, "RP"),
+        "h_radar": OVERVIEW_EXECUTOR.submit(plot_laa_hitter_team_radar),
     }
+    results = {name: future.result() for name, future in futures.items()}
+    summary = results.pop("summary")
+    return {**summary, **results}
 
 
-def get_team_record(team_id: str) -> dict:
+@cached_frame
+def get_season_trends(team_id: str, player_type: Literal["batter", "pitcher"], group_code: str) -> pd.DataFrame:
     """
-    從 DB 的 team table 取戰績與排名
-    回傳: {"name": str|None, "W": int|None, "L": int|None, "Rank": int|None}
+    Trends page 的資料：本隊與全聯盟在某群組的逐季指標（ops+ / fip- 與各項 PR），
+    value 是當季平均，rolling 是最近 ROLLING_SEASONS 季的平均（見 src.seasons）
     """
-    df = query(f"""
-        SELECT name, W, L, Rank
-        FROM team
-        WHERE teamID = '{team_id}'
-        LIMIT 1
-    """)
+    return query("""
+        SELECT yearID, teamID, metric,
+               total / n AS value,
+               rolling_total / rolling_n AS rolling
+        FROM season_group_metrics
+        WHERE teamID IN (:team_id, :league_id)
+          AND player_type = :player_type
+          AND group_code = :group_code
+          AND n > 0
+        ORDER BY metric, teamID, yearID
+    """, params={
+        "team_id": team_id,
+        "league_id": LEAGUE_ID,
+        "player_type": player_type,
+        "group_code": group_code,
+    })
 
-    if df.empty:
-        return {"name": None, "W": None, "L": None, "Rank": None}
 
-    row = df.iloc[0]
-    return {
-        "name": row["name"] if "name" in df.columns else None,
-        "W": int(row["W"]) if row["W"] is not None else None,
-        "L": int(row["L"]) if row["L"] is not None else None,
-        "Rank": int(row["Rank"]) if row["Rank"] is not None else None,
-    }
+def season_metric_trend_figure(df: pd.DataFrame, team_id: str, player_type: str, group_code: str) -> go.Figure:
+    """
+    ops+ / fip- 逐季折線：本隊當季值、本隊滾動平均、全聯盟，100 為聯盟基準
+    """
+    metric = "ops+" if player_type == "batter" else "fip-"
+    metric_name = "OPS+" if player_type == "batter" else "FIP-"
+    df = df[df["metric"] == metric]
+    team = df[df["teamID"] == team_id]
+    league = df[df["teamID"] == LEAGUE_ID]
+
+    fig = go.Figure()
+    fig.add_scatter(x=league["yearID"], y=league["value"], name="League Average",
+                    mode="lines", line=dict(color="#BDC3C7"))
+    fig.add_scatter(x=team["yearID"], y=team["value"], name=f"{team_id}",
+                    mode="lines+markers", line=dict(color=TEAM_COLOR))
+    fig.add_scatter(x=team["yearID"], y=team["rolling"], name=f"{team_id} {ROLLING_SEASONS}-season rolling",
+                    mode="lines", line=dict(color=TEAM_COLOR, dash="dash"))
+    fig.add_hline(y=100, line_dash="dot", line_color="rgba(0,0,0,0.3)")
+
+    fig.update_layout(
+        title=f"{team_id} {group_code} – {metric_name} by Season",
+        xaxis_title="Season",
+        yaxis_title=metric_name,
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1, title=""),
+        margin=dict(l=40, r=20, t=60, b=40),
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+    )
+    fig.update_xaxes(dtick=1)
+    return fig
+
+
+def season_pr_trend_figure(df: pd.DataFrame, team_id: str, player_type: str, group_code: str) -> go.Figure:
+    """
+    雷達圖各項 PR 的逐季折線（本隊，當季聯盟內排名的平均）
+    """
+    metrics = BATTER_RADAR_METRICS if player_type == "batter" else PITCHER_RADAR_METRICS
+    team = df[(df["teamID"] == team_id) & df["metric"].isin(metrics)]
+
+    fig = go.Figure()
+    for metric in metrics:
+        series = team[team["metric"] == metric]
+        fig.add_scatter(x=series["yearID"], y=series["value"], name=metric.removesuffix("_PR"), mode="lines+markers")
+
+    fig.update_layout(
+        title=f"{team_id} {group_code} – Radar PR by Season",
+        xaxis_title="Season",
+        yaxis=dict(title="PR", range=[0, 100]),
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1, title=""),
+        margin=dict(l=40, r=20, t=60, b=40),
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+    )
+    fig.update_xaxes(dtick=1)
+    return fig
+
+
+@cached_figure
+def plot_season_metric_trend(team_id: str, player_type: Literal["batter", "pitcher"], group_code: str) -> go.Figure:
+    df = get_season_trends(team_id=team_id, player_type=player_type, group_code=group_code)
+    return season_metric_trend_figure(df, team_id=team_id, player_type=player_type, group_code=group_code)
+
+
+@cached_figure
+def plot_season_pr_trend(team_id: str, player_type: Literal["batter", "pitcher"], group_code: str) -> go.Figure:
+    df = get_season_trends(team_id=team_id, player_type=player_type, group_code=group_code)
+    return season_pr_trend_figure(df, team_id=team_id, player_type=player_type, group_code=group_code)
 
 
 def empty_radar_figure() -> go.Figure:
@@ -775,3 +914,50 @@ def empty_radar_figure() -> go.Figure:
     )
 
     return fig
+
+
+def get_apply_results(player_type: Literal["batter", "pitcher"], roles: List[str], salary_quantile: float = SALARY_SPLIT_QUANTILE, on_progress: Callable[[int, int], None] | None = None) -> dict:
+    """
+    Contribution 頁一次 Apply 需要的資料，算一次後放進 apply-store 給散布圖與表格共用
+    （Performance 頁的圖由自己的 callback 直接畫，不經過 apply-store）：
+    {
+      "key": [player_type, roles],          # 這份結果對應的篩選條件
+      "player_type": str,
+      "players": {"columns": [...], "data": [[...], ...]},
+      "salary_split": float,                # salary_quantile 分位數的薪水
+      "salary_quantile": float,
+      "player_list": {"columns": [...], "rows": [{...}, ...], "actions": [...]},
+    }
+    on_progress(done, total)：每做完一步呼叫一次（background callback 用來更新進度條）
+    """
+    on_progress = on_progress or (lambda done, total: None)
+
+    players = get_players(player_type=player_type, roles=roles)
+    on_progress(1, APPLY_STEPS)
+    salary_split = get_salary_split(player_type=player_type, salary_quantile=salary_quantile)
+    on_progress(2, APPLY_STEPS)
+
+    # 表格的每一列先標好象限，切換 action 時在瀏覽器端篩就好
+    player_list = format_player_list(players, player_type=player_type)
+    actions = label_player_actions(players, salary_split=salary_split, player_type=player_type)
+    on_progress(3, APPLY_STEPS)
+
+    return {
+        "key": [player_type, list(roles)],
+        "player_type": player_type,
+        "players": players.to_dict("split", index=False),
+        "salary_split": float(salary_split),
+        "salary_quantile": salary_quantile,
+        "player_list": {
+            "columns": player_list.columns.tolist(),
+            "rows": player_list.to_dict("records"),
+            "actions": actions.tolist(),
+        },
+    }
+
+
+def frame_from_results(payload: dict) -> pd.DataFrame:
+    """
+    把 apply-store 裡 to_dict("split") 格式的表還原成 DataFrame
+    """
+    return pd.DataFrame(payload["data"], columns=payload["columns"])
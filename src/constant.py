@@ -16,3 +16,7 @@ PITCHER_RADAR_METRICS = [
     "H9_PR",    # 被安打抑制
 ]
 TEAM_COLOR = "#BA0021"
+# Contribution 四象限的薪水分界：0.5 = 中位數，0.25 / 0.75 = 四分位數
+SALARY_SPLIT_QUANTILE = 0.5
+# Contribution Apply 計算的步驟數（background callback 的進度條上限）
+APPLY_STEPS = 3
@@ -1,22 +1,13 @@
-import plotly.express as px
-import plotly.graph_objects as go
+# dbc 與 dash_table 維持在 import 時載入：dash_table 本來就由 dash 載入，
+# dbc 的元件要在 Dash 產生首頁前註冊，首頁才會帶上它的 JS
 import dash_bootstrap_components as dbc
-from dash import dcc, html, Input, Output, State, callback, dash_table
-
-from src.charts import (
-    plot_contribution_salary_scatter,
-    plot_laa_batter_radar,
-    plot_laa_hitter_team_radar,
-    plot_laa_pitcher_radar,
-    plot_overview_breakdown,
-    plot_performance_radar,
-    plot_performance_bar,
-    get_overview_tiles,
-    get_team_record,
-    get_player_list,
-    empty_radar_figure
-)
-from src.constant import TEAM_ID, TEAM_COLOR
+from dash import dcc, html, Input, Output, State, callback, clientside_callback, dash_table
+
+# src.charts（pandas / plotly / numpy）在第一次需要資料時才 import，
+# app 啟動時只載入 layout 與 callback 註冊需要的 dash 模組
+from src.background import background_callback
+from src.constant import TEAM_ID, TEAM_COLOR, APPLY_STEPS
+from src.metrics import timed
 
 
 def radar_container():
@@ -42,26 +33,23 @@ def radar_container():
 
 @callback(
     Output("radar-grid", "children"),
-    Input("apply-button", "n_clicks"),
-    State("player-type-radio", "value"),
-    State("sub-type-dropdown", "value"),
+    Input("apply-store", "data"),
 )
-def update_radar_grid(n_clicks, player_type, sub_type):
-    if n_clicks == 0 or not sub_type:
+@timed
+def update_radar_grid(results):
+    from src.charts import plot_performance_radars
+
+    if not results:
         return []
 
-    # sub_type 因為 multi=True，會是 list
-    selected = sub_type if isinstance(sub_type, list) else [sub_type]
+    player_type, selected = results["key"]
+    group_codes = radar_group_codes(player_type, selected)
+    figures = plot_performance_radars(player_type, group_codes)
+    figures = [figures[group_code] for group_code in group_codes]
 
     cards = []
-    for group_value in selected:
-        if player_type == "batter":
-            fig = plot_laa_batter_radar(group_code=group_value)
-            title = f"{group_value} Radar"
-        else:
-            group_code = group_value.replace(" ", "_")
-            fig = plot_laa_pitcher_radar(group_code=group_code)
-            title = f"{group_value} Radar"
+    for group_value, fig in zip(selected, figures):
+        title = f"{group_value} Radar"
 
         fig.update_layout(height=320, margin=dict(l=40, r=40, t=50, b=40))
 
@@ -194,37 +182,42 @@ def contribution_salary_container():
 
 @callback(
     Output("player-scatter-graph", "figure"),
-    Input("apply-button", "n_clicks"),
-    State("player-type-radio", "value"),
-    State("sub-type-dropdown", "value")
+    Input("apply-store", "data"),
 )
-def update_scatter(n_clicks, player_type, sub_type):
-    if n_clicks == 0 or sub_type is None:
+@timed
+def update_scatter(results):
+    import plotly.express as px
+    from src.charts import contribution_salary_scatter_figure, frame_from_results
+
+    if not results:
         return px.scatter()
-    return plot_contribution_salary_scatter(
-        player_type=player_type,
-        roles=sub_type
+    return contribution_salary_scatter_figure(
+        players=frame_from_results(results["players"]),
+        salary_split=results["salary_split"],
+        player_type=results["player_type"],
+        salary_quantile=results["salary_quantile"]
     )
 
 
-@callback(
+# 切換 action 只是換一個象限，直接在瀏覽器端用 apply-store 裡標好的 actions 篩選，不回 server
+clientside_callback(
+    """
+    function(results, action) {
+        if (!results) {
+            return [[], []];
+        }
+        const playerList = results.player_list;
+        const rows = playerList.rows.filter((row, i) => playerList.actions[i] === action);
+        const columns = playerList.columns.map((col) => ({name: col.toUpperCase(), id: col}));
+        return [rows, columns];
+    }
+    """,
     Output("player-list", "data"),
     Output("player-list", "columns"),
-    Input("apply-button", "n_clicks"),
+    Input("apply-store", "data"),
     Input("action-dropdown", "value"),
-    State("player-type-radio", "value"),
-    State("sub-type-dropdown", "value"),
     prevent_initial_call=True
 )
-def update_player_list(n_clicks, action, player_type, sub_type):
-    if n_clicks == 0 or sub_type is None:
-        return [], []
-    players = get_player_list(
-        player_type=player_type,
-        roles=sub_type,
-        action=action
-    )
-    return players.to_dict("records"), [{"name": col.upper(), "id": col} for col in players.columns]
 
 
 def trend_symbol(diff):
@@ -286,12 +279,16 @@ def overview_container():
     """
     Overview page 主要區塊 - 美化版
     包含戰績卡 + 概覽卡 + 三張雷達圖"""
-    tiles = get_overview_tiles(TEAM_ID)
-    record = get_team_record(TEAM_ID)
+    from src.charts import get_overview_data
 
-    sp_radar = plot_laa_pitcher_radar("SP")
-    rp_radar = plot_laa_pitcher_radar("RP")
-    h_radar = plot_laa_hitter_team_radar()
+    # tiles + 戰績（同一條 SQL）與三張雷達圖同時取
+    overview = get_overview_data(TEAM_ID)
+    tiles = overview["tiles"]
+    record = overview["record"]
+
+    sp_radar = overview["sp_radar"]
+    rp_radar = overview["rp_radar"]
+    h_radar = overview["h_radar"]
 
     # 戰績數據
     win = record["W"]
@@ -485,7 +482,10 @@ def overview_container():
     Output("overview-breakdown-chart", "figure"),
     Input("overview-group-dropdown", "value")
 )
+@timed
 def overview_breakdown_real(group):
+    from src.charts import plot_overview_breakdown
+
     return plot_overview_breakdown(team_id=TEAM_ID, group=group)
 
 
@@ -513,11 +513,29 @@ def card(children, title: str | None = None, className: str = ""):
     )
 
 
-def filter_bar(radio_id: str, dropdown_id: str, button_id: str, default_player_type: str = "batter"):
+def filter_bar(radio_id: str, dropdown_id: str, button_id: str, default_player_type: str = "batter", background: bool = False):
     """
     共用的篩選列：RadioItems + Dropdown + Apply（同一行）
     - 選項內容由 callback 決定（你要用 Contribution 的那套）
+    - background=True：Apply 走 background callback，加上 Cancel、進度條與 apply-store
     """
+    background_controls = [
+        # 只有 background callback 執行中才顯示
+        html.Button(
+            "Cancel",
+            id="apply-cancel",
+            n_clicks=0,
+            style={"height": "30px", "display": "none"},
+        ),
+        html.Progress(
+            id="apply-progress",
+            value="0",
+            max=str(APPLY_STEPS),
+            style={"display": "none"},
+        ),
+        # 每次 Apply 只在 server 算一次，結果放這裡給圖表 / 表格 callback 共用
+        dcc.Store(id="apply-store"),
+    ]
     return html.Div(
         [
             dcc.RadioItems(
@@ -542,6 +560,7 @@ def filter_bar(radio_id: str, dropdown_id: str, button_id: str, default_player_t
                 n_clicks=0,
                 style={"height": "30px"},
             ),
+            *(background_controls if background else []),
         ],
         style={
             "display": "flex",
@@ -552,12 +571,7 @@ def filter_bar(radio_id: str, dropdown_id: str, button_id: str, default_player_t
     )
 
 
-@callback(
-    Output("sub-type-dropdown", "options"),
-    Output("sub-type-dropdown", "value"),
-    Input("player-type-radio", "value"),
-)
-def perf_update_dropdown(player_type):
+def sub_type_options(player_type):
     """
     Batter: defensive positions
     Pitcher: SP/RP
@@ -579,18 +593,86 @@ def perf_update_dropdown(player_type):
             {"label": "RP R", "value": "RP R"},
             {"label": "RP L", "value": "RP L"},
         ]
+    return options
 
-    return options, None
+
+def radar_group_codes(player_type, sub_types):
+    """
+    下拉選單的值 -> 雷達圖的群組代碼（投手 "SP R" -> "SP_R"）
+    """
+    if player_type == "batter":
+        return list(sub_types)
+    return [sub_type.replace(" ", "_") for sub_type in sub_types]
 
 
 @callback(
-    Output("perf-bar-chart", "figure"),
-    Output("perf-radar-grid", "children"),
+    Output("perf-sub-type-dropdown", "options"),
+    Output("perf-sub-type-dropdown", "value"),
+    Input("perf-player-type-radio", "value"),
+)
+@timed
+def perf_update_dropdown(player_type):
+    return sub_type_options(player_type), None
+
+
+@callback(
+    Output("sub-type-dropdown", "options"),
+    Output("sub-type-dropdown", "value"),
+    Input("player-type-radio", "value"),
+)
+@timed
+def contribution_update_dropdown(player_type):
+    return sub_type_options(player_type), None
+
+
+@background_callback(
+    Output("apply-store", "data"),
     Input("apply-button", "n_clicks"),
     State("player-type-radio", "value"),
     State("sub-type-dropdown", "value"),
+    running=[
+        (Output("apply-button", "disabled"), True, False),
+        (Output("apply-cancel", "style"), {"height": "30px"}, {"height": "30px", "display": "none"}),
+        (Output("apply-progress", "style"), {"width": "120px"}, {"display": "none"}),
+    ],
+    progress=[Output("apply-progress", "value"), Output("apply-progress", "max")],
+    progress_default=["0", str(APPLY_STEPS)],
+    cancel=[Input("apply-cancel", "n_clicks")],
+    # n_clicks 每次都不同，快取只看篩選條件（和 data version）
+    cache_args_to_ignore=[0],
+    prevent_initial_call=True,
 )
+@timed
+def compute_apply(set_progress, n_clicks, player_type, sub_types):
+    """
+    Contribution 頁 Apply 時唯一會查 DB 的 callback：球員、薪水分界、表格一次算完。
+    以 background callback 執行時在子 process 裡跑，@timed 的紀錄不會出現在 worker 的 /metrics
+    """
+    from src.charts import get_apply_results
+
+    if n_clicks == 0 or not sub_types:
+        return None
+    return get_apply_results(
+        player_type=player_type,
+        roles=sub_types,
+        on_progress=lambda done, total: set_progress((str(done), str(total)))
+    )
+
+
+# Performance 頁只需要兩種圖：Apply 一次 request 直接回傳圖（都走 figure cache），
+# 不經過 apply-store，也不算 Contribution 才用到的球員表與薪水分界
+@callback(
+    Output("perf-bar-chart", "figure"),
+    Output("perf-radar-grid", "children"),
+    Input("perf-apply-button", "n_clicks"),
+    State("perf-player-type-radio", "value"),
+    State("perf-sub-type-dropdown", "value"),
+)
+@timed
 def perf_update_charts(n_clicks, player_type, sub_types):
+    import plotly.express as px
+    from src.charts import empty_radar_figure, plot_performance_bar, plot_performance_radars
+
     if n_clicks == 0 or not sub_types:
         empty_card = card(
             dcc.Graph(
@@ -610,22 +692,21 @@ def perf_update_charts(n_clicks, player_type, sub_types):
         )
         return px.bar(), radar_grid
 
-    bar_groups = sub_types
-    radar_groups = sub_types
-
-    if player_type == "pitcher":
-        # for bar: only POS matters
-        bar_groups = sub_types
-        # for radar: needs underscore code
-        radar_groups = [s.replace(" ", "_") for s in sub_types]        # -> ["SP_R","RP_L"]
+    # for radar: underscore code -> ["SP_R","RP_L"]
+    radar_groups = radar_group_codes(player_type, sub_types)
 
     # 1) Bar chart：team vs league
-    fig_bar = plot_performance_bar(team_id=TEAM_ID, player_type=player_type, groups=bar_groups)
+    fig_bar = plot_performance_bar(
+        team_id=TEAM_ID,
+        player_type=player_type,
+        groups=sub_types
+    )
 
-    # 2) Radar charts：多選 → 多張雷達圖
+    # 2) Radar charts：多選 → 多張雷達圖（PR 平均一次算完）
+    radar_figures = plot_performance_radars(player_type, radar_groups)
     radar_cards = []
     for g in radar_groups:
-        fig_radar = plot_performance_radar(player_type=player_type, group_code=g)
+        fig_radar = radar_figures[g]
         radar_cards.append(
             card(
                 dcc.Graph(
@@ -646,3 +727,93 @@ def perf_update_charts(n_clicks, player_type, sub_types):
     )
 
     return fig_bar, radar_grid
+
+
+TREND_GROUPS = {
+    "batter": [
+        {"label": "All Hitters", "value": "H"},
+        {"label": "C", "value": "C"},
+        {"label": "1B", "value": "1B"},
+        {"label": "2B", "value": "2B"},
+        {"label": "3B", "value": "3B"},
+        {"label": "SS", "value": "SS"},
+        {"label": "OF", "value": "OF"},
+        {"label": "DH", "value": "DH"},
+    ],
+    "pitcher": [
+        {"label": "SP", "value": "SP"},
+        {"label": "RP", "value": "RP"},
+        {"label": "SP R", "value": "SP_R"},
+        {"label": "SP L", "value": "SP_L"},
+        {"label": "RP R", "value": "RP_R"},
+        {"label": "RP L", "value": "RP_L"},
+    ],
+}
+
+
+def trends_container():
+    """
+    Trends page：選一個群組，看 OPS+ / FIP- 與雷達 PR 的逐季變化（資料來自 season_group_metrics）
+    """
+    return html.Div(
+        [
+            html.Div(
+                [
+                    dcc.RadioItems(
+                        id="trend-player-type-radio",
+                        options=[
+                            {"label": "Batter", "value": "batter"},
+                            {"label": "Pitcher", "value": "pitcher"},
+                        ],
+                        value="batter",
+                        inline=True,
+                    ),
+                    dcc.Dropdown(
+                        id="trend-group-dropdown",
+                        options=TREND_GROUPS["batter"],
+                        value="H",
+                        clearable=False,
+                        style={"width": "220px"},
+                    ),
+                ],
+                style={
+                    "display": "flex",
+                    "alignItems": "center",
+                    "gap": "12px",
+                    "marginBottom": "12px",
+                },
+            ),
+            card(dcc.Graph(id="trend-metric-chart", config={"displayModeBar": False})),
+            card(dcc.Graph(id="trend-pr-chart", config={"displayModeBar": False})),
+        ]
+    )
+
+
+@callback(
+    Output("trend-group-dropdown", "options"),
+    Output("trend-group-dropdown", "value"),
+    Input("trend-player-type-radio", "value"),
+)
+@timed
+def trend_update_dropdown(player_type):
+    options = TREND_GROUPS[player_type]
+    return options, options[0]["value"]
+
+
+@callback(
+    Output("trend-metric-chart", "figure"),
+    Output("trend-pr-chart", "figure"),
+    Input("trend-player-type-radio", "value"),
+    Input("trend-group-dropdown", "value"),
+)
+@timed
+def trend_update_charts(player_type, group_code):
+    from src.charts import plot_season_metric_trend, plot_season_pr_trend
+
+    # 切換 player type 時，dropdown 的值會晚一步更新
+    if group_code not in {option["value"] for option in TREND_GROUPS[player_type]}:
+        group_code = TREND_GROUPS[player_type][0]["value"]
+    return (
+        plot_season_metric_trend(team_id=TEAM_ID, player_type=player_type, group_code=group_code),
+        plot_season_pr_trend(team_id=TEAM_ID, player_type=player_type, group_code=group_code),
+    )
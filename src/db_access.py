@@ -1,37 +1,328 @@
 from pathlib import Path
+import json
+import os
+import re
 import sqlite3
-import pandas as pd
+import threading
+import time
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 
-DB_PATH = PROJECT_ROOT / "db" / "MLBDashboard.db"
+# 預設是 repo 內的 DB；benchmark / 壓測可以用 MLB_DB_PATH 指到別的檔
+DB_PATH = Path(os.environ.get("MLB_DB_PATH", PROJECT_ROOT / "db" / "MLBDashboard.db"))
+
+# 每條連線開啟後都會套用的 pragma（唯讀、加大 page cache 與 mmap）
+CONNECTION_PRAGMAS = {
+    "query_only": 1,
+    "mmap_size": 256 * 1024 * 1024,
+    "cache_size": -16 * 1024,  # 負值單位為 KiB，約 16 MiB
+    "temp_store": "MEMORY",
+}
+# 每條連線保留的 prepared statement 數量
+STATEMENT_CACHE_SIZE = 256
+
+
+class ConnectionPool:
+    """
+    每個 thread 一條唯讀 SQLite 連線（mode=ro），重複使用直到 DB 檔被替換或 fork。
+    Dash 的 threaded callback 各自拿自己 thread 的連線，不會共用 cursor。
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: dict[int, sqlite3.Connection] = {}
+        self._pid = os.getpid()
+        self._stats = {"opened": 0, "reused": 0, "closed": 0}
+
+    def _open(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(
+            database=f"{self.db_path.as_uri()}?mode=ro",
+            uri=True,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE,
+        )
+        for name, value in CONNECTION_PRAGMAS.items():
+            connection.execute(f"PRAGMA {name} = {value}")
+        return connection
+
+    def _reset_after_fork(self) -> None:
+        # fork 之後父行程的連線不能沿用，直接丟掉重開
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = {}
+        self._pid = os.getpid()
+
+    def connection(self) -> sqlite3.Connection:
+        if os.getpid() != self._pid:
+            self._reset_after_fork()
+
+        inode = self.db_path.stat().st_ino
+        connection = getattr(self._local, "connection", None)
+        if connection is not None and self._local.inode == inode:
+            with self._lock:
+                self._stats["reused"] += 1
+            return connection
+
+        if connection is not None:
+            # DB 檔被整個替換掉（例如重新匯入），舊連線還指著舊檔
+            self._discard(threading.get_ident())
+
+        connection = self._open()
+        self._local.connection = connection
+        self._local.inode = inode
+        with self._lock:
+            self._prune_dead_threads()
+            stale = self._connections.pop(threading.get_ident(), None)
+            if stale is not None:
+                # thread ident 被新 thread 重複使用
+                stale.close()
+                self._stats["closed"] += 1
+            self._connections[threading.get_ident()] = connection
+            self._stats["opened"] += 1
+        return connection
+
+    def _discard(self, ident: int) -> None:
+        with self._lock:
+            connection = self._connections.pop(ident, None)
+            if connection is not None:
+                connection.close()
+                self._stats["closed"] += 1
+
+    def _prune_dead_threads(self) -> None:
+        alive = {thread.ident for thread in threading.enumerate()}
+        for ident in [ident for ident in self._connections if ident not in alive]:
+            self._connections.pop(ident).close()
+            self._stats["closed"] += 1
+
+    def close_all(self) -> None:
+        with self._lock:
+            for connection in self._connections.values():
+                connection.close()
+                self._stats["closed"] += 1
+            self._connections.clear()
+        self._local = threading.local()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, "live": len(self._connections)}
+
+
+POOL = ConnectionPool(DB_PATH)
+
+
+def get_pool_stats() -> dict:
+    """
+    連線池統計：opened / reused / closed 次數與目前存活連線數
+    """
+    return POOL.stats()
+
+
+def close_pool() -> None:
+    POOL.close_all()
+
+
+# 每次 query 結束後呼叫 listener(sql, params, seconds, rows)
+_query_listeners: list[Callable[[str, dict, float, int], None]] = []
+
+
+def add_query_listener(listener: Callable[[str, dict, float, int], None]) -> None:
+    _query_listeners.append(listener)
+
+
+def remove_query_listener(listener: Callable[[str, dict, float, int], None]) -> None:
+    _query_listeners.remove(listener)
+
+
+def normalize_sql(sql: str) -> str:
+    """
+    把 SQL 的空白壓成單一空格，當作 log / metrics 的 label
+    """
+    return " ".join(sql.split())
+
+
+# EXPLAIN QUERY PLAN 的一步是否整張掃 dashboard 讀的表
+# （球員表、球隊表與彙總表；migrations --check 與慢查詢報表共用）
+FULL_SCAN = re.compile(r"^SCAN (batter|pitcher|team|batter_summary|pitcher_summary|season_group_metrics)\b")
+
+
+def bind_params(params: dict | None) -> dict:
+    """
+    把 list / tuple 參數轉成 JSON 字串，SQL 端用 json_each 展開成 IN-list：
+        WHERE POS IN (SELECT value FROM json_each(:roles))
+    不論選幾個值，SQL 字串都一樣，prepared statement 可以重複使用。
+    """
+    if not params:
+        return {}
+    return {
+        name: json.dumps(list(value)) if isinstance(value, (list, tuple)) else value
+        for name, value in params.items()
+    }
 
 
-def query(sql: str) -> pd.DataFrame:
-    connection = sqlite3.connect(database=DB_PATH)
+def query(sql: str, params: dict | None = None, dtypes: dict | None = None) -> "pd.DataFrame":
+    """
+    執行 SQL 並回傳 DataFrame。值一律以具名參數（:name）傳入，不要拼進 SQL 字串。
+    dtypes：{欄位: dtype}，有給的欄位不用推斷，直接轉成指定型別。
+    """
+    connection = POOL.connection()
+    bound = bind_params(params)
+    start = time.perf_counter()
     cur = connection.cursor()
-    cur.execute(sql, ())
-    rows = cur.fetchall()
-    col_names = [desc[0] for desc in cur.description]
+    try:
+        cur.execute(sql, bound)
+        rows = cur.fetchall()
+        col_names = [desc[0] for desc in cur.description]
+    finally:
+        cur.close()
+    elapsed = time.perf_counter() - start
+    for listener in _query_listeners:
+        listener(sql, bound, elapsed, len(rows))
+    # pandas 很重，第一次 query 時才載入（app 啟動不需要）
+    import pandas as pd
+
     result = pd.DataFrame(data=rows, columns=col_names)
-    connection.close()
+    if dtypes:
+        result = result.astype(dtypes)
     return result
 
 
-def load_batter_raw():
-    sql = """
+# query_columns 每批從 cursor 取幾列
+COLUMN_FETCH_BATCH = 4096
+
+
+class _ColumnBuffer:
+    """
+    一個欄位的 NumPy buffer，容量不夠時倍增。
+    category 欄位邊讀邊編碼（字串 -> int32 code），每個不同的值只保留一個 Python 物件。
+    """
+
+    def __init__(self, dtype, capacity: int):
+        import numpy as np
+
+        self.categorical = dtype == "category"
+        self.dtype = np.dtype("int32" if self.categorical else (dtype or object))
+        self.values = np.empty(capacity, dtype=self.dtype)
+        self.codes: dict = {}
+        self.size = 0
+
+    def extend(self, column: tuple) -> None:
+        import numpy as np
+
+        end = self.size + len(column)
+        if end > len(self.values):
+            grown = np.empty(max(end, 2 * len(self.values)), dtype=self.dtype)
+            grown[:self.size] = self.values[:self.size]
+            self.values = grown
+        if self.categorical:
+            codes = self.codes
+            # NULL 的 code 是 -1（pandas 的缺值）
+            column = [-1 if value is None else codes.setdefault(value, len(codes)) for value in column]
+        # np.array 會把 float 欄位的 None 轉成 NaN
+        self.values[self.size:end] = np.array(column, dtype=self.dtype)
+        self.size = end
+
+    def finish(self):
+        import numpy as np
+        import pandas as pd
+
+        values = self.values[:self.size]
+        if self.categorical:
+            # 跟 astype("category") 一樣把 categories 排序（groupby 的輸出順序依 categories）
+            categories = sorted(self.codes)
+            remap = np.empty(len(categories) + 1, dtype="int32")
+            remap[[self.codes[value] for value in categories]] = np.arange(len(categories))
+            remap[-1] = -1
+            return pd.Categorical.from_codes(remap[values], categories=categories)
+        if self.dtype == object:
+            # 沒指定型別的欄位交給 pandas 推斷
+            return pd.Series(values).infer_objects()
+        return values
+
+
+def query_columns(sql: str, params: dict | None = None, dtypes: dict | None = None, batch_size: int = COLUMN_FETCH_BATCH) -> "pd.DataFrame":
+    """
+    整張表的載入用：以 fetchmany 分批讀，每批直接寫進每個欄位的 NumPy 陣列，
+    不會先把所有列留成 Python tuple 再交給 pandas（峰值記憶體約為一批 tuple + 欄式陣列）。
+    dtypes 沒列到的欄位以 object 讀進來再推斷；NOT NULL 才能指定整數型別（NULL 會讓寫入失敗）。
+    """
+    import pandas as pd
+
+    dtypes = dtypes or {}
+    connection = POOL.connection()
+    bound = bind_params(params)
+    start = time.perf_counter()
+    cur = connection.cursor()
+    try:
+        cur.execute(sql, bound)
+        col_names = [desc[0] for desc in cur.description]
+        buffers = [_ColumnBuffer(dtypes.get(name), batch_size) for name in col_names]
+        while True:
+            batch = cur.fetchmany(batch_size)
+            if not batch:
+                break
+            for buffer, column in zip(buffers, zip(*batch)):
+                buffer.extend(column)
+    finally:
+        cur.close()
+    rows = buffers[0].size if buffers else 0
+    elapsed = time.perf_counter() - start
+    for listener in _query_listeners:
+        listener(sql, bound, elapsed, rows)
+
+    return pd.DataFrame({name: buffer.finish() for name, buffer in zip(col_names, buffers)}, copy=False)
+
+
+# 聯盟表的欄位型別：代碼用 category（playerID 跨季重複，也用 category），
+# 計數與薪水用 int32（NOT NULL 欄位），可為 NULL 或只拿來排名的比率用 float32
+BATTER_RAW_SQL = """
     SELECT playerID, yearID, teamID, POS,
            AB, H, "2B", "3B", HR, BB, SO, HBP, SF, SH, salary,
            `ops+` AS OPS_plus
     FROM batter
-    """
-    return query(sql)
+"""
+BATTER_RAW_DTYPES = {
+    "playerID": "category",
+    "yearID": "int16",
+    "teamID": "category",
+    "POS": "category",
+    **{column: "int32" for column in ["AB", "H", "2B", "3B", "HR", "BB", "SO", "HBP", "SF", "SH", "salary"]},
+    "OPS_plus": "float32",
+}
 
-
-def load_pitcher_raw():
-    sql = """
+PITCHER_RAW_SQL = """
     SELECT playerID, yearID, teamID, POS, throws,
            IPouts, H, ER, HR, BB, SO, ERA, fip, "fip-", salary
     FROM pitcher
+"""
+PITCHER_RAW_DTYPES = {
+    "playerID": "category",
+    "yearID": "int16",
+    "teamID": "category",
+    "POS": "category",
+    "throws": "category",
+    **{column: "int32" for column in ["IPouts", "H", "HR", "BB", "SO", "salary"]},
+    # ER 可為 NULL，int32 放不下 NaN
+    **{column: "float32" for column in ["ER", "ERA", "fip", "fip-"]},
+}
+
+
+def load_batter_raw():
+    return query_columns(BATTER_RAW_SQL, dtypes=BATTER_RAW_DTYPES)
+
+
+def load_pitcher_raw():
+    return query_columns(PITCHER_RAW_SQL, dtypes=PITCHER_RAW_DTYPES)
+
+
+def get_data_version() -> tuple:
+    """
+    DB 檔的資料版本（inode, mtime, size），檔案一有變動就會不同
     """
-    return query(sql)
+    stat = DB_PATH.stat()
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
@@ -0,0 +1,142 @@
+"""
+圖表函式的 LRU cache：以 (函式, 參數, DB data version) 為鍵，存序列化後的 figure JSON。
+process 內沒命中時再查跨 worker 共用的 RESULT_CACHE（見 result_cache），都沒有才重畫。
+
+上限可用環境變數調整：
+    MLB_FIGURE_CACHE_ENTRIES   最多幾張圖（預設 256）
+    MLB_FIGURE_CACHE_BYTES     JSON 總大小上限（預設 64 MiB）
+"""
+import functools
+import inspect
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Callable
+
+from src.db_access import get_data_version
+from src.result_cache import RESULT_CACHE, bind_arguments, cache_key
+
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+
+
+class FigureCache:
+    """
+    thread-safe 的 LRU；超過筆數或位元組上限時從最久沒用的開始淘汰
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[tuple, str] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, key: tuple) -> str | None:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return value
+
+    def put(self, key: tuple, value: str) -> None:
+        size = len(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old)
+            self._entries[key] = value
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                self._stats["evictions"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, "entries": len(self._entries), "bytes": self._bytes}
+
+
+FIGURE_CACHE = FigureCache(
+    max_entries=int(os.environ.get("MLB_FIGURE_CACHE_ENTRIES", 256)),
+    max_bytes=int(os.environ.get("MLB_FIGURE_CACHE_BYTES", 64 * 1024 * 1024)),
+)
+
+
+def _freeze(value):
+    """
+    把 list / dict 參數轉成可 hash 的 tuple（Dash 多選傳進來的是 list）
+    """
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    return value
+
+
+def figure_from_json(value: str) -> "go.Figure":
+    import plotly.graph_objects as go
+
+    # JSON 是我們自己序列化的合法 figure，略過 plotly 的逐屬性驗證（驗證比重畫還慢）
+    return go.Figure(json.loads(value), _validate=False)
+
+
+def cached_figure(func: Callable[..., "go.Figure"]) -> Callable[..., "go.Figure"]:
+    """
+    decorator：命中時從 JSON 還原一份新的 Figure，呼叫端可以放心 update_layout
+    """
+
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        # 位置 / 關鍵字 / 省略預設值的同一個呼叫要對到同一把鍵
+        arguments = bind_arguments(signature, args, kwargs)
+        if arguments is None:
+            # 參數對不上簽章，讓函式自己丟錯
+            return func(*args, **kwargs)
+        data_version = get_data_version()
+        key = (func.__module__, func.__qualname__, _freeze(arguments), data_version)
+        try:
+            cached = FIGURE_CACHE.get(key)
+        except TypeError:
+            # 參數不能 hash，就不要 cache
+            return func(*args, **kwargs)
+        if cached is not None:
+            return figure_from_json(cached)
+
+        # 別的 worker 可能已經畫過
+        shared_key = cache_key(func, arguments) if RESULT_CACHE is not None else None
+        if shared_key is not None:
+            cached = RESULT_CACHE.get(shared_key)
+            if cached is not None:
+                FIGURE_CACHE.put(key, cached)
+                return figure_from_json(cached)
+
+        fig = func(*args, **kwargs)
+        value = fig.to_json()
+        FIGURE_CACHE.put(key, value)
+        if shared_key is not None:
+            RESULT_CACHE.put(shared_key, value, data_version=data_version)
+        return fig
+
+    return wrapper
+
+
+def get_figure_cache_stats() -> dict:
+    """
+    hits / misses / evictions 次數與目前的筆數、位元組
+    """
+    return FIGURE_CACHE.stats()
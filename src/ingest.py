@@ -0,0 +1,281 @@
+"""
+把 data/*.csv 匯入 SQLite（整批重建）。
+
+    python -m src.ingest                       # data/ -> db/MLBDashboard.db
+    python -m src.ingest --data-dir other/ --db /tmp/mlb.db --chunk-size 100000
+
+流程：建表 -> 每張 CSV 分批 executemany -> 建索引 / role 欄位 / 彙總表（migrations）-> ANALYZE，
+全部在同一個 transaction 內，寫進暫存檔後再 os.replace 到目標位置，
+正在跑的 dashboard 只會看到舊檔或完整的新檔。
+"""
+import argparse
+import csv
+import itertools
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Iterable, Iterator, Sequence
+
+from src.db_access import DB_PATH, PROJECT_ROOT
+from src.migrations import apply_migrations
+
+DATA_DIR = PROJECT_ROOT / "data"
+
+# 匯入順序：team 先，球員表有 FK 指向 team
+TABLES = ["team", "batter", "pitcher"]
+
+TABLE_SCHEMAS = {
+    "team": """
+    CREATE TABLE "team" (
+        "yearID" INTEGER NOT NULL,
+        "lgID" TEXT NOT NULL,
+        "teamID" TEXT NOT NULL,
+        "franchID" TEXT NOT NULL,
+        "divID" TEXT NOT NULL,
+        "Rank" INTEGER NOT NULL,
+        "G" INTEGER NOT NULL,
+        "Ghome" REAL NOT NULL,
+        "W" INTEGER NOT NULL,
+        "L" INTEGER NOT NULL,
+        "DivWin" TEXT NOT NULL,
+        "WCWin" TEXT NOT NULL,
+        "LgWin" TEXT NOT NULL,
+        "WSWin" TEXT NOT NULL,
+        "R" INTEGER NOT NULL,
+        "AB" INTEGER NOT NULL,
+        "H" INTEGER NOT NULL,
+        "2B" INTEGER NOT NULL,
+        "3B" INTEGER NOT NULL,
+        "HR" INTEGER NOT NULL,
+        "BB" INTEGER NOT NULL,
+        "SO" REAL NOT NULL,
+        "SB" REAL NOT NULL,
+        "CS" REAL NOT NULL,
+        "HBP" REAL NOT NULL,
+        "SF" REAL NOT NULL,
+        "RA" INTEGER NOT NULL,
+        "ER" INTEGER NOT NULL,
+        "ERA" REAL NOT NULL,
+        "CG" INTEGER NOT NULL,
+        "SHO" INTEGER NOT NULL,
+        "SV" INTEGER NOT NULL,
+        "IPouts" INTEGER NOT NULL,
+        "HA" INTEGER NOT NULL,
+        "HRA" INTEGER NOT NULL,
+        "BBA" INTEGER NOT NULL,
+        "SOA" INTEGER NOT NULL,
+        "E" INTEGER NOT NULL,
+        "DP" INTEGER NOT NULL,
+        "FP" REAL NOT NULL,
+        "name" TEXT NOT NULL,
+        "park" TEXT NOT NULL,
+        "attendance" REAL NOT NULL,
+        "BPF" INTEGER NOT NULL,
+        "PPF" INTEGER NOT NULL,
+        "teamIDBR" TEXT NOT NULL,
+        "teamIDlahman45" TEXT NOT NULL,
+        "teamIDretro" TEXT NOT NULL,
+        PRIMARY KEY("teamID","yearID")
+    )
+    """,
+    "batter": """
+    CREATE TABLE "batter" (
+        "playerID" TEXT NOT NULL,
+        "yearID" INTEGER NOT NULL,
+        "stint" INTEGER NOT NULL,
+        "teamID" TEXT NOT NULL,
+        "lgID" TEXT NOT NULL,
+        "G" INTEGER NOT NULL,
+        "G_batting" REAL NOT NULL,
+        "AB" INTEGER NOT NULL,
+        "R" INTEGER NOT NULL,
+        "H" INTEGER NOT NULL,
+        "2B" INTEGER NOT NULL,
+        "3B" INTEGER NOT NULL,
+        "HR" INTEGER NOT NULL,
+        "RBI" REAL NOT NULL,
+        "SB" REAL NOT NULL,
+        "CS" REAL NOT NULL,
+        "BB" INTEGER NOT NULL,
+        "SO" REAL NOT NULL,
+        "IBB" REAL NOT NULL,
+        "HBP" REAL NOT NULL,
+        "SH" REAL NOT NULL,
+        "SF" REAL NOT NULL,
+        "GIDP" REAL NOT NULL,
+        "G_old" REAL NOT NULL,
+        "POS" TEXT NOT NULL,
+        "obp" REAL,
+        "slg" REAL,
+        "ops+" REAL,
+        "salary" INTEGER NOT NULL,
+        PRIMARY KEY("playerID","teamID","yearID"),
+        FOREIGN KEY("teamID") REFERENCES "team"("teamID"),
+        FOREIGN KEY("yearID") REFERENCES "team"("yearID")
+    )
+    """,
+    "pitcher": """
+    CREATE TABLE "pitcher" (
+        "playerID" TEXT NOT NULL,
+        "yearID" INTEGER NOT NULL,
+        "stint" INTEGER NOT NULL,
+        "teamID" TEXT NOT NULL,
+        "lgID" TEXT NOT NULL,
+        "W" INTEGER NOT NULL,
+        "L" INTEGER NOT NULL,
+        "G" INTEGER NOT NULL,
+        "GS" INTEGER NOT NULL,
+        "CG" INTEGER NOT NULL,
+        "SHO" INTEGER NOT NULL,
+        "SV" INTEGER NOT NULL,
+        "IPouts" INTEGER NOT NULL,
+        "H" INTEGER NOT NULL,
+        "ER" INTEGER,
+        "HR" INTEGER NOT NULL,
+        "BB" INTEGER NOT NULL,
+        "SO" INTEGER NOT NULL,
+        "BAOpp" REAL NOT NULL,
+        "ERA" REAL,
+        "IBB" REAL NOT NULL,
+        "WP" INTEGER NOT NULL,
+        "HBP" REAL NOT NULL,
+        "BK" INTEGER NOT NULL,
+        "BFP" REAL NOT NULL,
+        "GF" INTEGER NOT NULL,
+        "R" INTEGER NOT NULL,
+        "SH" REAL NOT NULL,
+        "SF" REAL NOT NULL,
+        "GIDP" REAL NOT NULL,
+        "fip" REAL,
+        "fip-" REAL,
+        "POS" TEXT NOT NULL,
+        "salary" INTEGER NOT NULL,
+        "throws" TEXT NOT NULL,
+        PRIMARY KEY("playerID","teamID","yearID"),
+        FOREIGN KEY("teamID") REFERENCES "team"("teamID"),
+        FOREIGN KEY("yearID") REFERENCES "team"("yearID")
+    )
+    """,
+}
+
+# 大量寫入用：不寫 journal、不 fsync，失敗時整個暫存檔丟掉重來即可
+BULK_LOAD_PRAGMAS = {
+    "journal_mode": "OFF",
+    "synchronous": "OFF",
+    "locking_mode": "EXCLUSIVE",
+    "cache_size": -256 * 1024,  # 約 256 MiB
+    "temp_store": "MEMORY",
+    "analysis_limit": 1000,  # ANALYZE 只抽樣，不掃完整張表
+}
+
+DEFAULT_CHUNK_SIZE = 50_000
+
+
+def open_bulk_connection(db_path: Path) -> sqlite3.Connection:
+    connection = sqlite3.connect(db_path, isolation_level=None)
+    for name, value in BULK_LOAD_PRAGMAS.items():
+        connection.execute(f"PRAGMA {name} = {value}")
+    return connection
+
+
+def create_tables(connection: sqlite3.Connection) -> None:
+    for table in TABLES:
+        connection.execute(TABLE_SCHEMAS[table])
+
+
+def insert_rows(
+    connection: sqlite3.Connection,
+    table: str,
+    columns: Sequence[str],
+    rows: Iterable[Sequence],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """
+    分批 executemany 寫入，回傳寫入筆數。欄位型別交給 SQLite 的 column affinity 轉換。
+    """
+    column_sql = ", ".join(f'"{column}"' for column in columns)
+    placeholders = ", ".join("?" for _ in columns)
+    sql = f'INSERT INTO "{table}" ({column_sql}) VALUES ({placeholders})'
+
+    total = 0
+    rows = iter(rows)
+    while True:
+        chunk = list(itertools.islice(rows, chunk_size))
+        if not chunk:
+            return total
+        connection.executemany(sql, chunk)
+        total += len(chunk)
+
+
+def read_csv(path: Path) -> tuple[list[str], Iterator[list]]:
+    """
+    回傳 (header, row iterator)；空字串視為 NULL
+    """
+    handle = path.open(newline="", encoding="utf-8")
+    reader = csv.reader(handle)
+    header = next(reader)
+
+    def rows():
+        with handle:
+            for row in reader:
+                yield [None if value == "" else value for value in row]
+
+    return header, rows()
+
+
+def ingest(data_dir: Path = DATA_DIR, db_path: Path = DB_PATH, chunk_size: int = DEFAULT_CHUNK_SIZE) -> dict:
+    """
+    從 data_dir 的 CSV 重建 db_path，回傳每個步驟的筆數與耗時
+    """
+    tmp_path = db_path.with_name(db_path.name + ".tmp")
+    tmp_path.unlink(missing_ok=True)
+
+    stats = {}
+    connection = open_bulk_connection(tmp_path)
+    try:
+        connection.execute("BEGIN")
+        create_tables(connection)
+        for table in TABLES:
+            start = time.perf_counter()
+            header, rows = read_csv(data_dir / f"{table}.csv")
+            count = insert_rows(connection, table, header, rows, chunk_size)
+            stats[table] = {"rows": count, "seconds": time.perf_counter() - start}
+
+        # 資料都進去之後才建索引、role 欄位與彙總表
+        start = time.perf_counter()
+        version = apply_migrations(connection)
+        stats["indexes"] = {"schema_version": version, "seconds": time.perf_counter() - start}
+        connection.execute("COMMIT")
+    except BaseException:
+        connection.close()
+        tmp_path.unlink(missing_ok=True)
+        raise
+    connection.close()
+
+    os.replace(tmp_path, db_path)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR)
+    parser.add_argument("--db", type=Path, default=DB_PATH)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    stats = ingest(data_dir=args.data_dir, db_path=args.db, chunk_size=args.chunk_size)
+    elapsed = time.perf_counter() - start
+
+    total_rows = 0
+    for table in TABLES:
+        rows, seconds = stats[table]["rows"], stats[table]["seconds"]
+        total_rows += rows
+        print(f"{table:8s} {rows:>10,d} rows  {seconds:7.2f}s  {rows / max(seconds, 1e-9):>12,.0f} rows/s")
+    print(f"indexes  schema v{stats['indexes']['schema_version']:<8d}      {stats['indexes']['seconds']:7.2f}s")
+    print(f"total    {total_rows:>10,d} rows  {elapsed:7.2f}s  {total_rows / elapsed:>12,.0f} rows/s -> {args.db}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,11 @@
 from dash import dcc, html, Input, Output, callback
 
+from src.metrics import timed
 from src.page import (
     page_overview,
     page_performance,
-    page_contribution
+    page_contribution,
+    page_trends
 )
 
 
@@ -39,6 +41,7 @@ layout = html.Div(
                                 dcc.Tab(label="Overview", value="overview"),
                                 dcc.Tab(label="Performance", value="performance"),
                                 dcc.Tab(label="Contribution", value="contribution"),
+                                dcc.Tab(label="Trends", value="trends"),
                             ],
                         ),
                     ],
@@ -66,6 +69,7 @@ layout = html.Div(
     Output("page-content", "children"),
     Input("top-tabs", "value"),
 )
+@timed
 def render_page(tab):
     if tab == "overview":
         return page_overview()
@@ -73,4 +77,6 @@ def render_page(tab):
         return page_performance()
     if tab == "contribution":
         return page_contribution()
+    if tab == "trends":
+        return page_trends()
     return page_overview()
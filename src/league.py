@@ -0,0 +1,156 @@
+import threading
+from typing import Callable, Generic, TypeVar
+
+import pandas as pd
+
+from src.db_access import load_batter_raw, load_pitcher_raw, get_data_version
+from src.percentile import percentile_ranks
+from src.snapshot import load_snapshot
+
+T = TypeVar("T")
+
+
+def compute_batter_rates(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    計算打者的各種率（AVG, OBP, SLG, BB_rate, K_rate）
+    """
+    df = df.copy()
+    # 基本打擊指標計算
+    df["1B"] = df["H"] - df["2B"] - df["3B"] - df["HR"]
+    df["PA"] = df["AB"] + df["BB"] + df["HBP"] + df["SF"] + df["SH"]
+
+    df["AVG"] = df["H"] / df["AB"].where(df["AB"] > 0, 1)
+    df["OBP"] = (df["H"] + df["BB"] + df["HBP"]) / df["PA"].where(df["PA"] > 0, 1)
+    df["SLG"] = (df["1B"] + 2 * df["2B"] + 3 * df["3B"] + 4 * df["HR"]) / df["AB"].where(df["AB"] > 0, 1)
+    df["BB_rate"] = df["BB"] / df["PA"].where(df["PA"] > 0, 1)
+    df["K_rate"] = df["SO"] / df["PA"].where(df["PA"] > 0, 1)
+    df["OPS_plus"] = pd.to_numeric(df["OPS_plus"], errors="coerce")
+
+    return df
+
+
+def add_batter_pr(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    計算打者各指標的百分等級排名（PR）
+    """
+    pr = percentile_ranks(
+        df,
+        higher_better=["AVG", "OBP", "SLG", "BB_rate", "OPS_plus"],
+        lower_better=["K_rate"],  # K_rate 越低越好，所以反向
+        qualified=df["PA"] >= 50,  # 設門檻，避免樣本太小
+    )
+    return pd.concat([df, pr], axis=1)
+
+
+def compute_pitcher_rates(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    計算投手的各種率（K9, BB9, H9, WHIP）
+    """
+    df = df.copy()
+
+    # 將 IPouts 轉成局數
+    df["IP"] = df["IPouts"] / 3.0
+
+    # 避免除以 0 的情況：IP <= 0 時，把分母設成 1（結果不會被我們當成有意義的樣本）
+    ip_safe = df["IP"].where(df["IP"] > 0, 1)
+
+    # K/9, BB/9, H/9
+    df["K9"] = df["SO"] * 9 / ip_safe
+    df["BB9"] = df["BB"] * 9 / ip_safe
+    df["H9"] = df["H"] * 9 / ip_safe
+
+    # WHIP = (BB + H) / IP
+    df["WHIP"] = (df["BB"] + df["H"]) / ip_safe
+
+    # 確保 ERA、fip 是數值
+    df["ERA"] = pd.to_numeric(df["ERA"], errors="coerce")
+    df["fip"] = pd.to_numeric(df["fip"], errors="coerce")
+
+    return df
+
+
+def add_pitcher_pr(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    計算投手各指標的百分等級排名（PR）
+    """
+    pr = percentile_ranks(
+        df,
+        higher_better=["K9"],
+        lower_better=["ERA", "fip", "WHIP", "BB9", "H9"],  # 數值越好 PR 越高
+        qualified=df["IP"] >= 20,  # 設定聯盟樣本門檻：IP >= 20
+    )
+    return pd.concat([df, pr], axis=1)
+
+
+class LeagueTable(Generic[T]):
+    """
+    全聯盟資料（球員 rate + PR、薪水分布…）的 process-wide 快取。
+    以 DB 檔的 data version 為鍵，DB 變動後下一次讀取會自動重算。
+    回傳的物件由所有呼叫端共用，請勿就地修改。
+    """
+
+    def __init__(self, build: Callable[[], T]):
+        self._build = build
+        self._lock = threading.Lock()
+        self._entry: tuple[tuple, T] | None = None
+
+    def get(self) -> T:
+        version = get_data_version()
+        entry = self._entry
+        if entry is not None and entry[0] == version:
+            return entry[1]
+
+        # 同一時間只讓一個 thread 重算，其他人等結果
+        with self._lock:
+            entry = self._entry
+            if entry is None or entry[0] != version:
+                entry = (version, self._build())
+                self._entry = entry
+            return entry[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entry = None
+
+
+def compute_batter_league() -> pd.DataFrame:
+    """
+    從 SQLite 讀全聯盟打者並計算 rate + PR
+    """
+    return add_batter_pr(compute_batter_rates(load_batter_raw()))
+
+
+def compute_pitcher_league() -> pd.DataFrame:
+    """
+    從 SQLite 讀全聯盟投手並計算 rate + PR
+    """
+    return add_pitcher_pr(compute_pitcher_rates(load_pitcher_raw()))
+
+
+def _build_batter_league() -> pd.DataFrame:
+    # snapshot 還是最新的話直接 mmap，過期或不存在才從 SQLite 重算
+    snapshot = load_snapshot("batter")
+    return snapshot if snapshot is not None else compute_batter_league()
+
+
+def _build_pitcher_league() -> pd.DataFrame:
+    snapshot = load_snapshot("pitcher")
+    return snapshot if snapshot is not None else compute_pitcher_league()
+
+
+BATTER_LEAGUE = LeagueTable(_build_batter_league)
+PITCHER_LEAGUE = LeagueTable(_build_pitcher_league)
+
+
+def get_batter_league() -> pd.DataFrame:
+    """
+    取得全聯盟打者（含 rate 與 *_PR 欄位）
+    """
+    return BATTER_LEAGUE.get()
+
+
+def get_pitcher_league() -> pd.DataFrame:
+    """
+    取得全聯盟投手（含 rate 與 *_PR 欄位）
+    """
+    return PITCHER_LEAGUE.get()
@@ -0,0 +1,230 @@
+"""
+Prometheus 文字格式的 /metrics：callback 延遲、SQL 耗時與筆數、快取命中率、process 記憶體。
+
+不依賴 prometheus_client；每次 observe 只有一次 bisect 加一把鎖，可以常開。
+每個 gunicorn worker 各自計數（Prometheus 端以 instance / pid 區分或加總）。
+
+background callback（Contribution 的 compute_apply，見 background.py）在 diskcache manager
+另開的子 process 裡執行，它的 callback 延遲與其中的 SQL 都記在子 process，不會出現在 /metrics；
+worker 只看得到送出 job 與輪詢結果的 request。要量它請用 MLB_BACKGROUND_CALLBACKS=0
+（同步執行）或 benchmarks/bench_suite。
+
+    curl localhost:8050/metrics
+"""
+import bisect
+import functools
+import hashlib
+import os
+import resource
+import threading
+import time
+from typing import Callable
+
+from flask import Flask, Response
+
+from src.db_access import add_query_listener, get_pool_stats, normalize_sql
+from src.figure_cache import get_figure_cache_stats
+from src.result_cache import get_result_cache_stats
+
+# 秒；涵蓋 1ms 的快取命中到數秒的冷啟動重算
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# SQL 太長不適合整段當 label：取開頭這麼多字方便閱讀，後面接完整 SQL 的短 hash，
+# 開頭相同的不同查詢不會混在同一個 label（dashboard 的 SQL 都是固定字串，label 數量有限）
+QUERY_LABEL_PREFIX = 80
+QUERY_LABEL_HASH_LENGTH = 12
+
+
+class Histogram:
+    """
+    一組 label 值對應一份 bucket 計數（累積分布在輸出時才算）
+    """
+
+    def __init__(self, name: str, help_text: str, label_names: tuple[str, ...], buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._series: dict[tuple, list] = {}  # labels -> [bucket counts..., +Inf count, sum]
+
+    def observe(self, labels: tuple, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {labels: list(values) for labels, values in self._series.items()}
+        for labels, values in sorted(series.items()):
+            label_text = format_labels(self.label_names, labels)
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), values[:-1]):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{self.name}_bucket{{{label_text},le=\"{le}\"}} {cumulative}")
+            lines.append(f"{self.name}_sum{{{label_text}}} {values[-1]}")
+            lines.append(f"{self.name}_count{{{label_text}}} {cumulative}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, label_names: tuple[str, ...]):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self._lock = threading.Lock()
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, labels: tuple, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = dict(self._values)
+        for labels, value in sorted(values.items()):
+            lines.append(f"{self.name}{{{format_labels(self.label_names, labels)}}} {value}")
+        return lines
+
+
+def escape_label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(names: tuple[str, ...], values: tuple) -> str:
+    return ",".join(f'{name}="{escape_label(value)}"' for name, value in zip(names, values))
+
+
+CALLBACK_LATENCY = Histogram(
+    "mlb_callback_duration_seconds", "Dash callback latency.", ("callback",)
+)
+CALLBACK_ERRORS = Counter(
+    "mlb_callback_errors_total", "Dash callbacks that raised.", ("callback",)
+)
+QUERY_LATENCY = Histogram(
+    "mlb_query_duration_seconds", "db_access.query execution + fetch time.", ("query",)
+)
+QUERY_ROWS = Counter(
+    "mlb_query_rows_total", "Rows returned by db_access.query.", ("query",)
+)
+
+
+def timed(func: Callable) -> Callable:
+    """
+    decorator：記錄 callback 的延遲（放在 @callback 下面，包住原本的函式）
+    """
+    name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        except Exception:
+            CALLBACK_ERRORS.inc((name,))
+            raise
+        finally:
+            CALLBACK_LATENCY.observe((name,), time.perf_counter() - start)
+
+    return wrapper
+
+
+@functools.lru_cache(maxsize=1024)
+def query_label(sql: str) -> str:
+    """
+    "<正規化 SQL 的開頭> #<完整正規化 SQL 的 sha1 前幾碼>"
+    """
+    normalized = normalize_sql(sql)
+    digest = hashlib.sha1(normalized.encode()).hexdigest()[:QUERY_LABEL_HASH_LENGTH]
+    return f"{normalized[:QUERY_LABEL_PREFIX]} #{digest}"
+
+
+def _record_query(sql: str, params: dict, seconds: float, rows: int) -> None:
+    label = query_label(sql)
+    QUERY_LATENCY.observe((label,), seconds)
+    QUERY_ROWS.inc((label,), rows)
+
+
+add_query_listener(_record_query)
+
+
+def gauge_lines(name: str, help_text: str, samples: list[tuple[str, float]]) -> list[str]:
+    """
+    samples: [(label 字串（可為空）, 值)]
+    """
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+    for labels, value in samples:
+        lines.append(f"{name}{{{labels}}} {value}" if labels else f"{name} {value}")
+    return lines
+
+
+def hit_ratio(stats: dict) -> float:
+    lookups = stats.get("hits", 0) + stats.get("misses", 0)
+    return stats.get("hits", 0) / lookups if lookups else 0.0
+
+
+def process_memory() -> dict[str, int]:
+    """
+    目前 RSS（Linux 讀 /proc）與峰值 RSS，單位 bytes
+    """
+    memory = {"peak_rss": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024}
+    try:
+        with open("/proc/self/statm") as handle:
+            memory["rss"] = int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    return memory
+
+
+def render_metrics() -> str:
+    lines = []
+    for metric in (CALLBACK_LATENCY, CALLBACK_ERRORS, QUERY_LATENCY, QUERY_ROWS):
+        lines += metric.render()
+
+    figure_stats = get_figure_cache_stats()
+    result_stats = get_result_cache_stats()
+    pool_stats = get_pool_stats()
+    cache_events = [
+        (f'cache="figure",event="{event}"', figure_stats[event]) for event in ("hits", "misses", "evictions")
+    ] + [
+        (f'cache="result",event="{event}"', result_stats[event]) for event in ("hits", "misses", "errors") if event in result_stats
+    ]
+    lines += [
+        "# HELP mlb_cache_events_total Cache lookups by outcome.",
+        "# TYPE mlb_cache_events_total counter",
+    ] + [f"mlb_cache_events_total{{{labels}}} {value}" for labels, value in cache_events]
+    lines += gauge_lines("mlb_cache_hit_ratio", "Hits / lookups since process start.", [
+        ('cache="figure"', hit_ratio(figure_stats)),
+    ] + ([('cache="result"', hit_ratio(result_stats))] if result_stats else []))
+    lines += gauge_lines("mlb_cache_bytes", "Bytes held by the cache.", [
+        ('cache="figure"', figure_stats["bytes"]),
+    ] + ([('cache="result"', result_stats["bytes"])] if "bytes" in result_stats else []))
+    # 累計次數（opened / reused / closed）是 counter，可以取 rate()；目前存活數才是 gauge
+    lines += [
+        "# HELP mlb_db_connection_events_total SQLite pool connection events since process start.",
+        "# TYPE mlb_db_connection_events_total counter",
+    ] + [
+        f'mlb_db_connection_events_total{{event="{event}"}} {value}'
+        for event, value in pool_stats.items() if event != "live"
+    ]
+    lines += gauge_lines("mlb_db_connections", "Live SQLite pool connections.", [
+        ("", pool_stats["live"]),
+    ])
+
+    memory = process_memory()
+    lines += gauge_lines("mlb_process_memory_bytes", "Process resident memory.", [
+        (f'kind="{kind}"', value) for kind, value in memory.items()
+    ])
+    return "\n".join(lines) + "\n"
+
+
+def register_metrics_endpoint(server: Flask, path: str = "/metrics") -> None:
+    @server.route(path)
+    def metrics():
+        return Response(render_metrics(), mimetype="text/plain; version=0.0.4")
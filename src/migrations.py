@@ -0,0 +1,177 @@
+"""
+DB schema 版本管理（以 PRAGMA user_version 記錄目前版本）。
+
+    python -m src.migrations            # 升到最新版本
+    python -m src.migrations --check    # 升級後檢查 dashboard 查詢沒有 full scan
+"""
+import argparse
+import sqlite3
+from pathlib import Path
+from typing import Callable
+
+from src.aggregates import rebuild_aggregates
+from src.db_access import DB_PATH, FULL_SCAN, add_query_listener, remove_query_listener
+from src.seasons import rebuild_season_aggregates
+
+# (version, 說明, SQL statements)；只能往後加，已發布的版本不要修改。
+# statement 也可以是 callable(connection)，用於需要 Python 計算的步驟（例如逐季 PR）
+MIGRATIONS: list[tuple[int, str, list[str | Callable[[sqlite3.Connection], None]]]] = [
+    (
+        1,
+        "covering indexes + pitcher role column",
+        [
+            # 投手角色（"SP R" 這種格式）做成 generated column，才能建索引
+            """
+            ALTER TABLE pitcher
+            ADD COLUMN role TEXT GENERATED ALWAYS AS (POS || ' ' || throws) VIRTUAL
+            """,
+            # 本隊查詢：teamID 固定，POS/role 篩選，指標與薪水直接從索引讀
+            """
+            CREATE INDEX IF NOT EXISTS idx_batter_team_year_pos
+            ON batter (teamID, yearID, POS, "ops+", salary, playerID)
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS idx_pitcher_team_year_pos
+            ON pitcher (teamID, yearID, POS, role, "fip-", salary, playerID)
+            """,
+            # 全聯盟 vs 本隊的平均：依守位 / 角色分組
+            """
+            CREATE INDEX IF NOT EXISTS idx_batter_pos_team
+            ON batter (POS, teamID, "ops+")
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS idx_pitcher_pos_throws_team
+            ON pitcher (POS, throws, teamID, "fip-")
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS idx_pitcher_role_team
+            ON pitcher (role, teamID, "fip-", salary, playerID)
+            """,
+            "ANALYZE",
+        ],
+    ),
+    (
+        2,
+        "team vs league summary tables",
+        # 建表（主鍵以 POS / teamID 開頭）與填值都在 rebuild_aggregates 裡
+        [rebuild_aggregates],
+    ),
+    (
+        3,
+        "per-season group metrics with rolling windows",
+        # 建表、索引與逐季計算都在 rebuild_season_aggregates 裡
+        [rebuild_season_aggregates],
+    ),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def current_version(connection: sqlite3.Connection) -> int:
+    return connection.execute("PRAGMA user_version").fetchone()[0]
+
+
+def apply_migrations(connection: sqlite3.Connection) -> int:
+    """
+    在呼叫端開好的 transaction 裡執行尚未套用的 migration，回傳套用後的版本號
+    """
+    version = current_version(connection)
+    for target, _description, statements in MIGRATIONS:
+        if target <= version:
+            continue
+        for statement in statements:
+            if callable(statement):
+                statement(connection)
+            else:
+                connection.execute(statement)
+        connection.execute(f"PRAGMA user_version = {target}")
+        version = target
+    return version
+
+
+def migrate(db_path: Path = DB_PATH) -> int:
+    """
+    把 DB 升到最新版本，回傳升級後的版本號。已是最新版時不會寫檔。
+    """
+    connection = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        if current_version(connection) >= LATEST_VERSION:
+            return current_version(connection)
+
+        # 多個 worker 同時啟動時，只有拿到 write lock 的那個會真的升級
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            version = apply_migrations(connection)
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        return version
+    finally:
+        connection.close()
+
+
+def capture_dashboard_queries() -> list[tuple[str, dict]]:
+    """
+    實際跑一次 dashboard 的資料函式，把送進 db_access.query 的 SQL 與參數收集起來
+    """
+    from src import charts
+    from src.constant import TEAM_ID
+
+    captured = []
+
+    def listener(sql, params, seconds, rows):
+        captured.append((sql, params))
+
+    add_query_listener(listener)
+    try:
+        charts.get_players(player_type="batter", roles=["C", "SS", "OF"])
+        charts.get_players(player_type="pitcher", roles=["SP R", "RP L"])
+        for group in ["SP", "RP", "H"]:
+            charts.plot_overview_breakdown(team_id=TEAM_ID, group=group)
+        charts.plot_performance_bar(team_id=TEAM_ID, player_type="batter", groups=["C", "1B"])
+        charts.plot_performance_bar(team_id=TEAM_ID, player_type="pitcher", groups=["SP R", "RP L"])
+        charts.get_overview_summary(TEAM_ID)
+        charts.get_season_trends(TEAM_ID, "batter", "H")
+        charts.get_season_trends(TEAM_ID, "pitcher", "SP_R")
+    finally:
+        remove_query_listener(listener)
+    return captured
+
+
+def check_query_plans(db_path: Path = DB_PATH) -> list[tuple[str, list[str]]]:
+    """
+    對每條 dashboard 查詢跑 EXPLAIN QUERY PLAN，確認沒有整張球員表 full scan。
+    回傳 (sql, plan) 清單；有 full scan 時丟 AssertionError。
+    """
+    connection = sqlite3.connect(f"{db_path.as_uri()}?mode=ro", uri=True)
+    try:
+        plans = []
+        for sql, params in capture_dashboard_queries():
+            plan = [row[3] for row in connection.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+            plans.append((sql, plan))
+    finally:
+        connection.close()
+
+    scans = [(sql, plan) for sql, plan in plans if any(FULL_SCAN.match(step) for step in plan)]
+    assert not scans, "full table scan in dashboard queries:\n" + "\n\n".join(
+        f"{' '.join(sql.split())}\n  -> {plan}" for sql, plan in scans
+    )
+    return plans
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--check", action="store_true", help="檢查 dashboard 查詢的 query plan")
+    args = parser.parse_args()
+
+    version = migrate()
+    print(f"{DB_PATH.name}: schema version {version}")
+    if args.check:
+        for sql, plan in check_query_plans():
+            print(f"{' '.join(sql.split())[:100]}\n  -> {plan}")
+        print("OK: no full table scans")
+
+
+if __name__ == "__main__":
+    main()
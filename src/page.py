@@ -3,7 +3,8 @@ from dash import html, dcc
 from src.containers import (
     overview_container,
     filter_bar,
-    contribution_salary_container
+    contribution_salary_container,
+    trends_container
 )
 
 
@@ -20,9 +21,9 @@ def page_performance():
     return html.Div(
         [
             filter_bar(
-                radio_id="player-type-radio",
-                dropdown_id="sub-type-dropdown",
-                button_id="apply-button",
+                radio_id="perf-player-type-radio",
+                dropdown_id="perf-sub-type-dropdown",
+                button_id="perf-apply-button",
                 default_player_type="batter",
             ),
 
@@ -59,8 +60,18 @@ def page_contribution():
                 dropdown_id="sub-type-dropdown",
                 button_id="apply-button",
                 default_player_type="batter",
+                background=True,
             ),
             contribution_salary_container()
         ],
         style={"padding": "16px"},
     )
+
+
+def page_trends():
+    return html.Div(
+        [
+            trends_container(),
+        ],
+        style={"padding": "16px"},
+    )
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+
+
+def rank_pct(values: np.ndarray) -> np.ndarray:
+    """
+    對 2-D 陣列 (n_metrics, n_rows) 的每一列同時做百分等級
+    （等同 Series.rank(method="average", pct=True)）。
+    NaN 不參與排名，結果也是 NaN；分母為該指標非 NaN 的個數。
+    """
+    n_rows = values.shape[1]
+    if n_rows == 0:
+        return np.empty_like(values, dtype=float)
+
+    # 每個指標各自排序（同一指標的值在記憶體中連續，排序較快），NaN 會排在最後
+    order = np.argsort(values, axis=1)
+    ordered = np.take_along_axis(values, order, axis=1)
+    position = np.arange(n_rows)
+
+    # 同值（ties）的區段：起點 / 終點位置，平均名次 = (起點 + 終點) / 2 + 1
+    starts = np.ones_like(ordered, dtype=bool)
+    starts[:, 1:] = ordered[:, 1:] != ordered[:, :-1]
+    ends = np.ones_like(ordered, dtype=bool)
+    ends[:, :-1] = starts[:, 1:]
+    first = np.maximum.accumulate(np.where(starts, position, 0), axis=1)
+    last = np.minimum.accumulate(np.where(ends, position, n_rows)[:, ::-1], axis=1)[:, ::-1]
+
+    valid = ~np.isnan(ordered)
+    counts = valid.sum(axis=1, keepdims=True)
+    # 整個指標都沒有值（例如小樣本的單季）時分母是 0：跟 Series.rank 一樣回傳 NaN、不發警告
+    ordered_pct = np.divide(
+        (first + last) / 2 + 1, counts, out=np.full(ordered.shape, np.nan), where=counts > 0
+    )
+    ordered_pct[~valid] = np.nan
+
+    # 放回原本的順序
+    pct = np.empty_like(ordered_pct)
+    np.put_along_axis(pct, order, ordered_pct, axis=1)
+    return pct
+
+
+def percentile_ranks(
+    df: pd.DataFrame,
+    higher_better: list[str],
+    lower_better: list[str],
+    qualified: pd.Series,
+) -> pd.DataFrame:
+    """
+    一次算出所有指標的 PR（0~100，越好越高），回傳 "<指標>_PR" 欄位。
+    只有 qualified 的列參與排名，其餘列的 PR 為 NaN。
+    """
+    columns = higher_better + lower_better
+    mask = qualified.to_numpy(dtype=bool)
+
+    # 一個指標一列：(n_metrics, n_qualified)
+    values = np.ascontiguousarray(df[columns].to_numpy(dtype=float)[mask].T)
+    pct = rank_pct(values)
+    n_higher = len(higher_better)
+    pct[:n_higher] *= 100
+    pct[n_higher:] = (1 - pct[n_higher:]) * 100
+
+    result = np.full((len(df), len(columns)), np.nan)
+    result[mask] = pct.T
+    return pd.DataFrame(result, index=df.index, columns=[f"{col}_PR" for col in columns])
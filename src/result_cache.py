@@ -0,0 +1,257 @@
+"""
+跨 worker 共用的結果快取：一個本機 SQLite 檔，存 figure JSON 與查詢結果。
+
+gunicorn 每個 worker 的記憶體快取各自獨立，第一個 worker 算完寫進這裡後，
+其他 worker（和 background callback 的子 process）都能直接讀到。
+每筆結果記錄寫入時的 DB data version，DB 一變動舊結果就不會再被讀到；
+另外有 TTL 與總大小上限，超過時從最久沒被讀取的開始淘汰。
+
+    MLB_RESULT_CACHE         0 = 停用（預設 1）
+    MLB_RESULT_CACHE_PATH    快取檔位置（預設 <project>/.cache/results.sqlite）
+    MLB_RESULT_CACHE_TTL     秒（預設 3600）
+    MLB_RESULT_CACHE_BYTES   總大小上限（預設 256 MiB）
+"""
+import functools
+import inspect
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable
+
+from src.db_access import PROJECT_ROOT, get_data_version
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+RESULT_CACHE_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS results (
+        key TEXT PRIMARY KEY,
+        data_version TEXT NOT NULL,
+        value TEXT NOT NULL,
+        size INTEGER NOT NULL,
+        created REAL NOT NULL,
+        accessed REAL NOT NULL
+    )
+"""
+
+
+# 命中時的最後讀取時間先記在記憶體，累積這麼多筆（或下一次 put）時才一次寫回
+ACCESS_FLUSH_BATCH = 64
+
+
+class ResultCache:
+    """
+    以 SQLite 檔實作的 key -> 字串快取，多個 process 可同時讀寫（WAL）。
+    每個 thread 用自己的連線，讀取不互相等待；命中只更新記憶體裡的 accessed，
+    寫入時再批次寫回（LRU 淘汰看的是最後一次寫回的時間，差幾筆不影響）。
+    快取只是加速用，任何 SQLite 錯誤（鎖太久、唯讀目錄…）都當成沒命中。
+    """
+
+    def __init__(self, path: Path, ttl: float, max_bytes: int):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        # 只保護下面兩個 dict，不在持有時做 I/O
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._accessed: dict[str, float] = {}
+        self._stats = {"hits": 0, "misses": 0, "errors": 0}
+
+    def _connect(self) -> sqlite3.Connection:
+        # fork 之後不能沿用父 process 的連線
+        local = self._local
+        if getattr(local, "connection", None) is not None and local.pid == os.getpid():
+            return local.connection
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.execute("PRAGMA synchronous = NORMAL")
+        connection.execute(RESULT_CACHE_SCHEMA)
+        local.connection = connection
+        local.pid = os.getpid()
+        return connection
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def _take_accessed(self) -> list[tuple[float, str]]:
+        with self._lock:
+            accessed, self._accessed = self._accessed, {}
+        return [(when, key) for key, when in accessed.items()]
+
+    def _write_accessed(self, connection: sqlite3.Connection, accessed: list[tuple[float, str]]) -> None:
+        if accessed:
+            connection.executemany("UPDATE results SET accessed = ? WHERE key = ?", accessed)
+
+    def flush(self) -> None:
+        """
+        把記憶體裡累積的讀取時間寫回快取檔
+        """
+        accessed = self._take_accessed()
+        if not accessed:
+            return
+        try:
+            self._write_accessed(self._connect(), accessed)
+        except sqlite3.Error:
+            self._count("errors")
+
+    def get(self, key: str) -> str | None:
+        version = json.dumps(get_data_version())
+        now = time.time()
+        try:
+            row = self._connect().execute(
+                "SELECT value FROM results WHERE key = ? AND data_version = ? AND created >= ?",
+                (key, version, now - self.ttl),
+            ).fetchone()
+        except sqlite3.Error:
+            self._count("errors")
+            return None
+        if row is None:
+            self._count("misses")
+            return None
+        with self._lock:
+            self._stats["hits"] += 1
+            self._accessed[key] = now
+            pending = len(self._accessed)
+        if pending >= ACCESS_FLUSH_BATCH:
+            self.flush()
+        return row[0]
+
+    def put(self, key: str, value: str, data_version: tuple | None = None) -> None:
+        """
+        data_version 請傳計算開始前取得的版本，避免算到一半 DB 換掉卻存成新版本
+        """
+        size = len(value)
+        if size > self.max_bytes:
+            return
+        version = json.dumps(data_version if data_version is not None else get_data_version())
+        now = time.time()
+        accessed = self._take_accessed()
+        try:
+            connection = self._connect()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                # 先寫回累積的讀取時間，淘汰時才看得到最近被讀過的
+                self._write_accessed(connection, accessed)
+                connection.execute(
+                    "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, version, value, size, now, now),
+                )
+                # 過期、舊版本的先清掉，再依最後讀取時間淘汰到總大小上限以內
+                connection.execute(
+                    "DELETE FROM results WHERE data_version != ? OR created < ?",
+                    (version, now - self.ttl),
+                )
+                connection.execute("""
+                    DELETE FROM results WHERE key IN (
+                        SELECT key FROM (
+                            SELECT key, SUM(size) OVER (ORDER BY accessed DESC, key) AS running
+                            FROM results
+                        )
+                        WHERE running > ?
+                    )
+                """, (self.max_bytes,))
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+        except sqlite3.Error:
+            self._count("errors")
+
+    def clear(self) -> None:
+        self._take_accessed()
+        try:
+            self._connect().execute("DELETE FROM results")
+        except sqlite3.Error:
+            self._count("errors")
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+        try:
+            entries, size = self._connect().execute(
+                "SELECT COUNT(*), TOTAL(size) FROM results"
+            ).fetchone()
+            stats.update(entries=entries, bytes=int(size))
+        except sqlite3.Error:
+            pass
+        return stats
+
+
+def create_result_cache() -> ResultCache | None:
+    if os.environ.get("MLB_RESULT_CACHE", "1") == "0":
+        return None
+    return ResultCache(
+        path=Path(os.environ.get("MLB_RESULT_CACHE_PATH", PROJECT_ROOT / ".cache" / "results.sqlite")),
+        ttl=float(os.environ.get("MLB_RESULT_CACHE_TTL", 3600)),
+        max_bytes=int(os.environ.get("MLB_RESULT_CACHE_BYTES", 256 * 1024 * 1024)),
+    )
+
+
+RESULT_CACHE = create_result_cache()
+
+
+def bind_arguments(signature: inspect.Signature, args: tuple, kwargs: dict) -> dict | None:
+    """
+    依函式簽章把位置 / 關鍵字參數與預設值整理成 {參數名: 值}，
+    f(a, b)、f(a, b=b)、省略預設值的呼叫都得到同一份；參數對不上簽章時回傳 None
+    """
+    try:
+        bound = signature.bind(*args, **kwargs)
+    except TypeError:
+        return None
+    bound.apply_defaults()
+    return dict(bound.arguments)
+
+
+def cache_key(func: Callable, arguments: dict) -> str | None:
+    """
+    函式 + bind_arguments 整理過的參數轉成字串鍵；參數不能轉成 JSON 的就不 cache（回傳 None）
+    """
+    try:
+        return json.dumps([func.__module__, func.__qualname__, arguments], sort_keys=True)
+    except TypeError:
+        return None
+
+
+def cached_frame(func: Callable[..., "pd.DataFrame"]) -> Callable[..., "pd.DataFrame"]:
+    """
+    decorator：把查詢結果 DataFrame 存進跨 worker 的 RESULT_CACHE。
+    以 to_dict("split") + JSON 存，float 以 repr 來回不會失真。
+    """
+
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        arguments = bind_arguments(signature, args, kwargs) if RESULT_CACHE is not None else None
+        key = cache_key(func, arguments) if arguments is not None else None
+        if key is None:
+            return func(*args, **kwargs)
+
+        cached = RESULT_CACHE.get(key)
+        if cached is not None:
+            import pandas as pd
+
+            payload = json.loads(cached)
+            return pd.DataFrame(payload["data"], columns=payload["columns"])
+
+        data_version = get_data_version()
+        df = func(*args, **kwargs)
+        RESULT_CACHE.put(key, json.dumps(df.to_dict("split", index=False)), data_version=data_version)
+        return df
+
+    return wrapper
+
+
+def get_result_cache_stats() -> dict:
+    """
+    這個 process 的 hits / misses / errors，加上快取檔目前的筆數與位元組
+    """
+    if RESULT_CACHE is None:
+        return {}
+    return RESULT_CACHE.stats()
@@ -0,0 +1,101 @@
+"""
+薪水分位數：每種 player type 把薪水排序一次，之後任何分位數都只是查陣列。
+
+排序好的陣列以 DB data version 快取（見 league.LeagueTable），
+同一版資料的中位數、四分位數、百分位數都不需要再查 DB。
+分組可以是全聯盟、單一年度、單一聯盟或年度 + 聯盟。
+"""
+from typing import Literal, Sequence
+
+import numpy as np
+
+from src.db_access import query_columns
+from src.league import LeagueTable
+
+# 表名不能用參數綁定，只接受固定的兩種
+SALARY_SQL = {
+    "batter": "SELECT yearID, lgID, salary FROM batter WHERE salary IS NOT NULL",
+    "pitcher": "SELECT yearID, lgID, salary FROM pitcher WHERE salary IS NOT NULL",
+}
+SALARY_DTYPES = {"yearID": "int16", "lgID": "category", "salary": "int64"}
+
+
+def quantile_sorted(values: np.ndarray, q: float) -> float:
+    """
+    已排序陣列的分位數，線性內插（與 pandas / numpy 預設相同）；空陣列回傳 NaN
+    """
+    if len(values) == 0:
+        return float("nan")
+    position = q * (len(values) - 1)
+    lower = int(np.floor(position))
+    upper = min(lower + 1, len(values) - 1)
+    fraction = position - lower
+    return float(values[lower] + (values[upper] - values[lower]) * fraction)
+
+
+class SalaryDistribution:
+    """
+    一種 player type 的薪水分布：每個分組（None / year / league / (year, league)）各一個排序好的陣列
+    """
+
+    def __init__(self, years: np.ndarray, leagues: np.ndarray, salaries: np.ndarray):
+        order = np.argsort(salaries, kind="stable")
+        salaries = salaries[order].astype(float)
+        years = years[order]
+        leagues = leagues[order]
+
+        # 排序後的陣列取子集合還是排序好的，不用每組重排
+        self._sorted: dict[tuple, np.ndarray] = {(None, None): salaries}
+        for year in np.unique(years):
+            in_year = years == year
+            self._sorted[(int(year), None)] = salaries[in_year]
+            for league in np.unique(leagues[in_year]):
+                self._sorted[(int(year), str(league))] = salaries[in_year & (leagues == league)]
+        for league in np.unique(leagues):
+            self._sorted[(None, str(league))] = salaries[leagues == league]
+
+    def quantile(self, q: float, year: int | None = None, league: str | None = None) -> float:
+        values = self._sorted.get((year, league))
+        if values is None:
+            return float("nan")
+        return quantile_sorted(values, q)
+
+
+def _build_salary_distributions() -> dict[str, SalaryDistribution]:
+    distributions = {}
+    for player_type, sql in SALARY_SQL.items():
+        df = query_columns(sql, dtypes=SALARY_DTYPES)
+        distributions[player_type] = SalaryDistribution(
+            years=df["yearID"].to_numpy(),
+            leagues=df["lgID"].to_numpy(dtype=str),
+            salaries=df["salary"].to_numpy(),
+        )
+    return distributions
+
+
+SALARY_DISTRIBUTIONS = LeagueTable(_build_salary_distributions)
+
+
+def get_salary_quantile(
+    player_type: Literal["batter", "pitcher"],
+    q: float,
+    year: int | None = None,
+    league: str | None = None,
+) -> float:
+    """
+    薪水的 q 分位數（0~1）；year / league 為 None 表示不分
+    """
+    return SALARY_DISTRIBUTIONS.get()[player_type].quantile(q, year=year, league=league)
+
+
+def get_salary_quantiles(
+    player_type: Literal["batter", "pitcher"],
+    qs: Sequence[float],
+    year: int | None = None,
+    league: str | None = None,
+) -> list[float]:
+    """
+    一次取多個分位數，例如四分位數 [0.25, 0.5, 0.75]
+    """
+    distribution = SALARY_DISTRIBUTIONS.get()[player_type]
+    return [distribution.quantile(q, year=year, league=league) for q in qs]
@@ -0,0 +1,238 @@
+"""
+逐季彙總（season_group_metrics）：每個 (year, team, player type, group, metric) 一列，
+存當季的 n / total 與最近 ROLLING_SEASONS 季的滾動 n / total，Trends 頁只讀這張表。
+
+指標是 ops+ / fip- 與雷達圖的各項 PR；PR 在「當季」聯盟內排名（不跨季混排）。
+teamID = LEAGUE_ID 的列是全聯盟。群組代碼：
+    batter   "C" / "1B" / ... / "DH"，"H" 是全部打者
+    pitcher  "SP" / "RP"，以及 "SP_R" 這種 POS + throws（跟雷達圖一樣用底線）
+
+新增一季只需要算那一季，再更新受影響的滾動視窗（往後 ROLLING_SEASONS - 1 季），不會重掃歷史：
+
+    python -m src.seasons --append 2025 --data-dir data/2025   # 寫入該季 CSV 並更新彙總
+    python -m src.seasons --update 2025                         # 該季資料已在 DB，只更新彙總
+    python -m src.seasons --rebuild                             # 全部重建
+"""
+import argparse
+import sqlite3
+import time
+from pathlib import Path
+
+from src.aggregates import refresh_season_summaries
+from src.constant import BATTER_RADAR_METRICS, PITCHER_RADAR_METRICS
+from src.db_access import (
+    BATTER_RAW_DTYPES,
+    BATTER_RAW_SQL,
+    DB_PATH,
+    PITCHER_RAW_DTYPES,
+    PITCHER_RAW_SQL,
+)
+
+LEAGUE_ID = "MLB"
+ROLLING_SEASONS = 3
+
+CREATE_SEASON_TABLE = """
+    CREATE TABLE IF NOT EXISTS season_group_metrics (
+        yearID INTEGER NOT NULL,
+        teamID TEXT NOT NULL,
+        player_type TEXT NOT NULL,
+        group_code TEXT NOT NULL,
+        metric TEXT NOT NULL,
+        n INTEGER NOT NULL,
+        total REAL NOT NULL,
+        rolling_n INTEGER NOT NULL DEFAULT 0,
+        rolling_total REAL NOT NULL DEFAULT 0,
+        PRIMARY KEY (teamID, player_type, group_code, metric, yearID)
+    )
+"""
+# 更新單一季（DELETE、滾動值的 WHERE yearID）只碰那幾季的列
+CREATE_SEASON_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_season_group_metrics_year ON season_group_metrics (yearID)",
+    # 讀單一季的球員不掃整張表
+    "CREATE INDEX IF NOT EXISTS idx_batter_year ON batter (yearID)",
+    "CREATE INDEX IF NOT EXISTS idx_pitcher_year ON pitcher (yearID)",
+]
+
+# 原始欄位 -> 存進表裡的 metric 名稱
+SEASON_METRICS = {
+    "batter": {"OPS_plus": "ops+", **{column: column for column in BATTER_RADAR_METRICS}},
+    "pitcher": {"fip-": "fip-", **{column: column for column in PITCHER_RADAR_METRICS}},
+}
+
+INSERT_SEASON_ROWS = """
+    INSERT INTO season_group_metrics (yearID, teamID, player_type, group_code, metric, n, total)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+# 每列的滾動值 = 同一 (team, type, group, metric) 在 [yearID - window + 1, yearID] 的 n / total 加總；
+# 走主鍵，只讀視窗內的幾季
+REFRESH_ROLLING = """
+    UPDATE season_group_metrics
+    SET rolling_n = (
+            SELECT SUM(w.n) FROM season_group_metrics AS w
+            WHERE w.teamID = season_group_metrics.teamID
+              AND w.player_type = season_group_metrics.player_type
+              AND w.group_code = season_group_metrics.group_code
+              AND w.metric = season_group_metrics.metric
+              AND w.yearID BETWEEN season_group_metrics.yearID - :window + 1 AND season_group_metrics.yearID
+        ),
+        rolling_total = (
+            SELECT TOTAL(w.total) FROM season_group_metrics AS w
+            WHERE w.teamID = season_group_metrics.teamID
+              AND w.player_type = season_group_metrics.player_type
+              AND w.group_code = season_group_metrics.group_code
+              AND w.metric = season_group_metrics.metric
+              AND w.yearID BETWEEN season_group_metrics.yearID - :window + 1 AND season_group_metrics.yearID
+        )
+    WHERE yearID BETWEEN :first AND :last
+"""
+
+
+def load_season(connection: sqlite3.Connection, player_type: str, year: int):
+    """
+    讀一季的球員並算好 rate 與當季 PR（跟 league 的全聯盟表同樣的算法）
+    """
+    import pandas as pd
+
+    from src.league import add_batter_pr, add_pitcher_pr, compute_batter_rates, compute_pitcher_rates
+
+    sql, dtypes = {
+        "batter": (BATTER_RAW_SQL, BATTER_RAW_DTYPES),
+        "pitcher": (PITCHER_RAW_SQL, PITCHER_RAW_DTYPES),
+    }[player_type]
+    cursor = connection.execute(sql + " WHERE yearID = :year", {"year": year})
+    df = pd.DataFrame(cursor.fetchall(), columns=[desc[0] for desc in cursor.description]).astype(dtypes)
+    if player_type == "batter":
+        return add_batter_pr(compute_batter_rates(df))
+    return add_pitcher_pr(compute_pitcher_rates(df))
+
+
+def season_rows(df, player_type: str, year: int) -> list[tuple]:
+    """
+    一季的球員表 -> season_group_metrics 的列（各隊與全聯盟、各群組、各指標的 n / total）
+    """
+    import numpy as np
+
+    metrics = SEASON_METRICS[player_type]
+    values = df[list(metrics)].rename(columns=metrics)
+    pos = df["POS"].astype(str)
+    if player_type == "batter":
+        groupings = [pos, np.full(len(df), "H")]
+    else:
+        groupings = [pos, pos + "_" + df["throws"].astype(str)]
+    teams = [df["teamID"].astype(str).to_numpy(), np.full(len(df), LEAGUE_ID)]
+
+    rows = []
+    for group_codes in groupings:
+        for team_ids in teams:
+            long = values.assign(teamID=team_ids, group_code=np.asarray(group_codes)).melt(
+                id_vars=["teamID", "group_code"], var_name="metric"
+            )
+            stats = long.groupby(["teamID", "group_code", "metric"])["value"].agg(["count", "sum"])
+            rows += [
+                (year, team_id, player_type, group_code, metric, int(n), float(total))
+                for (team_id, group_code, metric), n, total in stats.itertuples(name=None)
+            ]
+    return rows
+
+
+def refresh_rolling(connection: sqlite3.Connection, first: int, last: int) -> None:
+    connection.execute(REFRESH_ROLLING, {"window": ROLLING_SEASONS, "first": first, "last": last})
+
+
+def write_season(connection: sqlite3.Connection, year: int) -> int:
+    """
+    重算一季的 season_group_metrics（不含滾動值），回傳寫入列數
+    """
+    connection.execute("DELETE FROM season_group_metrics WHERE yearID = ?", (year,))
+    rows = []
+    for player_type in SEASON_METRICS:
+        df = load_season(connection, player_type, year)
+        rows += season_rows(df, player_type, year)
+    connection.executemany(INSERT_SEASON_ROWS, rows)
+    return len(rows)
+
+
+def update_season(connection: sqlite3.Connection, year: int) -> int:
+    """
+    新增或修改一季之後呼叫：只重算該季的 summary 與逐季彙總，
+    再更新視窗包含這一季的滾動值（year .. year + ROLLING_SEASONS - 1）。
+    呼叫端負責 transaction。
+    """
+    refresh_season_summaries(connection, year)
+    count = write_season(connection, year)
+    refresh_rolling(connection, year, year + ROLLING_SEASONS - 1)
+    return count
+
+
+def rebuild_season_aggregates(connection: sqlite3.Connection) -> None:
+    """
+    逐季彙總全部重建（migration 與 --rebuild 用）。呼叫端負責 transaction。
+    """
+    connection.execute(CREATE_SEASON_TABLE)
+    for statement in CREATE_SEASON_INDEXES:
+        connection.execute(statement)
+    connection.execute("DELETE FROM season_group_metrics")
+    years = [row[0] for row in connection.execute(
+        "SELECT yearID FROM batter UNION SELECT yearID FROM pitcher ORDER BY 1"
+    )]
+    for year in years:
+        write_season(connection, year)
+    if years:
+        refresh_rolling(connection, years[0], years[-1])
+
+
+def append_season(connection: sqlite3.Connection, data_dir: Path, year: int) -> dict[str, int]:
+    """
+    把 data_dir 的 team / batter / pitcher CSV 中 yearID == year 的列寫進 DB（同一季先刪掉），
+    再更新該季的彙總；回傳各表寫入筆數。呼叫端負責 transaction。
+    """
+    from src.ingest import TABLES, insert_rows, read_csv
+
+    counts = {}
+    for table in TABLES:
+        header, rows = read_csv(data_dir / f"{table}.csv")
+        year_index = header.index("yearID")
+        connection.execute(f'DELETE FROM "{table}" WHERE yearID = ?', (year,))
+        counts[table] = insert_rows(
+            connection, table, header, (row for row in rows if int(row[year_index]) == year)
+        )
+    update_season(connection, year)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    action = parser.add_mutually_exclusive_group(required=True)
+    action.add_argument("--append", type=int, metavar="YEAR", help="從 --data-dir 的 CSV 寫入這一季並更新彙總")
+    action.add_argument("--update", type=int, metavar="YEAR", help="只更新這一季的彙總")
+    action.add_argument("--rebuild", action="store_true", help="重建所有季別的彙總")
+    parser.add_argument("--data-dir", type=Path, help="--append 用的 CSV 目錄")
+    parser.add_argument("--db", type=Path, default=DB_PATH)
+    args = parser.parse_args()
+    if args.append is not None and args.data_dir is None:
+        parser.error("--append needs --data-dir")
+
+    # 先確保 schema（含 season_group_metrics）是最新版
+    from src.migrations import migrate
+
+    migrate(args.db)
+    start = time.perf_counter()
+    connection = sqlite3.connect(args.db)
+    try:
+        with connection:
+            if args.rebuild:
+                rebuild_season_aggregates(connection)
+                print("season_group_metrics rebuilt")
+            elif args.append is not None:
+                counts = append_season(connection, args.data_dir, args.append)
+                print(", ".join(f"{table} {count:,d} rows" for table, count in counts.items()))
+            else:
+                print(f"season_group_metrics: {update_season(connection, args.update):,d} rows for {args.update}")
+    finally:
+        connection.close()
+    print(f"done in {time.perf_counter() - start:.2f}s -> {args.db}")
+
+
+if __name__ == "__main__":
+    main()
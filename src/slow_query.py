@@ -0,0 +1,221 @@
+"""
+慢查詢紀錄：db_access.query 超過門檻的 SQL 連同參數、耗時、筆數與 EXPLAIN QUERY PLAN
+寫進本機的 rotating log（一行一筆 JSON），再用 report 離線彙整。
+
+每個 process（gunicorn worker）寫自己的檔案 <name>.<pid>.log：多個 process 共用同一個
+RotatingFileHandler 檔案時，一個輪替了，其他的還寫在改名後的舊檔，備份也會互相覆蓋。
+report 讀所有 process 的檔案（含輪替出去的），依時間合併。
+
+    MLB_SLOW_QUERY_MS         門檻（毫秒）；未設定或 <= 0 就不記錄
+    MLB_SLOW_QUERY_LOG        log 位置（預設 <project>/.cache/slow_queries.log，實際檔名加上 pid）
+    MLB_SLOW_QUERY_LOG_BYTES  單檔上限，超過就輪替（預設 10 MiB，每個 process 保留 5 份）
+
+    python -m src.slow_query                  # 彙整 log：依 SQL 分組，標出 full scan
+    python -m src.slow_query --log other.log --top 20
+"""
+import argparse
+import json
+import logging
+import logging.handlers
+import os
+import statistics
+import threading
+import time
+from pathlib import Path
+
+from src.db_access import FULL_SCAN, PROJECT_ROOT, POOL, add_query_listener, normalize_sql, remove_query_listener
+
+SLOW_QUERY_LOG = Path(os.environ.get("MLB_SLOW_QUERY_LOG", PROJECT_ROOT / ".cache" / "slow_queries.log"))
+SLOW_QUERY_LOG_BYTES = int(os.environ.get("MLB_SLOW_QUERY_LOG_BYTES", 10 * 1024 * 1024))
+SLOW_QUERY_LOG_BACKUPS = 5
+
+
+def process_log_path(path: Path, pid: int) -> Path:
+    """
+    slow_queries.log -> slow_queries.<pid>.log
+    """
+    return path.with_name(f"{path.stem}.{pid}{path.suffix}")
+
+
+class SlowQueryLog:
+    """
+    query listener：超過門檻才寫 log，沒超過的查詢只多一次比較。
+    同一條 SQL 的 query plan 只 EXPLAIN 一次（dashboard 的 SQL 都是固定字串，參數只影響值）。
+    """
+
+    def __init__(self, path: Path, threshold_seconds: float, max_bytes: int = SLOW_QUERY_LOG_BYTES):
+        self.path = path
+        self.threshold = threshold_seconds
+        self.max_bytes = max_bytes
+        self._plans: dict[str, list[str]] = {}
+        self._lock = threading.Lock()
+        self._logger: logging.Logger | None = None
+        self._pid: int | None = None
+
+    def logger(self) -> logging.Logger:
+        """
+        這個 process 自己的 logger；preload 時在 master 建立的 listener 會被 fork 到 worker，
+        所以第一次寫入時才依目前的 pid 開檔
+        """
+        pid = os.getpid()
+        with self._lock:
+            if self._logger is not None and self._pid == pid:
+                return self._logger
+            path = process_log_path(self.path, pid)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            logger = logging.getLogger(f"{__name__}.{path}")
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+            if not logger.handlers:
+                handler = logging.handlers.RotatingFileHandler(
+                    path, maxBytes=self.max_bytes, backupCount=SLOW_QUERY_LOG_BACKUPS, encoding="utf-8"
+                )
+                handler.setFormatter(logging.Formatter("%(message)s"))
+                logger.addHandler(handler)
+            self._logger, self._pid = logger, pid
+            return logger
+
+    def explain(self, sql: str, params: dict) -> list[str]:
+        with self._lock:
+            plan = self._plans.get(sql)
+        if plan is not None:
+            return plan
+        try:
+            rows = POOL.connection().execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+            plan = [row[3] for row in rows]
+        except Exception as error:
+            # 記錄慢查詢不能讓原本的 query 失敗
+            return [f"EXPLAIN failed: {error}"]
+        with self._lock:
+            self._plans[sql] = plan
+        return plan
+
+    def __call__(self, sql: str, params: dict, seconds: float, rows: int) -> None:
+        if seconds < self.threshold:
+            return
+        record = {
+            "time": time.time(),
+            "pid": os.getpid(),
+            "sql": normalize_sql(sql),
+            "params": params,
+            "seconds": round(seconds, 6),
+            "rows": rows,
+            "plan": self.explain(sql, params),
+        }
+        self.logger().info(json.dumps(record, ensure_ascii=False, default=str))
+
+
+_active_log: SlowQueryLog | None = None
+
+
+def enable_slow_query_log(threshold_ms: float | None = None, path: Path = SLOW_QUERY_LOG) -> SlowQueryLog | None:
+    """
+    掛上慢查詢 listener；沒給門檻時讀 MLB_SLOW_QUERY_MS，未設定就什麼都不做
+    """
+    global _active_log
+    if threshold_ms is None:
+        threshold_ms = float(os.environ.get("MLB_SLOW_QUERY_MS", 0))
+    if threshold_ms <= 0:
+        return None
+    disable_slow_query_log()
+    _active_log = SlowQueryLog(path, threshold_ms / 1000)
+    add_query_listener(_active_log)
+    return _active_log
+
+
+def disable_slow_query_log() -> None:
+    global _active_log
+    if _active_log is not None:
+        remove_query_listener(_active_log)
+        _active_log = None
+
+
+def log_files(path: Path) -> list[Path]:
+    """
+    path 本身（若存在）與所有 process 的 <name>.<pid>.log，連同輪替出去的 .1 ~ .N
+    """
+    bases = sorted(path.parent.glob(f"{path.stem}.*{path.suffix}"))
+    if path.exists():
+        bases.append(path)
+    files = []
+    for base in bases:
+        files += [Path(f"{base}.{index}") for index in range(SLOW_QUERY_LOG_BACKUPS, 0, -1)] + [base]
+    return [file for file in files if file.exists()]
+
+
+def read_records(path: Path = SLOW_QUERY_LOG) -> list[dict]:
+    """
+    讀所有 process 的 log（含輪替出去的舊檔），依記錄時間由舊到新合併
+    """
+    records = []
+    for file in log_files(path):
+        with open(file, encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # 寫到一半被輪替的行
+                    continue
+    records.sort(key=lambda record: record.get("time", 0))
+    return records
+
+
+def summarize(records: list[dict]) -> list[dict]:
+    """
+    依正規化後的 SQL 分組：次數、耗時中位數 / 最大 / 總和、平均筆數、是否 full scan，
+    依總耗時排序
+    """
+    groups: dict[str, list[dict]] = {}
+    for record in records:
+        groups.setdefault(record["sql"], []).append(record)
+
+    summary = []
+    for sql, items in groups.items():
+        durations = [item["seconds"] for item in items]
+        plan = items[-1].get("plan", [])
+        summary.append({
+            "sql": sql,
+            "count": len(items),
+            "total_seconds": sum(durations),
+            "median_seconds": statistics.median(durations),
+            "max_seconds": max(durations),
+            "mean_rows": sum(item["rows"] for item in items) / len(items),
+            "full_scan": any(FULL_SCAN.match(step) for step in plan),
+            "plan": plan,
+            "slowest_params": max(items, key=lambda item: item["seconds"])["params"],
+        })
+    summary.sort(key=lambda entry: entry["total_seconds"], reverse=True)
+    return summary
+
+
+def print_report(summary: list[dict], top: int) -> None:
+    if not summary:
+        print("no slow queries recorded")
+        return
+    for entry in summary[:top]:
+        flag = "  [FULL SCAN]" if entry["full_scan"] else ""
+        print(
+            f"{entry['count']:>5}x  total {entry['total_seconds']:.3f}s  "
+            f"median {entry['median_seconds'] * 1000:.1f}ms  max {entry['max_seconds'] * 1000:.1f}ms  "
+            f"rows {entry['mean_rows']:.0f}{flag}"
+        )
+        print(f"  {entry['sql'][:200]}")
+        print(f"  params (slowest): {entry['slowest_params']}")
+        for step in entry["plan"]:
+            print(f"  -> {step}")
+        print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--log", type=Path, default=SLOW_QUERY_LOG, help="慢查詢 log 位置（會一併讀 <name>.<pid>.log）")
+    parser.add_argument("--top", type=int, default=10, help="列出總耗時最多的前幾條 SQL")
+    args = parser.parse_args()
+
+    records = read_records(args.log)
+    print(f"{len(records)} slow queries in {args.log}\n")
+    print_report(summarize(records), args.top)
+
+
+if __name__ == "__main__":
+    main()
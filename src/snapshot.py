@@ -0,0 +1,101 @@
+"""
+球員 / 球隊表的欄式 snapshot（每欄一個 .npy），放在 DB 旁邊的 <db>.snapshot/。
+
+    python -m src.snapshot    # 依目前 DB 重寫 snapshot
+
+worker 啟動時以 mmap 讀取，不用從 SQLite 一列一列組 DataFrame，
+多個 gunicorn worker 也共用同一份 OS page cache。
+manifest 記錄寫入當下的 DB data version，DB 有變動就視為過期，呼叫端改走 SQLite。
+"""
+import json
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.db_access import DB_PATH, get_data_version, query
+
+SNAPSHOT_DIR = DB_PATH.with_name(DB_PATH.name + ".snapshot")
+MANIFEST = "manifest.json"
+
+
+def write_snapshot(frames: dict[str, pd.DataFrame], data_version: tuple, snapshot_dir: Path = SNAPSHOT_DIR) -> None:
+    """
+    把每個 DataFrame 逐欄寫成 .npy；字串欄位存成 category codes + categories
+    """
+    tmp_dir = snapshot_dir.with_name(snapshot_dir.name + ".tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir(parents=True)
+
+    manifest = {"data_version": list(data_version), "tables": {}}
+    for table, df in frames.items():
+        (tmp_dir / table).mkdir()
+        columns = []
+        for position, name in enumerate(df.columns):
+            series = df[name]
+            file_name = f"{table}/{position}.npy"
+            if pd.api.types.is_numeric_dtype(series.dtype):
+                np.save(tmp_dir / file_name, series.to_numpy())
+                columns.append({"name": name, "file": file_name})
+            else:
+                categorical = series.astype("category")
+                np.save(tmp_dir / file_name, categorical.cat.codes.to_numpy())
+                columns.append({
+                    "name": name,
+                    "file": file_name,
+                    "categories": categorical.cat.categories.tolist(),
+                })
+        manifest["tables"][table] = {"rows": len(df), "columns": columns}
+
+    # manifest 最後寫，沒有 manifest 的目錄不會被讀
+    (tmp_dir / MANIFEST).write_text(json.dumps(manifest))
+
+    old_dir = snapshot_dir.with_name(snapshot_dir.name + ".old")
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if snapshot_dir.exists():
+        snapshot_dir.rename(old_dir)
+    tmp_dir.rename(snapshot_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+
+def load_snapshot(table: str, snapshot_dir: Path = SNAPSHOT_DIR) -> pd.DataFrame | None:
+    """
+    以 mmap 讀取 snapshot 中的一張表；沒有 snapshot 或已過期時回傳 None
+    """
+    try:
+        manifest = json.loads((snapshot_dir / MANIFEST).read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    if tuple(manifest["data_version"]) != get_data_version() or table not in manifest["tables"]:
+        return None
+
+    columns = {}
+    for spec in manifest["tables"][table]["columns"]:
+        values = np.load(snapshot_dir / spec["file"], mmap_mode="r")
+        if "categories" in spec:
+            values = pd.Categorical.from_codes(values, categories=spec["categories"])
+        columns[spec["name"]] = values
+    # copy=False：數值欄位直接指向 mmap，不複製
+    return pd.DataFrame(columns, copy=False)
+
+
+def main():
+    from src.league import compute_batter_league, compute_pitcher_league
+
+    data_version = get_data_version()
+    frames = {
+        "batter": compute_batter_league(),
+        "pitcher": compute_pitcher_league(),
+        "team": query("SELECT * FROM team"),
+    }
+    if get_data_version() != data_version:
+        raise SystemExit("DB changed while building the snapshot, run again")
+    write_snapshot(frames, data_version)
+    for table, df in frames.items():
+        print(f"{table:8s} {len(df):>10,d} rows  {len(df.columns):3d} columns")
+    print(f"-> {SNAPSHOT_DIR}")
+
+
+if __name__ == "__main__":
+    main()
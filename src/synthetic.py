@@ -0,0 +1,363 @@
+"""
+產生 N 季 x M 隊的合成聯盟資料（team / batter / pitcher，欄位與 ingest 的 schema 相同），給 benchmark 與壓測用。
+
+    python -m src.synthetic --seasons 10 --teams 30 --db .cache/synthetic.db
+    MLB_DB_PATH=.cache/synthetic.db python app.py
+
+分布參考目前 DB 的 2024 球季：打者 AVG / BB% / K% / 長打、投手 K% / BB% / HR%、
+先發 / 中繼的出賽與局數、薪水區間。ops+、fip、fip- 與真實資料用同樣的算法
+（以當季聯盟平均為 100）。球員跨季沿用同一個 playerID、守位與投打習慣，能力每季小幅浮動。
+一季一季產生、分批 executemany 寫入，1000 倍規模也不用一次放進記憶體。
+"""
+import argparse
+import os
+import time
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+
+from src.constant import TEAM_ID
+from src.db_access import DB_PATH, PROJECT_ROOT
+from src.ingest import DEFAULT_CHUNK_SIZE, TABLES, create_tables, insert_rows, open_bulk_connection
+from src.migrations import apply_migrations
+
+DEFAULT_DB = PROJECT_ROOT / ".cache" / "synthetic.db"
+
+# 目前 DB 的 30 隊（LAA 一定要有，dashboard 只看這隊）
+TEAM_IDS = [
+    "LAA", "ARI", "ATL", "BAL", "BOS", "CHA", "CHN", "CIN", "CLE", "COL",
+    "DET", "HOU", "KCA", "LAN", "MIA", "MIL", "MIN", "NYA", "NYN", "OAK",
+    "PHI", "PIT", "SDN", "SEA", "SFN", "SLN", "TBA", "TEX", "TOR", "WAS",
+]
+DIVISIONS = ["E", "C", "W"]
+
+BATTER_POS = ["C", "1B", "2B", "3B", "SS", "OF", "DH"]
+BATTER_POS_WEIGHTS = [0.14, 0.12, 0.12, 0.13, 0.08, 0.39, 0.02]
+# 每隊名單大小（2024：728 打者、976 投手 / 30 隊）
+BATTERS_PER_TEAM = 24
+PITCHERS_PER_TEAM = 33
+SP_SHARE = 0.28
+RIGHT_HANDED_SHARE = 0.72
+
+BATTER_SALARY = (780_000, 40_000_000)
+PITCHER_SALARY = (770_000, 10_000_000)
+# FIP 常數：讓聯盟 FIP 與 ERA 同一個尺度
+FIP_CONSTANT = 3.17
+
+TEAM_COLUMNS = [
+    "yearID", "lgID", "teamID", "franchID", "divID", "Rank", "G", "Ghome", "W", "L",
+    "DivWin", "WCWin", "LgWin", "WSWin", "R", "AB", "H", "2B", "3B", "HR", "BB", "SO",
+    "SB", "CS", "HBP", "SF", "RA", "ER", "ERA", "CG", "SHO", "SV", "IPouts", "HA", "HRA",
+    "BBA", "SOA", "E", "DP", "FP", "name", "park", "attendance", "BPF", "PPF",
+    "teamIDBR", "teamIDlahman45", "teamIDretro",
+]
+BATTER_COLUMNS = [
+    "playerID", "yearID", "stint", "teamID", "lgID", "G", "G_batting", "AB", "R", "H",
+    "2B", "3B", "HR", "RBI", "SB", "CS", "BB", "SO", "IBB", "HBP", "SH", "SF", "GIDP",
+    "G_old", "POS", "obp", "slg", "ops+", "salary",
+]
+PITCHER_COLUMNS = [
+    "playerID", "yearID", "stint", "teamID", "lgID", "W", "L", "G", "GS", "CG", "SHO",
+    "SV", "IPouts", "H", "ER", "HR", "BB", "SO", "BAOpp", "ERA", "IBB", "WP", "HBP",
+    "BK", "BFP", "GF", "R", "SH", "SF", "GIDP", "fip", "fip-", "POS", "salary", "throws",
+]
+
+
+def team_ids(teams: int) -> list[str]:
+    if teams <= len(TEAM_IDS):
+        return TEAM_IDS[:teams]
+    return TEAM_IDS + [f"T{index:03d}" for index in range(len(TEAM_IDS), teams)]
+
+
+def nullable(values: np.ndarray, valid: np.ndarray) -> list:
+    """
+    valid 為 False 的位置寫成 NULL
+    """
+    return [value if ok else None for value, ok in zip(values.tolist(), valid.tolist())]
+
+
+class LeagueGenerator:
+    """
+    固定 seed 的合成聯盟；球員名單（守位、投打、能力）在建構時決定，每季只重抽當季表現
+    """
+
+    def __init__(self, teams: int, seed: int = 0, batters_per_team: int = BATTERS_PER_TEAM, pitchers_per_team: int = PITCHERS_PER_TEAM):
+        self.rng = np.random.default_rng(seed)
+        self.team_ids = np.array(team_ids(teams))
+        self.leagues = np.where(np.arange(teams) % 2 == 0, "AL", "NL")
+        self.divisions = np.array([DIVISIONS[(index // 2) % 3] for index in range(teams)])
+
+        rng = self.rng
+        # 打者名單：所屬球隊、守位、能力
+        n = teams * batters_per_team
+        self.batter_team = np.repeat(np.arange(teams), batters_per_team)
+        self.batter_ids = np.array([f"syn{team:03d}b{slot:02d}" for team in range(teams) for slot in range(batters_per_team)])
+        self.batter_pos = rng.choice(BATTER_POS, size=n, p=BATTER_POS_WEIGHTS)
+        self.batter_playing_time = rng.beta(1.2, 1.6, size=n)
+        self.batter_avg = rng.normal(0.245, 0.025, size=n).clip(0.17, 0.33)
+        self.batter_bb = rng.normal(0.085, 0.025, size=n).clip(0.02, 0.2)
+        self.batter_k = rng.normal(0.22, 0.055, size=n).clip(0.08, 0.4)
+        self.batter_power = rng.normal(0.13, 0.05, size=n).clip(0.01, 0.3)
+        self.batter_speed = rng.gamma(1.0, 1.0, size=n)
+        self.batter_salary = rng.uniform(*BATTER_SALARY, size=n).round()
+
+        # 投手名單：先發 / 中繼、左右投、能力
+        m = teams * pitchers_per_team
+        self.pitcher_team = np.repeat(np.arange(teams), pitchers_per_team)
+        self.pitcher_ids = np.array([f"syn{team:03d}p{slot:02d}" for team in range(teams) for slot in range(pitchers_per_team)])
+        self.pitcher_pos = np.where(rng.random(m) < SP_SHARE, "SP", "RP")
+        self.pitcher_throws = np.where(rng.random(m) < RIGHT_HANDED_SHARE, "R", "L")
+        self.pitcher_workload = rng.beta(1.3, 1.8, size=m)
+        self.pitcher_k = rng.normal(0.22, 0.05, size=m).clip(0.08, 0.42)
+        self.pitcher_bb = rng.normal(0.08, 0.022, size=m).clip(0.02, 0.18)
+        self.pitcher_hr = rng.normal(0.03, 0.008, size=m).clip(0.005, 0.07)
+        self.pitcher_salary = rng.uniform(*PITCHER_SALARY, size=m).round()
+
+    def batter_season(self, year: int) -> tuple[Iterator[tuple], dict[str, np.ndarray]]:
+        rng = self.rng
+        n = len(self.batter_ids)
+        # 當季能力 = 名單上的能力 + 小幅浮動
+        avg = (self.batter_avg + rng.normal(0, 0.012, n)).clip(0.15, 0.35)
+        bb_rate = (self.batter_bb + rng.normal(0, 0.01, n)).clip(0.01, 0.22)
+        k_rate = (self.batter_k + rng.normal(0, 0.02, n)).clip(0.05, 0.45)
+        power = (self.batter_power + rng.normal(0, 0.02, n)).clip(0.0, 0.35)
+
+        g = np.maximum(1, np.round(162 * (self.batter_playing_time + rng.normal(0, 0.05, n)).clip(0.005, 1))).astype(int)
+        pa = rng.binomial(g * 4, 0.95)
+        bb = rng.binomial(pa, bb_rate)
+        hbp = rng.binomial(pa, 0.011)
+        sf = rng.binomial(pa, 0.007)
+        sh = rng.binomial(pa, 0.002)
+        ab = np.maximum(pa - bb - hbp - sf - sh, 0)
+        so = rng.binomial(ab, k_rate)
+        h = rng.binomial(ab, avg)
+        hr = rng.binomial(h, power)
+        doubles = rng.binomial(h - hr, 0.23)
+        triples = rng.binomial(h - hr - doubles, 0.025)
+        ibb = rng.binomial(bb, 0.04)
+        sb = rng.binomial(h + bb, (0.05 * self.batter_speed).clip(0, 0.5))
+        cs = rng.binomial(sb, 0.22)
+        gidp = rng.binomial(ab - so, 0.025)
+        runs = rng.binomial(h + bb + hbp, 0.35)
+        rbi = rng.binomial(h + sf, 0.45) + hr
+
+        on_base_denominator = ab + bb + hbp + sf
+        has_ab = ab > 0
+        obp = (h + bb + hbp) / np.maximum(on_base_denominator, 1)
+        slg = (h + doubles + 2 * triples + 3 * hr) / np.maximum(ab, 1)
+        # ops+：與 DB 相同，以當季所有打者的 obp / slg 平均為基準
+        ops_plus = 100 * (obp / obp[has_ab].mean() + slg / slg[has_ab].mean() - 1)
+
+        team = self.batter_team
+        # 整欄 tolist() 再 zip 成列，比逐格轉 Python 型別快很多
+        rows = zip(
+            self.batter_ids.tolist(), [year] * n, [1] * n,
+            self.team_ids[team].tolist(), self.leagues[team].tolist(),
+            g.tolist(), g.astype(float).tolist(), ab.tolist(), runs.tolist(), h.tolist(),
+            doubles.tolist(), triples.tolist(), hr.tolist(), rbi.astype(float).tolist(),
+            sb.astype(float).tolist(), cs.astype(float).tolist(), bb.tolist(), so.astype(float).tolist(),
+            ibb.astype(float).tolist(), hbp.astype(float).tolist(), sh.astype(float).tolist(),
+            sf.astype(float).tolist(), gidp.astype(float).tolist(), [0.0] * n, self.batter_pos.tolist(),
+            nullable(obp, has_ab), nullable(slg, has_ab), nullable(ops_plus, has_ab),
+            self.batter_salary.astype(int).tolist(),
+        )
+        totals = {
+            "R": np.bincount(team, runs), "AB": np.bincount(team, ab), "H": np.bincount(team, h),
+            "2B": np.bincount(team, doubles), "3B": np.bincount(team, triples), "HR": np.bincount(team, hr),
+            "BB": np.bincount(team, bb), "SO": np.bincount(team, so), "SB": np.bincount(team, sb),
+            "CS": np.bincount(team, cs), "HBP": np.bincount(team, hbp), "SF": np.bincount(team, sf),
+        }
+        return rows, totals
+
+    def pitcher_season(self, year: int) -> tuple[Iterator[tuple], dict[str, np.ndarray]]:
+        rng = self.rng
+        m = len(self.pitcher_ids)
+        starter = self.pitcher_pos == "SP"
+        workload = (self.pitcher_workload + rng.normal(0, 0.08, m)).clip(0.01, 1)
+
+        g = np.where(starter, np.round(1 + 36 * workload), np.round(1 + 50 * workload)).astype(int)
+        gs = np.where(starter, g, rng.binomial(g, 0.01))
+        # 先發每場約 5 局、中繼約 1 局（IPouts = 出局數）
+        ipouts = np.where(
+            starter,
+            rng.poisson(gs * 16.5 + np.maximum(g - gs, 0) * 3.0),
+            rng.poisson(g * 3.6),
+        )
+        bfp = rng.poisson(ipouts * 1.43) + 1
+        k_rate = (self.pitcher_k + rng.normal(0, 0.015, m)).clip(0.05, 0.45)
+        bb_rate = (self.pitcher_bb + rng.normal(0, 0.01, m)).clip(0.01, 0.2)
+        hr_rate = (self.pitcher_hr + rng.normal(0, 0.005, m)).clip(0.0, 0.08)
+        so = rng.binomial(bfp, k_rate)
+        bb = rng.binomial(bfp - so, bb_rate / (1 - k_rate))
+        hbp = rng.binomial(bfp - so - bb, 0.011)
+        hr = rng.binomial(bfp - so - bb - hbp, hr_rate)
+        balls_in_play = bfp - so - bb - hbp - hr
+        h = rng.binomial(balls_in_play, 0.29) + hr
+        sh = rng.binomial(balls_in_play, 0.003)
+        sf = rng.binomial(balls_in_play, 0.008)
+        ibb = rng.binomial(bb, 0.04)
+        er = rng.poisson(0.3 * (h - hr) + 0.3 * (bb + hbp) + 1.2 * hr)
+        runs = er + rng.binomial(er + 1, 0.08)
+        gidp = rng.binomial(balls_in_play, 0.02)
+        wins = rng.binomial(g, np.where(starter, 0.3, 0.05))
+        losses = rng.binomial(g, np.where(starter, 0.3, 0.05))
+        gf = np.where(starter, 0, rng.binomial(g, 0.25))
+        sv = rng.binomial(gf, 0.35)
+        cg = rng.binomial(gs, 0.005)
+        sho = rng.binomial(cg, 0.4)
+        wp = rng.binomial(bfp, 0.006)
+        bk = rng.binomial(g, 0.01)
+
+        has_ip = ipouts > 0
+        at_bats = np.maximum(bfp - bb - hbp - sh - sf, 1)
+        baopp = (h / at_bats).round(3)
+        era = 27 * er / np.maximum(ipouts, 1)
+        ip = np.maximum(ipouts, 1) / 3
+        fip = (13 * hr + 3 * (bb + hbp) - 2 * so) / ip + FIP_CONSTANT
+        fip = fip.clip(0, None)
+        # fip-：與 DB 相同，以當季所有投手 fip 的平均為 100
+        fip_minus = 100 * fip / fip[has_ip].mean()
+
+        team = self.pitcher_team
+        rows = zip(
+            self.pitcher_ids.tolist(), [year] * m, [1] * m,
+            self.team_ids[team].tolist(), self.leagues[team].tolist(),
+            wins.tolist(), losses.tolist(), g.tolist(), gs.tolist(), cg.tolist(), sho.tolist(),
+            sv.tolist(), ipouts.tolist(), h.tolist(), er.tolist(), hr.tolist(), bb.tolist(), so.tolist(),
+            baopp.tolist(), nullable(era, has_ip), ibb.astype(float).tolist(), wp.tolist(),
+            hbp.astype(float).tolist(), bk.tolist(), bfp.astype(float).tolist(), gf.tolist(), runs.tolist(),
+            sh.astype(float).tolist(), sf.astype(float).tolist(), gidp.astype(float).tolist(),
+            nullable(fip, has_ip), nullable(fip_minus, has_ip), self.pitcher_pos.tolist(),
+            self.pitcher_salary.astype(int).tolist(), self.pitcher_throws.tolist(),
+        )
+        totals = {
+            "RA": np.bincount(team, runs), "ER": np.bincount(team, er), "IPouts": np.bincount(team, ipouts),
+            "HA": np.bincount(team, h), "HRA": np.bincount(team, hr), "BBA": np.bincount(team, bb),
+            "SOA": np.bincount(team, so), "CG": np.bincount(team, cg), "SHO": np.bincount(team, sho),
+            "SV": np.bincount(team, sv),
+        }
+        return rows, totals
+
+    def team_season(self, year: int, batting: dict[str, np.ndarray], pitching: dict[str, np.ndarray]) -> list[list]:
+        rng = self.rng
+        teams = len(self.team_ids)
+        runs = batting["R"]
+        runs_allowed = pitching["RA"]
+        # Pythagorean 勝率決定戰績
+        win_pct = runs ** 1.83 / np.maximum(runs ** 1.83 + runs_allowed ** 1.83, 1)
+        # 聯盟總勝場 = 總敗場
+        win_pct = (win_pct - win_pct.mean() + 0.5).clip(0.2, 0.8)
+        wins = np.round(162 * win_pct).astype(int)
+
+        ranks = np.zeros(teams, dtype=int)
+        for league in ("AL", "NL"):
+            for division in DIVISIONS:
+                members = np.flatnonzero((self.leagues == league) & (self.divisions == division))
+                order = members[np.argsort(-wins[members], kind="stable")]
+                ranks[order] = np.arange(1, len(order) + 1)
+
+        rows = []
+        for i, team_id in enumerate(self.team_ids):
+            ipouts = max(int(pitching["IPouts"][i]), 1)
+            name = "Los Angeles Angels of Anaheim" if team_id == TEAM_ID else f"Synthetic {team_id}"
+            rows.append([
+                year, self.leagues[i], team_id, team_id, self.divisions[i], int(ranks[i]), 162, 81.0,
+                int(wins[i]), 162 - int(wins[i]),
+                "Y" if ranks[i] == 1 else "N", "N", "N", "N",
+                int(runs[i]), int(batting["AB"][i]), int(batting["H"][i]), int(batting["2B"][i]),
+                int(batting["3B"][i]), int(batting["HR"][i]), int(batting["BB"][i]), float(batting["SO"][i]),
+                float(batting["SB"][i]), float(batting["CS"][i]), float(batting["HBP"][i]), float(batting["SF"][i]),
+                int(runs_allowed[i]), int(pitching["ER"][i]), round(27 * pitching["ER"][i] / ipouts, 2),
+                int(pitching["CG"][i]), int(pitching["SHO"][i]), int(pitching["SV"][i]), ipouts,
+                int(pitching["HA"][i]), int(pitching["HRA"][i]), int(pitching["BBA"][i]), int(pitching["SOA"][i]),
+                int(rng.normal(87, 12)), int(rng.normal(123, 20)), round(float(rng.normal(0.985, 0.002)), 3),
+                name, f"{team_id} Park", float(int(rng.normal(2_400_000, 700_000))),
+                int(rng.normal(100, 4)), int(rng.normal(100, 4)),
+                team_id, team_id, team_id,
+            ])
+        return rows
+
+    def seasons(self, first_year: int, count: int) -> Iterator[tuple[list[list], Iterator[tuple], Iterator[tuple]]]:
+        """
+        逐季產生 (team rows, batter rows, pitcher rows)
+        """
+        for year in range(first_year, first_year + count):
+            batters, batting = self.batter_season(year)
+            pitchers, pitching = self.pitcher_season(year)
+            yield self.team_season(year, batting, pitching), batters, pitchers
+
+
+def generate(
+    db_path: Path,
+    seasons: int,
+    teams: int,
+    last_year: int = 2024,
+    seed: int = 0,
+    batters_per_team: int = BATTERS_PER_TEAM,
+    pitchers_per_team: int = PITCHERS_PER_TEAM,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> dict[str, int]:
+    """
+    寫出一個合成 DB（含索引、role 欄位、彙總表），回傳各表筆數
+    """
+    if db_path.resolve() == DB_PATH.resolve():
+        raise ValueError(f"refusing to overwrite the dashboard DB {db_path}")
+
+    generator = LeagueGenerator(teams, seed=seed, batters_per_team=batters_per_team, pitchers_per_team=pitchers_per_team)
+    columns = {"team": TEAM_COLUMNS, "batter": BATTER_COLUMNS, "pitcher": PITCHER_COLUMNS}
+
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = db_path.with_name(db_path.name + ".tmp")
+    tmp_path.unlink(missing_ok=True)
+
+    counts = dict.fromkeys(TABLES, 0)
+    connection = open_bulk_connection(tmp_path)
+    try:
+        connection.execute("BEGIN")
+        create_tables(connection)
+        for season_rows in generator.seasons(last_year - seasons + 1, seasons):
+            for table, rows in zip(TABLES, season_rows):
+                counts[table] += insert_rows(connection, table, columns[table], rows, chunk_size)
+        apply_migrations(connection)
+        connection.execute("COMMIT")
+    except BaseException:
+        connection.close()
+        tmp_path.unlink(missing_ok=True)
+        raise
+    connection.close()
+
+    os.replace(tmp_path, db_path)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB)
+    parser.add_argument("--seasons", type=int, default=10)
+    parser.add_argument("--teams", type=int, default=30)
+    parser.add_argument("--last-year", type=int, default=2024)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--batters-per-team", type=int, default=BATTERS_PER_TEAM)
+    parser.add_argument("--pitchers-per-team", type=int, default=PITCHERS_PER_TEAM)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    counts = generate(
+        db_path=args.db,
+        seasons=args.seasons,
+        teams=args.teams,
+        last_year=args.last_year,
+        seed=args.seed,
+        batters_per_team=args.batters_per_team,
+        pitchers_per_team=args.pitchers_per_team,
+    )
+    elapsed = time.perf_counter() - start
+    for table, count in counts.items():
+        print(f"{table:8s} {count:>12,d} rows")
+    total = sum(counts.values())
+    print(f"{total:,d} rows in {elapsed:.2f}s ({total / max(elapsed, 1e-9):,.0f} rows/s) -> {args.db}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+啟動暖機：先把聯盟表（rate + PR）、薪水分布與 Overview 的圖算好。
+
+gunicorn 以 preload 模式跑時（見 gunicorn.conf.py），master 在 fork 之前呼叫 warm_up()，
+worker 以 copy-on-write 共用這些資料，不用每個 worker 在第一個 request 各算一次。
+/ready 在暖機完成前回 503，load balancer 以它判斷 instance 能不能接流量。
+"""
+import threading
+import time
+
+from flask import Flask, Response
+
+from src.constant import TEAM_ID
+
+_ready = threading.Event()
+_warmup_seconds: float | None = None
+
+
+def warm_up() -> float:
+    """
+    依序建好 process 內的快取，回傳花費秒數；重複呼叫只會重用快取
+    """
+    global _warmup_seconds
+    from src.charts import get_overview_data, plot_overview_breakdown
+    from src.league import BATTER_LEAGUE, PITCHER_LEAGUE
+    from src.salary import SALARY_DISTRIBUTIONS
+
+    start = time.perf_counter()
+    BATTER_LEAGUE.get()
+    PITCHER_LEAGUE.get()
+    SALARY_DISTRIBUTIONS.get()
+    get_overview_data(TEAM_ID)
+    for group in ["SP", "RP", "H"]:
+        plot_overview_breakdown(team_id=TEAM_ID, group=group)
+    _warmup_seconds = time.perf_counter() - start
+    _ready.set()
+    return _warmup_seconds
+
+
+def is_ready() -> bool:
+    return _ready.is_set()
+
+
+def register_readiness_endpoint(server: Flask, path: str = "/ready") -> None:
+    @server.route(path)
+    def ready():
+        if not is_ready():
+            return Response("warming up\n", status=503, mimetype="text/plain")
+        return Response(f"ready (warmup {_warmup_seconds:.2f}s)\n", mimetype="text/plain")
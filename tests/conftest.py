@@ -0,0 +1,5 @@
+import os
+
+# 測試直接讀 db/MLBDashboard.db，不寫跨 worker 快取、不起 background manager
+os.environ.setdefault("MLB_RESULT_CACHE", "0")
+os.environ.setdefault("MLB_BACKGROUND_CALLBACKS", "0")
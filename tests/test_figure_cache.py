@@ -0,0 +1,24 @@
+import plotly.graph_objects as go
+
+from src.figure_cache import FIGURE_CACHE, cached_figure
+
+calls = []
+
+
+@cached_figure
+def bar_figure(player_type: str, groups: list[str], height: int = 300) -> go.Figure:
+    calls.append((player_type, groups, height))
+    return go.Figure(go.Bar(x=groups, y=[1] * len(groups)), layout={"height": height})
+
+
+def test_equivalent_calls_share_one_entry():
+    FIGURE_CACHE.clear()
+    calls.clear()
+    bar_figure("batter", ["C", "1B"])
+    bar_figure("batter", groups=["C", "1B"])
+    bar_figure(player_type="batter", groups=["C", "1B"], height=300)
+    bar_figure(groups=["C", "1B"], player_type="batter")
+    assert len(calls) == 1
+
+    bar_figure("batter", ["C", "1B"], height=400)
+    assert len(calls) == 2
@@ -0,0 +1,23 @@
+from src.metrics import QUERY_LABEL_PREFIX, query_label
+
+
+def test_queries_sharing_a_prefix_get_distinct_labels():
+    columns = ", ".join(f"c{index}" for index in range(40))
+    batter = f"SELECT {columns} FROM batter WHERE teamID = :team_id"
+    pitcher = f"SELECT {columns} FROM pitcher WHERE teamID = :team_id"
+    assert batter[:QUERY_LABEL_PREFIX] == pitcher[:QUERY_LABEL_PREFIX]
+
+    assert query_label(batter) != query_label(pitcher)
+    assert query_label(batter).startswith(batter[:QUERY_LABEL_PREFIX])
+    # 只差空白的同一條 SQL 仍是同一個 label
+    assert query_label(batter) == query_label(batter.replace(" FROM", "\n    FROM"))
+
+
+def test_pool_lifetime_counts_are_counters():
+    from src.metrics import render_metrics
+
+    lines = render_metrics().splitlines()
+    assert "# TYPE mlb_db_connection_events_total counter" in lines
+    assert "# TYPE mlb_db_connections gauge" in lines
+    gauges = [line for line in lines if line.startswith("mlb_db_connections")]
+    assert len(gauges) == 1 and "{" not in gauges[0]
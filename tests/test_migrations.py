@@ -0,0 +1,13 @@
+import sqlite3
+
+from src.db_access import DB_PATH
+from src.migrations import LATEST_VERSION, current_version
+
+
+def test_shipped_db_is_at_latest_version():
+    # repo 裡的 DB 要跟 MIGRATIONS 一起升級，app 啟動時不會替它跑 migration
+    connection = sqlite3.connect(f"{DB_PATH.as_uri()}?mode=ro", uri=True)
+    try:
+        assert current_version(connection) == LATEST_VERSION
+    finally:
+        connection.close()
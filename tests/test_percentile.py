@@ -0,0 +1,20 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from src.percentile import rank_pct
+
+
+def test_matches_series_rank():
+    values = np.array([[3.0, 1.0, np.nan, 3.0, 2.0], [5.0, 4.0, 4.0, np.nan, 1.0]])
+    expected = np.vstack([pd.Series(row).rank(method="average", pct=True).to_numpy() for row in values])
+    np.testing.assert_allclose(rank_pct(values), expected)
+
+
+def test_metric_without_values_is_nan_without_warning():
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", RuntimeWarning)
+        pct = rank_pct(np.array([[np.nan, np.nan], [1.0, 2.0]]))
+    assert np.isnan(pct[0]).all()
+    np.testing.assert_allclose(pct[1], [0.5, 1.0])
@@ -0,0 +1,8 @@
+from src.db_access import DB_PATH
+from src.migrations import check_query_plans
+
+
+def test_dashboard_queries_avoid_full_scans_on_shipped_db():
+    # check_query_plans 有 full scan 時會丟 AssertionError（訊息裡列出 SQL 與 plan）
+    plans = check_query_plans(DB_PATH)
+    assert plans
@@ -0,0 +1,36 @@
+import sqlite3
+
+from src.result_cache import ResultCache
+
+
+def accessed_times(cache: ResultCache) -> dict[str, float]:
+    connection = sqlite3.connect(cache.path)
+    try:
+        return dict(connection.execute("SELECT key, accessed FROM results"))
+    finally:
+        connection.close()
+
+
+def test_hits_do_not_write_until_flushed(tmp_path):
+    cache = ResultCache(tmp_path / "results.sqlite", ttl=3600, max_bytes=1024)
+    cache.put("a", "x" * 10)
+    before = accessed_times(cache)
+
+    assert cache.get("a") == "x" * 10
+    assert accessed_times(cache) == before
+
+    cache.flush()
+    assert accessed_times(cache)["a"] > before["a"]
+
+
+def test_eviction_keeps_recently_read_entries(tmp_path):
+    cache = ResultCache(tmp_path / "results.sqlite", ttl=3600, max_bytes=25)
+    cache.put("a", "x" * 10)
+    cache.put("b", "x" * 10)
+    # a 比 b 晚被讀到：寫入 c 超過上限時淘汰 b
+    cache.get("a")
+    cache.put("c", "x" * 10)
+
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
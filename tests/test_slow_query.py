@@ -0,0 +1,26 @@
+import multiprocessing
+import os
+
+from src.slow_query import SlowQueryLog, log_files, read_records
+
+SQL = "SELECT playerID FROM batter WHERE teamID = :team_id"
+
+
+def record_one(log: SlowQueryLog) -> None:
+    log(SQL, {"team_id": "LAA"}, seconds=1.0, rows=1)
+
+
+def test_each_process_writes_its_own_file(tmp_path):
+    path = tmp_path / "slow_queries.log"
+    log = SlowQueryLog(path, threshold_seconds=0.5)
+    record_one(log)
+    # 跟 gunicorn preload 一樣：master 建好的 listener 被 fork 到 worker
+    child = multiprocessing.get_context("fork").Process(target=record_one, args=(log,))
+    child.start()
+    child.join()
+    assert child.exitcode == 0
+
+    assert len(log_files(path)) == 2
+    records = read_records(path)
+    assert {record["pid"] for record in records} == {os.getpid(), child.pid}
+    assert [record["time"] for record in records] == sorted(record["time"] for record in records)
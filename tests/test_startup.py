@@ -0,0 +1,25 @@
+import json
+import subprocess
+import sys
+
+from benchmarks.bench_startup import HEAVY_MODULES, worker_env
+from src.db_access import PROJECT_ROOT
+
+
+def loaded_by_import_app(modules: list[str]) -> list[str]:
+    # 新的 process 才量得到 import app 本身載入了什麼
+    script = f"import json, sys, app; print(json.dumps([name for name in {modules!r} if name in sys.modules]))"
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        env=worker_env(), cwd=PROJECT_ROOT, check=True, capture_output=True, text=True,
+    )
+    return json.loads(result.stdout)
+
+
+def test_import_app_defers_heavy_modules():
+    assert loaded_by_import_app(HEAVY_MODULES) == []
+
+
+def test_import_app_skips_migrations():
+    # schema 升級只在 CLI 跑，app 啟動不需要 migrations / 彙總表的程式
+    assert loaded_by_import_app(["src.migrations", "src.aggregates", "src.seasons"]) == []